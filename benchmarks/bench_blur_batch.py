@@ -0,0 +1,39 @@
+r"""
+Throughput of the blur operators as a function of the batch size.
+
+Measures the number of images per second processed by :meth:`deepinv.physics.Blur.A`,
+:meth:`deepinv.physics.Blur.A_adjoint` and :meth:`deepinv.physics.Downsampling.A` on 3-channel images,
+with a single filter shared by the whole batch and with one filter per sample.
+"""
+
+import torch
+import deepinv as dinv
+from deepinv.physics.blur import gaussian_blur
+
+from utils import get_device, timeit, print_table
+
+device = get_device()
+img_size = (3, 128, 128)
+batch_sizes = [1, 4, 8, 16, 32, 64]
+
+filt = gaussian_blur(sigma=(2.0, 2.0)).to(device)
+blur = dinv.physics.Blur(filter=filt, padding="circular", device=device)
+down = dinv.physics.Downsampling(img_size=img_size, factor=2, device=device)
+
+rows = []
+for b in batch_sizes:
+    x = torch.randn((b,) + img_size, device=device)
+    blur_sample = dinv.physics.Blur(
+        filter=filt.repeat(b, 1, 1, 1), padding="circular", device=device
+    )
+    t_A = timeit(blur.A, x, device=device)
+    t_At = timeit(blur.A_adjoint, x, device=device)
+    t_A_sample = timeit(blur_sample.A, x, device=device)
+    t_down = timeit(down.A, x, device=device)
+    rows.append([b, b / t_A, b / t_At, b / t_A_sample, b / t_down])
+
+print(f"Images per second ({img_size}, device={device})")
+print_table(
+    ["batch", "Blur.A", "Blur.A_adjoint", "Blur.A (per-sample)", "Downsampling.A"],
+    rows,
+)
@@ -0,0 +1,61 @@
+r"""
+Compact measurements of :class:`deepinv.physics.Inpainting` (``compact=True``) and :class:`deepinv.physics.MRI`,
+which only store the observed entries and are gathered/scattered with indices precomputed once per mask.
+
+Reports the size of the measurements and the time of :math:`A^{\top}A` for inpainting with full-size masked
+measurements and with compact measurements, and for MRI with boolean-mask indexing at each call (previous
+implementation) and with the precomputed indices.
+"""
+
+import torch
+import deepinv as dinv
+
+from utils import get_device, timeit, print_table
+
+device = get_device()
+batch_size, n = 16, 256
+
+rows = []
+for rate in [0.5, 0.2, 0.05]:
+    x = torch.rand(batch_size, 3, n, n, device=device)
+    physics = dinv.physics.Inpainting(tensor_size=(3, n, n), mask=rate, device=device)
+    compact = dinv.physics.Inpainting(
+        tensor_size=(3, n, n), mask=physics.mask[0], compact=True, device=device
+    )
+    normal = lambda p, x: p.A_adjoint(p.A(x))
+    rows.append(
+        [
+            f"inpainting {rate}",
+            physics.A(x).numel() / compact.A(x).numel(),
+            timeit(normal, physics, x, device=device),
+            timeit(normal, compact, x, device=device),
+        ]
+    )
+
+for acceleration in [4, 8]:
+    x = torch.rand(batch_size, 2, n, n, device=device)
+    physics = dinv.physics.MRI(
+        image_size=(n, n), acceleration_factor=acceleration, device=device
+    )
+    mask = physics.mask
+
+    def U(x):
+        return x[:, mask.squeeze(0) > 0]
+
+    def U_adjoint(y):
+        out = torch.zeros((y.shape[0],) + mask.shape[1:], device=y.device)
+        out[:, mask.squeeze(0) > 0] = y
+        return out
+
+    boolean = lambda x: physics.V(mask * U_adjoint(U(mask * physics.V_adjoint(x))))
+    rows.append(
+        [
+            f"MRI x{acceleration}",
+            x.numel() / physics.A(x).numel(),
+            timeit(boolean, x, device=device),
+            timeit(normal, physics, x, device=device),
+        ]
+    )
+
+print(f"Compact measurements (batch={batch_size}, size={n}, device={device})")
+print_table(["operator", "memory ratio", "masked/boolean", "compact"], rows)
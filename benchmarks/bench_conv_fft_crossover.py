@@ -0,0 +1,69 @@
+r"""
+Crossover between spatial and FFT-based convolutions on the host machine.
+
+For each image size and padding mode, times :meth:`deepinv.physics.blur.conv` and
+:meth:`deepinv.physics.blur.conv_fft` for increasing (square) filter sizes, and reports the smallest filter size
+for which the FFT is faster, both measured and predicted by
+:meth:`deepinv.physics.blur.fft_conv_is_faster`.
+
+The last column gives the value of ``deepinv.physics.blur.FFT_CONV_COST`` which would place the predicted crossover
+at the measured one. Setting the constant to the median of these values calibrates the
+automatic dispatch of :class:`deepinv.physics.Blur` and :class:`deepinv.physics.Downsampling` for this machine.
+"""
+
+import math
+import torch
+from deepinv.physics import blur
+
+from utils import get_device, timeit, print_table
+
+device = get_device()
+batch, channels = 8, 3
+img_sizes = [32, 64, 128, 256, 512]
+kernel_sizes = list(range(3, 64, 4))
+
+
+def crossover(fn, *args):
+    for k in kernel_sizes:
+        if fn(k, *args):
+            return k
+    return None
+
+
+def fft_grid(n, k, padding):
+    return (n, n) if padding in ("circular", "valid") else (n + k - 1, n + k - 1)
+
+
+rows = []
+for padding in ["circular", "reflect", "valid"]:
+    for n in img_sizes:
+        x = torch.randn(batch, channels, n, n, device=device)
+
+        def fft_faster(k):
+            if k > n:
+                return False
+            filt = torch.rand(1, 1, k, k, device=device)
+            spectrum = blur.filter_spectrum(filt, fft_grid(n, k, padding), padding)
+            t_spatial = timeit(blur.conv, x, filt, padding, device=device)
+            t_fft = timeit(blur.conv_fft, x, filt, padding, spectrum, device=device)
+            return t_fft < t_spatial
+
+        def predicted(k):
+            return blur.fft_conv_is_faster((n, n), (k, k), padding)
+
+        measured_k = crossover(fft_faster)
+        predicted_k = crossover(predicted)
+
+        cost = "-"
+        if measured_k is not None:
+            m = math.prod(fft_grid(n, measured_k, padding))
+            cost = n * n * measured_k**2 / (m * math.log2(m))
+
+        rows.append([padding, n, measured_k, predicted_k, cost])
+
+print(f"Spatial/FFT convolution crossover (device={device}, batch={batch}x{channels})")
+print(f"Current FFT_CONV_COST = {blur.FFT_CONV_COST}")
+print_table(
+    ["padding", "image size", "measured k", "predicted k", "fitted FFT_CONV_COST"],
+    rows,
+)
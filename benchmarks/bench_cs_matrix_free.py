@@ -0,0 +1,51 @@
+r"""
+Construction time, stored bytes and time of ``A``/``A_adjoint`` of :class:`deepinv.physics.CompressedSensing`
+with ``fast=False``, for the dense matrix (with its transpose and pseudo-inverse), the matrix stored in bfloat16,
+the Rademacher matrix stored as signs, and the matrix-free operator regenerating its rows at each call.
+"""
+
+import time
+import torch
+import deepinv as dinv
+
+from utils import get_device, synchronize, timeit, print_table
+
+device = get_device()
+batch = 4
+
+modes = {
+    "dense": {},
+    "bfloat16": {"storage_dtype": torch.bfloat16},
+    "rademacher": {"distribution": "rademacher"},
+    "matrix-free": {"matrix_free": True},
+}
+
+rows = []
+for size in [32, 64]:
+    img_shape = (1, size, size)
+    m = size * size // 4
+    x = torch.randn((batch,) + img_shape, device=device)
+    for name, kwargs in modes.items():
+        if name == "dense" and size > 32:
+            continue  # the pseudo-inverse dominates the construction
+        start = time.perf_counter()
+        physics = dinv.physics.CompressedSensing(
+            m=m, img_shape=img_shape, device=device, **kwargs
+        )
+        synchronize(device)
+        t_build = time.perf_counter() - start
+        stored = sum(p.numel() * p.element_size() for p in physics.parameters())
+        y = physics(x)
+        rows.append(
+            [
+                size,
+                name,
+                t_build,
+                stored / 2**20,
+                timeit(physics.A, x, device=device),
+                timeit(physics.A_adjoint, y, device=device),
+            ]
+        )
+
+print(f"Compressed sensing with m=n/4 (batch={batch}, device={device})")
+print_table(["size", "mode", "build (s)", "stored (MB)", "A (s)", "A^T (s)"], rows)
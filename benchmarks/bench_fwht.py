@@ -0,0 +1,47 @@
+r"""
+Speed of the 2D Walsh-Hadamard transform of ``SinglePixelCamera(fast=True)``: the previous implementation, which
+concatenates strided slices at each butterfly stage and transposes the image twice, against the ping-pong
+implementation :meth:`deepinv.physics.structured_random.fwht`. Also reports the effective memory bandwidth of the
+new transform, counting one read and one write of the image per stage.
+"""
+
+import numpy as np
+import torch
+from deepinv.physics.structured_random import fwht
+
+from utils import get_device, timeit, print_table
+
+device = get_device()
+batch = 4
+
+
+def hadamard_1d_cat(u):
+    # previous implementation of deepinv.physics.singlepixel.hadamard_1d
+    n = u.shape[-1]
+    m = int(np.log2(n))
+    x = u[..., np.newaxis]
+    for d in range(m)[::-1]:
+        x = torch.cat(
+            (x[..., ::2, :] + x[..., 1::2, :], x[..., ::2, :] - x[..., 1::2, :]), dim=-1
+        )
+    return x.squeeze(-2) / 2 ** (m / 2)
+
+
+def hadamard_2d_cat(x):
+    return hadamard_1d_cat(hadamard_1d_cat(x).transpose(-1, -2)).transpose(-1, -2)
+
+
+rows = []
+for n in [256, 512, 1024, 2048]:
+    x = torch.randn(batch, 1, n, n, device=device)
+    t_old = timeit(hadamard_2d_cat, x, device=device)
+    t_new = timeit(fwht, x, (-2, -1), device=device)
+    t_seq = timeit(lambda v: fwht(v, dims=(-2, -1), sequency=True), x, device=device)
+    stages = 2 * int(np.log2(n))
+    bandwidth = 2 * stages * x.numel() * x.element_size() / t_new / 1e9
+    rows.append([n, t_old, t_new, t_seq, t_old / t_new, bandwidth])
+
+print(f"2D Walsh-Hadamard transform, time in seconds (batch={batch}, device={device})")
+print_table(
+    ["size", "cat + transpose", "fwht", "fwht (sequency)", "speedup", "GB/s"], rows
+)
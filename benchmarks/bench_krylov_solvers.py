@@ -0,0 +1,64 @@
+r"""
+Batched Krylov solvers of :mod:`deepinv.optim.utils`.
+
+The pseudo-inverse :meth:`deepinv.physics.LinearPhysics.A_dagger` of a blur with valid padding is computed with
+:meth:`deepinv.optim.utils.lsqr`, and compared to the conjugate gradient method on the normal equations
+:math:`AA^{\top}u = y`, for the same number of iterations. The batch mixes easy (small blur) and hard (large blur)
+samples: with the per-sample stopping criterion, the easy samples stop being updated as soon as they converge.
+"""
+
+import torch
+import deepinv as dinv
+from deepinv.optim.utils import conjugate_gradient, lsqr
+
+from utils import get_device, timeit, print_table
+
+device = get_device()
+n = 128
+iterations = [10, 50, 200]
+
+x = torch.rand(4, 1, n, n, device=device)
+rows = []
+for sigma in [1.0, 3.0]:
+    filter = dinv.physics.blur.gaussian_blur(sigma=(sigma, sigma))
+    physics = dinv.physics.Blur(filter, padding="valid", device=device)
+    y = physics(x)
+    normal = lambda u: physics.A(physics.A_adjoint(u))
+    for max_iter in iterations:
+        cg = lambda v: physics.A_adjoint(
+            conjugate_gradient(normal, v, max_iter=max_iter, tol=0.0)
+        )
+        ls = lambda v: lsqr(physics.A, physics.A_adjoint, v, max_iter=max_iter, tol=0)
+        err_cg = ((physics.A(cg(y)) - y).norm() / y.norm()).item()
+        err_ls = ((physics.A(ls(y)) - y).norm() / y.norm()).item()
+        rows.append(
+            [
+                sigma,
+                max_iter,
+                err_cg,
+                err_ls,
+                timeit(cg, y, device=device),
+                timeit(ls, y, device=device),
+            ]
+        )
+
+print(f"Blur (valid) pseudo-inverse, relative residual and time (size={n})")
+print_table(
+    ["sigma", "iters", "CG residual", "LSQR residual", "CG time", "LSQR time"], rows
+)
+
+# per-sample stopping: one hard sample among easy ones
+A = dinv.physics.Blur(dinv.physics.blur.gaussian_blur(sigma=(3.0, 3.0)), device=device)
+gammas = torch.tensor([0.1, 0.1, 0.1, 100.0], device=device).view(-1, 1, 1, 1)
+b = A.A_adjoint(A(x)) + x / gammas
+calls = [0]
+
+
+def H(v):
+    calls[0] += 1
+    return A.A_adjoint_A(v) + v / gammas
+
+
+xs = conjugate_gradient(H, b, max_iter=1000, tol=1e-4)
+res = ((H(xs) - b).flatten(1).norm(dim=1)).tolist()
+print(f"per-sample CG: {calls[0] - 1} iterations, residuals {res}")
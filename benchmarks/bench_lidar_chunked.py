@@ -0,0 +1,67 @@
+r"""
+Memory and time of the single photon lidar operator :class:`deepinv.physics.SinglePhotonLidar` with many bins.
+
+Compares the dense forward model, which evaluates the Gaussian impulse response on every bin of every pixel, and
+the dense matched filter, which reshapes all the histograms for a single :meth:`torch.nn.functional.conv1d`, with
+the chunked operator, which only fills the bins around each depth and applies the matched filter (with FFTs or
+``conv1d``) by tiles of pixels. The peak memory is only reported on GPU.
+"""
+
+import torch
+import torch.nn.functional as F
+import deepinv as dinv
+
+from utils import get_device, timeit, print_table
+
+device = get_device()
+sigma = 4.0
+
+
+def dense_forward(physics, x):
+    t = torch.arange(physics.T, device=x.device).view(1, -1, 1, 1)
+    h = torch.exp(-(((t - x[:, :1]) / sigma) ** 2) / 2)
+    return x[:, 1:2] * h / h.sum(dim=1, keepdim=True) + x[:, 2:]
+
+
+def dense_matched_filter(physics, y):
+    B, T, H, W = y.shape
+    z = F.conv1d(y.permute(0, 2, 3, 1).reshape(-1, 1, T), physics.irf, padding="same")
+    return torch.argmax(z, dim=-1)
+
+
+def peak_memory(fn, *args):
+    if not str(device).startswith("cuda"):
+        return "-"
+    torch.cuda.synchronize()
+    torch.cuda.reset_peak_memory_stats()
+    base = torch.cuda.memory_allocated()
+    with torch.no_grad():
+        fn(*args)
+    torch.cuda.synchronize()
+    return f"{(torch.cuda.max_memory_allocated() - base) / 2**20:.0f} MB"
+
+
+rows = []
+for bins, n in [(256, 128), (1024, 128), (1024, 256)]:
+    x = torch.rand(1, 3, n, n, device=device)
+    x[:, 0] *= bins
+    x[:, 1] *= 100
+    for conv_method in ["spatial", "fft"]:
+        physics = dinv.physics.SinglePhotonLidar(
+            sigma=sigma, bins=bins, device=device, conv_method=conv_method
+        )
+        y = physics.A(x)
+        cases = []
+        if conv_method == "spatial":
+            cases += [
+                ("dense A", dense_forward, x),
+                ("chunked A", type(physics).A, x),
+                ("dense A_dagger", dense_matched_filter, y),
+            ]
+        cases.append((f"chunked A_dagger ({conv_method})", type(physics).A_dagger, y))
+        for name, fn, arg in cases:
+            t = timeit(fn, physics, arg, device=device)
+            rows.append([bins, f"{n}x{n}", name, t, peak_memory(fn, physics, arg)])
+
+print(f"Single photon lidar (sigma={sigma}, device={device})")
+print_table(["bins", "pixels", "operation", "time", "peak memory"], rows)
@@ -0,0 +1,43 @@
+r"""
+Forward and adjoint operators of :class:`deepinv.physics.MRI` with masks of sampled k-space lines, computed either
+with a full 2D FFT (``line_method='fft'``) or with a partial DFT of the sampled lines followed by 1D FFTs
+(``line_method='dft'``), and the choice made by ``line_method='auto'``.
+"""
+
+import torch
+import deepinv as dinv
+
+from utils import get_device, timeit, print_table
+
+device = get_device()
+batch_size = 8
+
+
+def forward_adjoint(physics, x):
+    return physics.A_adjoint(physics.A(x))
+
+
+rows = []
+for n in [128, 320]:
+    for acceleration in [4, 8]:
+        physics = dinv.physics.MRI(
+            image_size=(n, n), acceleration_factor=acceleration, device=device
+        )
+        x = torch.randn(batch_size, 2, n, n, device=device)
+        times = []
+        for method in ["fft", "dft"]:
+            physics.line_method = method
+            times.append(timeit(forward_adjoint, physics, x, device=device))
+        physics.line_method = "auto"
+        auto = "dft" if physics._partial_lines((n, n)) is not None else "fft"
+        rows.append(
+            [n, acceleration, len(physics.sampled_lines())]
+            + times
+            + [times[0] / times[1], auto]
+        )
+
+print(f"MRI A^T A with line-sampled masks (batch={batch_size}, device={device})")
+print_table(
+    ["size", "acceleration", "lines", "2D FFT", "partial DFT", "speedup", "auto"],
+    rows,
+)
@@ -0,0 +1,54 @@
+r"""
+Normal operator of :class:`deepinv.physics.MultiCoilMRI`, computed with one batched FFT pair over the coils,
+compared to a loop over the coils with the single-coil operator :class:`deepinv.physics.MRI`, and with a
+compression to a smaller number of virtual coils.
+"""
+
+import torch
+import deepinv as dinv
+
+from utils import get_device, timeit, print_table
+
+device = get_device()
+batch_size, n = 4, 256
+
+mask = dinv.physics.MRI(image_size=(n, n), acceleration_factor=4).mask[0, 0]
+x = torch.randn(batch_size, 2, n, n, device=device)
+single = dinv.physics.MRI(mask=mask, device=device, line_method="fft")
+
+
+def coil_loop(maps, x):
+    xc = torch.complex(x[:, 0], x[:, 1])
+    out = 0
+    for s in maps:
+        u = s * xc
+        u = single.A_adjoint_A(torch.stack([u.real, u.imag], dim=1))
+        out = out + s.conj() * torch.complex(u[:, 0], u[:, 1])
+    return torch.stack([out.real, out.imag], dim=1)
+
+
+rows = []
+for coils in [8, 16, 32]:
+    maps = torch.randn(coils, n, n, dtype=torch.complex64, device=device)
+    maps = maps / maps.abs().pow(2).sum(0, keepdim=True).sqrt()
+    physics = dinv.physics.MultiCoilMRI(coil_maps=maps, mask=mask, device=device)
+    compressed = dinv.physics.MultiCoilMRI(
+        coil_maps=maps, mask=mask, n_virtual_coils=coils // 4, device=device
+    )
+    loop = timeit(coil_loop, maps, x, device=device)
+    batched = timeit(physics.A_adjoint_A, x, device=device)
+    virtual = timeit(compressed.A_adjoint_A, x, device=device)
+    rows.append([coils, loop, batched, virtual, loop / batched, batched / virtual])
+
+print(f"Multi-coil MRI A^T A (batch={batch_size}, size={n}, device={device})")
+print_table(
+    [
+        "coils",
+        "coil loop",
+        "batched",
+        "compressed (C/4)",
+        "batched speedup",
+        "compression speedup",
+    ],
+    rows,
+)
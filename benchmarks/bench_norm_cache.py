@@ -0,0 +1,52 @@
+r"""
+Cost of the spectral norm :math:`\|A^{\top}A\|` used as step size by the proximal operators of data-fidelity
+terms without closed form (e.g. :class:`deepinv.optim.data_fidelity.IndicatorL2`), which are called at every
+iteration of an algorithm.
+
+Compares the power method from a random initialisation (``use_cache=False``), a warm-started power method after
+an in-place change of the operator, the memoized norm, and the closed forms of decomposable operators.
+"""
+
+import torch
+import deepinv as dinv
+
+from utils import get_device, timeit, print_table
+
+device = get_device()
+batch, n = 4, 128
+x = torch.randn(batch, 3, n, n, device=device)
+filt = dinv.physics.blur.gaussian_blur(sigma=(2.0, 2.0))
+
+operators = {
+    "Blur": dinv.physics.Blur(filt, padding="circular", device=device),
+    "BlurFFT": dinv.physics.BlurFFT((3, n, n), filter=filt, device=device),
+    "Inpainting": dinv.physics.Inpainting((3, n, n), mask=0.5, device=device),
+}
+
+
+def random_init(physics):
+    return dinv.physics.LinearPhysics.compute_norm(
+        physics, x, verbose=False, use_cache=False
+    )
+
+
+def warm_start(physics):
+    with torch.no_grad():
+        physics.filter.mul_(1.0)  # bumps the version counter of the filter
+    return physics.compute_norm(x, verbose=False)
+
+
+def cached(physics):
+    return physics.compute_norm(x, verbose=False)
+
+
+rows = []
+for name, physics in operators.items():
+    cached(physics)
+    t_random = timeit(random_init, physics, device=device)
+    t_warm = timeit(warm_start, physics, device=device) if name == "Blur" else None
+    t_cached = timeit(cached, physics, device=device)
+    rows.append([name, t_random, t_warm if t_warm else "-", t_cached])
+
+print(f"Spectral norm of A^T A (batch={batch}, size={n}, device={device})")
+print_table(["operator", "power method", "warm start", "memoized/closed form"], rows)
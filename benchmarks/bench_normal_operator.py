@@ -0,0 +1,64 @@
+r"""
+Speed of the closed-form normal operators :meth:`deepinv.physics.LinearPhysics.A_adjoint_A`.
+
+For each operator, compares ``A_adjoint(A(x))`` with ``A_adjoint_A(x)``, and times the conjugate-gradient based
+:meth:`deepinv.physics.LinearPhysics.compute_norm`, which calls the normal operator at each iteration.
+"""
+
+import torch
+import deepinv as dinv
+
+from utils import get_device, timeit, print_table
+
+device = get_device()
+batch = 8
+n = 256
+filter = dinv.physics.blur.gaussian_blur(sigma=(2.0, 2.0))
+mask = torch.zeros(n, n, device=device)
+mask[:, ::4] = 1
+
+operators = {
+    "BlurFFT": (
+        dinv.physics.BlurFFT(img_size=(3, n, n), filter=filter, device=device),
+        (3, n, n),
+    ),
+    "Inpainting": (
+        dinv.physics.Inpainting(tensor_size=(3, n, n), mask=0.5, device=device),
+        (3, n, n),
+    ),
+    "MRI": (dinv.physics.MRI(mask=mask, device=device), (2, n, n)),
+    "SinglePixelCamera": (
+        dinv.physics.SinglePixelCamera(m=1024, img_shape=(1, n, n), device=device),
+        (1, n, n),
+    ),
+    "Decolorize": (dinv.physics.Decolorize(), (3, n, n)),
+    "Downsampling": (
+        dinv.physics.Downsampling(img_size=(3, n, n), factor=4, device=device),
+        (3, n, n),
+    ),
+    "CompressedSensing (fast)": (
+        dinv.physics.CompressedSensing(
+            m=n * n // 4, img_shape=(1, n, n), fast=True, device=device
+        ),
+        (1, n, n),
+    ),
+}
+
+rows = []
+for name, (physics, shape) in operators.items():
+    x = torch.randn((batch,) + shape, device=device)
+    t_two_pass = timeit(lambda v: physics.A_adjoint(physics.A(v)), x, device=device)
+    t_normal = timeit(physics.A_adjoint_A, x, device=device)
+    t_norm = timeit(
+        lambda v: physics.compute_norm(v, max_iter=20, tol=0.0, verbose=False),
+        x,
+        n_repeat=2,
+        device=device,
+    )
+    rows.append([name, t_two_pass, t_normal, t_two_pass / t_normal, t_norm])
+
+print(f"Normal operator time in seconds (batch={batch}, size={n}x{n}, device={device})")
+print_table(
+    ["operator", "A_adjoint(A(x))", "A_adjoint_A(x)", "speedup", "compute_norm"],
+    rows,
+)
@@ -0,0 +1,78 @@
+r"""
+Forward operator and normal operator of :class:`deepinv.physics.NonCartesianMRI` on radial trajectories,
+computed with the Kaiser-Bessel NUFFT and the Toeplitz embedding, compared to a naive non-uniform DFT computed
+with a dense matrix product, whose relative error is also reported.
+"""
+
+import math
+import torch
+import deepinv as dinv
+from deepinv.physics.nufft import radial_trajectory
+
+from utils import get_device, timeit, print_table
+
+device = get_device()
+batch_size = 4
+
+
+def dft_matrix(trajectory, n):
+    pixels = torch.arange(n, device=device, dtype=torch.float) - n // 2
+    grid = torch.stack(torch.meshgrid(pixels, pixels, indexing="ij"), dim=-1)
+    phase = trajectory.to(device) @ grid.reshape(-1, 2).t()
+    return torch.polar(torch.ones_like(phase), -phase) / n
+
+
+def naive_normal(E, x):
+    xc = torch.complex(x[:, 0], x[:, 1]).reshape(x.shape[0], -1)
+    out = (xc @ E.t()) @ E.conj()
+    out = out.reshape(x.shape[0], *x.shape[2:])
+    return torch.stack([out.real, out.imag], dim=1)
+
+
+def naive_forward(E, x):
+    y = torch.complex(x[:, 0], x[:, 1]).reshape(x.shape[0], -1) @ E.t()
+    return torch.stack([y.real, y.imag], dim=1)
+
+
+rows = []
+for n in [16, 32, 48]:
+    spokes = int(math.pi / 2 * n)
+    trajectory = radial_trajectory(spokes, 2 * n)
+    physics = dinv.physics.NonCartesianMRI(trajectory, (n, n), device=device)
+    physics.A_adjoint_A(torch.zeros(1, 2, n, n, device=device))  # Toeplitz kernel
+    E = dft_matrix(trajectory, n)
+    x = torch.randn(batch_size, 2, n, n, device=device)
+
+    y = naive_forward(E, x)
+    error = (physics.A(x) - y).norm() / y.norm()
+    dft = timeit(naive_forward, E, x, device=device)
+    nufft = timeit(physics.A, x, device=device)
+    dft_normal = timeit(naive_normal, E, x, device=device)
+    toeplitz = timeit(physics.A_adjoint_A, x, device=device)
+    rows.append(
+        [
+            n,
+            trajectory.shape[0],
+            dft,
+            nufft,
+            dft_normal,
+            toeplitz,
+            dft / nufft,
+            f"{error.item():.1e}",
+        ]
+    )
+
+print(f"Non-Cartesian MRI (batch={batch_size}, radial, device={device})")
+print_table(
+    [
+        "size",
+        "samples",
+        "DFT A",
+        "NUFFT A",
+        "DFT A^T A",
+        "Toeplitz A^T A",
+        "A speedup",
+        "rel. error",
+    ],
+    rows,
+)
@@ -0,0 +1,57 @@
+r"""
+Multi-output measurements stored in a :class:`deepinv.utils.PackedTensorList`.
+
+The pseudo-inverse of :class:`deepinv.physics.Pansharpen` is computed with :meth:`deepinv.optim.utils.lsqr`,
+whose vector updates, inner products and norms are applied to the measurements. They are compared with packed
+measurements (one buffer) and with a plain :class:`deepinv.utils.TensorList` of the same tensors (one kernel per
+component). The vector operations alone are also timed for lists with an increasing number of components.
+"""
+
+import torch
+import deepinv as dinv
+from deepinv.optim.utils import lsqr
+from deepinv.utils import TensorList, PackedTensorList
+
+from utils import get_device, timeit, print_table
+
+device = get_device()
+sizes = [32, 128]
+max_iter = 50
+
+rows = []
+for n in sizes:
+    physics = dinv.physics.Pansharpen(img_size=(3, n, n), factor=4, device=device)
+    x = torch.rand(4, 3, n, n, device=device)
+    y = physics(x)
+    y_list = TensorList(list(y.x))
+    A_list = lambda u: TensorList(list(physics.A(u).x))
+
+    packed = lambda v: lsqr(physics.A, physics.A_adjoint, v, max_iter=max_iter, tol=0)
+    unpacked = lambda v: lsqr(A_list, physics.A_adjoint, v, max_iter=max_iter, tol=0)
+    err = ((packed(y) - unpacked(y_list)).norm() / x.norm()).item()
+    rows.append(
+        [
+            n,
+            err,
+            timeit(unpacked, y_list, device=device),
+            timeit(packed, y, device=device),
+        ]
+    )
+
+print(f"Pansharpen LSQR pseudo-inverse ({max_iter} iterations)")
+print_table(["size", "difference", "TensorList", "PackedTensorList"], rows)
+
+rows = []
+for n_components in [2, 8, 32]:
+    tensors = [torch.rand(4, 1, 64, 64, device=device) for _ in range(n_components)]
+    unpacked, packed = TensorList(tensors), PackedTensorList(tensors)
+    rows.append(
+        [
+            n_components,
+            timeit(lambda u: u + 0.5 * u - u / 2, unpacked, device=device),
+            timeit(lambda u: u + 0.5 * u - u / 2, packed, device=device),
+        ]
+    )
+
+print("vector updates u + 0.5u - u/2")
+print_table(["components", "TensorList", "PackedTensorList"], rows)
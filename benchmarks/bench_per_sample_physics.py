@@ -0,0 +1,63 @@
+r"""
+Measurement of a batch with one random operator per sample, either with one operator loaded with the stacked
+parameters of :meth:`deepinv.physics.Physics.sample_params` (vectorized), or by looping over the samples with one
+operator each, compared to the measurement of the batch with a single shared operator.
+
+Reports the time of one forward pass :math:`y = N(Ax)` followed by one :meth:`prox_l2`.
+"""
+
+import copy
+import torch
+import deepinv as dinv
+
+from utils import get_device, timeit, print_table
+
+device = get_device()
+batch_size, n = 16, 128
+
+operators = {
+    "inpainting": dinv.physics.Inpainting(
+        tensor_size=(3, n, n), mask=0.5, device=device
+    ),
+    "MRI": dinv.physics.MRI(image_size=(n, n), device=device),
+    "blur": dinv.physics.Blur(
+        dinv.physics.blur.gaussian_blur(sigma=(2.0, 2.0)), device=device
+    ),
+    "blur fft": dinv.physics.BlurFFT(
+        img_size=(3, n, n),
+        filter=dinv.physics.blur.gaussian_blur(sigma=(2.0, 2.0)),
+        device=device,
+    ),
+    "downsampling": dinv.physics.Downsampling(
+        img_size=(3, n, n), factor=2, device=device
+    ),
+}
+
+
+def measure_and_prox(physics, x):
+    y = physics(x)
+    return physics.prox_l2(x, y, 1.0)
+
+
+def measure_and_prox_loop(singles, x):
+    return torch.cat([measure_and_prox(p, x[i : i + 1]) for i, p in enumerate(singles)])
+
+
+rows = []
+for name, physics in operators.items():
+    channels = 2 if name == "MRI" else 3
+    x = torch.rand(batch_size, channels, n, n, device=device)
+    shared = timeit(measure_and_prox, physics, x, device=device)
+
+    params = physics.sample_params(batch_size)
+    singles = [copy.deepcopy(physics) for _ in range(batch_size)]
+    for i, p in enumerate(singles):
+        p.update_parameters(**{key: val[i : i + 1] for key, val in params.items()})
+    loop = timeit(measure_and_prox_loop, singles, x, device=device)
+
+    physics.update_parameters(**params)
+    batched = timeit(measure_and_prox, physics, x, device=device)
+    rows.append([name, shared, loop, batched, loop / batched])
+
+print(f"Per-sample operators (batch={batch_size}, size={n}, device={device})")
+print_table(["operator", "shared", "loop", "batched", "speedup"], rows)
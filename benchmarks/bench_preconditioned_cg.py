@@ -0,0 +1,56 @@
+r"""
+Convergence of the conjugate gradient iterations of :meth:`deepinv.physics.LinearPhysics.prox_l2` with and without
+the circulant preconditioner of :class:`deepinv.physics.Blur` (see :meth:`deepinv.physics.Blur.preconditioner`).
+
+For each non-circular padding mode, reports the number of iterations needed to reach the tolerance and the
+time of a call to ``prox_l2``.
+"""
+
+import torch
+import deepinv as dinv
+from deepinv.optim.utils import conjugate_gradient
+
+from utils import get_device, timeit, print_table
+
+device = get_device()
+n = 256
+tol = 1e-5
+gammas = [0.1, 1.0, 10.0]
+paddings = ["valid", "reflect", "replicate"]
+
+
+def count_iterations(H, b, M):
+    count = [0]
+
+    def counted(v):
+        count[0] += 1
+        return H(v)
+
+    conjugate_gradient(counted, b, max_iter=1000, tol=tol, M=M)
+    return count[0]
+
+
+x = torch.rand(1, 3, n, n, device=device)
+filter = dinv.physics.blur.gaussian_blur(sigma=(3.0, 3.0))
+rows = []
+for padding in paddings:
+    physics = dinv.physics.Blur(filter, padding=padding, device=device)
+    physics.max_iter, physics.tol = 1000, tol
+    y = physics(x)
+    for gamma in gammas:
+        b = physics.A_adjoint(y) + x / gamma
+        H = lambda v: physics.A_adjoint_A(v) + v / gamma
+        it_cg = count_iterations(H, b, None)
+        it_pcg = count_iterations(H, b, physics.preconditioner(gamma))
+
+        t_pcg = timeit(physics.prox_l2, x, y, gamma, device=device)
+        physics.preconditioner = lambda gamma=None: None
+        t_cg = timeit(physics.prox_l2, x, y, gamma, device=device)
+        del physics.preconditioner  # restore the class method
+        rows.append([padding, gamma, it_cg, it_pcg, t_cg, t_pcg, t_cg / t_pcg])
+
+print(f"Blur prox_l2 with conjugate gradient (size={n}, tol={tol}, device={device})")
+print_table(
+    ["padding", "gamma", "CG iters", "PCG iters", "CG time", "PCG time", "speedup"],
+    rows,
+)
@@ -0,0 +1,77 @@
+r"""
+Inner conjugate gradient iterations of :meth:`deepinv.physics.LinearPhysics.prox_l2` within HQS, with and without
+warm starts (``warm_start_prox=True``, see :class:`deepinv.optim.utils.ProxCache`).
+
+Reports the total number of applications of the normal operator (one per CG iteration, plus one per warm-started
+solve for the initial residual) and the time of a full solve, for a blur with reflect padding and for tomography.
+"""
+
+import torch
+import deepinv as dinv
+from deepinv.optim import optim_builder
+from deepinv.optim.data_fidelity import L2
+from deepinv.optim.prior import Tikhonov
+
+from utils import get_device, timeit, print_table
+
+device = get_device()
+n = 128
+max_iter = 30
+
+operators = {
+    "blur (reflect)": dinv.physics.Blur(
+        dinv.physics.blur.gaussian_blur(sigma=(3.0, 3.0)),
+        padding="reflect",
+        device=device,
+    ),
+    "tomography": dinv.physics.Tomography(
+        img_width=n, angles=90, circle=False, device=device
+    ),
+}
+
+x = torch.rand(1, 1, n, n, device=device)
+rows = []
+for name, physics in operators.items():
+    physics.max_iter, physics.tol = 500, 1e-4
+    y = physics(x)
+    calls = [0]
+    normal = physics.A_adjoint_A
+
+    def counted(v, normal=normal):
+        calls[0] += 1
+        return normal(v)
+
+    physics.A_adjoint_A = counted
+    for gamma in [1.0, 10.0]:
+        result = []
+        for warm_start_prox in [False, True]:
+            model = optim_builder(
+                "HQS",
+                prior=Tikhonov(),
+                data_fidelity=L2(),
+                max_iter=max_iter,
+                params_algo={"stepsize": gamma, "lambda": 1.0, "g_param": 0.1},
+                early_stop=False,
+                warm_start_prox=warm_start_prox,
+            )
+            calls[0] = 0
+            model(y, physics)
+            n_calls = calls[0]
+            # each solve takes seconds, and the counting run above serves as warmup
+            t = timeit(model, y, physics, n_warmup=0, n_repeat=1, device=device)
+            result += [n_calls, t]
+        rows.append([name, gamma] + result + [result[0] / result[2]])
+
+print(f"HQS with {max_iter} iterations (size={n}, device={device})")
+print_table(
+    [
+        "operator",
+        "stepsize",
+        "CG iters",
+        "time",
+        "warm CG iters",
+        "warm time",
+        "iters ratio",
+    ],
+    rows,
+)
@@ -0,0 +1,64 @@
+r"""
+Separable spatial convolutions of :class:`deepinv.physics.Blur` and :class:`deepinv.physics.Downsampling`.
+
+The Gaussian, bilinear and bicubic filters are outer products of 1D filters, so that they can be applied as a
+vertical and a horizontal 1D convolution, with a cost :math:`O(h+w)` per pixel instead of :math:`O(hw)`.
+Compares the 2D spatial convolution (``separable_tol=None``), the separable convolution and the FFT-based
+convolution, for the forward operator and its adjoint.
+"""
+
+import torch
+import deepinv as dinv
+from deepinv.physics import blur
+
+from utils import get_device, timeit, print_table
+
+device = get_device()
+batch, channels, n = 8, 3, 256
+x = torch.randn(batch, channels, n, n, device=device)
+
+filters = {
+    "gaussian (sigma=2)": blur.gaussian_blur(sigma=(2.0, 2.0)),
+    "gaussian (sigma=4)": blur.gaussian_blur(sigma=(4.0, 4.0)),
+    "bilinear (factor=4)": blur.bilinear_filter(4),
+    "bicubic (factor=4)": blur.bicubic_filter(4),
+}
+
+
+def make_physics(filt, factor, **kwargs):
+    if factor == 1:
+        return dinv.physics.Blur(filt, padding="reflect", device=device, **kwargs)
+    return dinv.physics.Downsampling(
+        (channels, n, n),
+        filter=filt,
+        factor=factor,
+        padding="reflect",
+        device=device,
+        **kwargs,
+    )
+
+
+def forward_adjoint(physics):
+    return physics.A_adjoint(physics.A(x))
+
+
+rows = []
+for name, filt in filters.items():
+    for factor in [1, 4]:
+        spatial = make_physics(filt, factor, conv_method="spatial", separable_tol=None)
+        separable = make_physics(filt, factor, conv_method="spatial")
+        fft = make_physics(filt, factor, conv_method="fft")
+        factors = separable.conv_dispatcher.separable_factors(separable.filter)
+        rank = "-" if factors is None else factors[0].shape[0]
+
+        t_spatial = timeit(forward_adjoint, spatial, device=device)
+        t_separable = timeit(forward_adjoint, separable, device=device)
+        t_fft = timeit(forward_adjoint, fft, device=device)
+        rows.append(
+            [name, factor, tuple(filt.shape[-2:]), rank, t_spatial, t_separable, t_fft]
+        )
+
+print(f"A^T A x, reflect padding (batch={batch}x{channels}, size={n}, device={device})")
+print_table(
+    ["filter", "factor", "filter size", "rank", "2D spatial", "separable", "FFT"], rows
+)
@@ -0,0 +1,110 @@
+r"""
+Space-varying blur with a grid of PSFs, see :class:`deepinv.physics.SpaceVaryingBlur`.
+
+Compares, for :math:`A^{\top}Ax`:
+
+- a brute-force blur with one kernel per pixel (the interpolation of the PSFs with the windows), computed as a sum
+  of :math:`hw` shifted products of the image with the per-pixel kernel coefficients,
+- the sum of :math:`P` full-image blurs of the windowed image with :class:`deepinv.physics.Blur`,
+- the overlap-add FFT convolutions of :class:`deepinv.physics.SpaceVaryingBlur`, batched over the PSFs.
+
+The last column is the relative error of the product-convolution with respect to the brute-force blur.
+"""
+
+import torch
+import torch.nn.functional as F
+import deepinv as dinv
+from deepinv.physics import blur
+
+from utils import get_device, timeit, print_table
+
+device = get_device()
+batch, channels, padding = 4, 3, "reflect"
+
+
+def per_pixel_kernels(filters, windows):
+    r"""
+    Coefficients of the (flipped and extended) kernel of each pixel of the padded image, of size (h*w, H, W).
+    """
+    f = blur.extend_filter(filters.flip(-1).flip(-2))
+    kh, kw = f.shape[-2:]
+    w = F.pad(windows.unsqueeze(0), (kw // 2, kw // 2, kh // 2, kh // 2), mode=padding)
+    return torch.einsum("pt,phw->thw", f.reshape(f.shape[0], -1), w[0]), (kh, kw)
+
+
+def per_pixel_blur(x, kernels, size):
+    kh, kw = size
+    h, w = x.shape[-2:]
+    x = F.pad(x, (kw // 2, kw // 2, kh // 2, kh // 2), mode=padding)
+    y = torch.zeros_like(x[..., :h, :w])
+    for t in range(kernels.shape[0]):
+        i, j = divmod(t, kw)
+        y += (x * kernels[t])[..., i : i + h, j : j + w]
+    return y
+
+
+def per_pixel_normal(x, kernels, size):
+    # exact adjoint through autograd, as the brute-force operator has no closed-form transpose
+    with torch.enable_grad():
+        x = x.clone().requires_grad_()
+        y = per_pixel_blur(x, kernels, size)
+        return torch.autograd.grad(y, x, grad_outputs=y)[0]
+
+
+def sum_of_blurs(x, operators, windows):
+    y = sum(op.A(w * x) for op, w in zip(operators, windows))
+    return sum(w * op.A_adjoint(y) for op, w in zip(operators, windows))
+
+
+def gaussian_psfs(n_psf, k):
+    r"""
+    Anisotropic Gaussian PSFs of size (k, k), whose vertical width increases with the index of the PSF.
+    """
+    t = (torch.arange(k) - k // 2).float()
+    sigma = torch.linspace(0.5, k / 6, n_psf).view(-1, 1, 1)
+    g = (t.view(1, -1, 1) / sigma) ** 2 + (t.view(1, 1, -1) / 1.5) ** 2
+    g = torch.exp(-g / 2)
+    return (g / g.sum((-2, -1), keepdim=True)).unsqueeze(1)
+
+
+rows = []
+settings = [(64, (2, 2), 9), (64, (4, 4), 15), (128, (4, 4), 15), (128, (8, 8), 31)]
+for n, grid, k in settings:
+    n_psf = grid[0] * grid[1]
+    x = torch.randn(batch, channels, n, n, device=device)
+    filters = gaussian_psfs(n_psf, k).to(device)
+    windows = blur.interpolation_windows((n, n), grid, device=device)
+
+    physics = dinv.physics.SpaceVaryingBlur(
+        filters, windows=grid, padding=padding, device=device
+    )
+    operators = [
+        dinv.physics.Blur(h.unsqueeze(0), padding=padding, device=device)
+        for h in filters
+    ]
+    kernels, size = per_pixel_kernels(filters, windows)
+
+    t_pixel = timeit(per_pixel_normal, x, kernels, size, device=device)
+    t_sum = timeit(sum_of_blurs, x, operators, windows, device=device)
+    t_ola = timeit(physics.A_adjoint_A, x, device=device)
+
+    y = per_pixel_blur(x, kernels, size)
+    error = ((physics.A(x) - y).norm() / y.norm()).item()
+    rows.append([n, f"{grid[0]}x{grid[1]}", k, t_pixel, t_sum, t_ola, error])
+
+print(
+    f"A^T A x for a space-varying blur ({padding} padding, batch={batch}x{channels}, "
+    f"device={device})"
+)
+print_table(
+    [
+        "image size",
+        "grid",
+        "PSF size",
+        "per-pixel",
+        "sum of P blurs",
+        "overlap-add",
+        "rel. error",
+    ],
+    rows,
+)
@@ -0,0 +1,40 @@
+r"""
+Speed of the fast orthogonal transforms of :meth:`deepinv.physics.structured_random.structured_transform`, used by
+``CompressedSensing(fast=True)`` and ``SinglePixelCamera(transform=...)``, compared to the previous DST-I
+implementation, which extends the signal to size :math:`2n+2` and computes a complex FFT.
+"""
+
+import torch
+from deepinv.physics.structured_random import structured_transform
+
+from utils import get_device, timeit, print_table
+
+device = get_device()
+batch = 8
+
+
+def dst1_padded(x):
+    # previous implementation of deepinv.physics.compressed_sensing.dst1
+    x_shape = x.shape
+    n = x_shape[-1]
+    x = x.reshape(-1, n)
+    z = torch.zeros(x.shape[0], 1, device=x.device)
+    x = torch.cat([z, x, z, -x.flip([1])], dim=1)
+    x = torch.view_as_real(torch.fft.rfft(x, norm="ortho"))
+    x = x[:, 1:-1, 1]
+    return x.view(*x_shape)
+
+
+rows = []
+for log_n in [12, 16, 18, 20]:
+    n = 2**log_n
+    x = torch.randn(batch, n, device=device)
+    t_ref = timeit(dst1_padded, x, device=device)
+    row = [n, t_ref]
+    for transform in ["dst1", "dct", "dct4", "hadamard"]:
+        t = timeit(structured_transform, x, transform, device=device)
+        row.append(f"{t:.2e} ({t_ref / t:.1f}x)")
+    rows.append(row)
+
+print(f"Orthogonal transforms of the last dimension, time in seconds (batch={batch})")
+print_table(["n", "padded dst1", "dst1", "dct", "dct4", "hadamard"], rows)
@@ -0,0 +1,76 @@
+r"""
+Proximal operator and pseudo-inverse of linear operators without SVD, computed with conjugate gradient
+iterations, compared to the closed-form operators of their randomized SVD
+(:meth:`deepinv.physics.svd.to_decomposable`).
+
+Reports the one-off time of the decomposition, and the relative error of its forward operator.
+"""
+
+import time
+import torch
+import deepinv as dinv
+
+from utils import get_device, timeit, print_table
+
+device = get_device()
+batch = 8
+n = 32
+img_shape = (1, n, n)
+
+operators = {
+    "CS (m=n/4)": dinv.physics.CompressedSensing(
+        m=n * n // 4, img_shape=img_shape, device=device
+    ),
+    "tomography": dinv.physics.Tomography(img_width=n, angles=n, device=device),
+    "blur": dinv.physics.Blur(
+        dinv.physics.blur.gaussian_blur(sigma=(1.0, 1.0)), device=device
+    ),
+}
+
+rows = []
+for name, physics in operators.items():
+    physics.max_iter, physics.tol = 100, 1e-5
+    x = torch.rand((batch,) + img_shape, device=device)
+    y = physics.A(x)
+    rank = min(y[0].numel(), x[0].numel())
+
+    start = time.perf_counter()
+    svd = dinv.physics.to_decomposable(
+        physics, img_shape, rank=rank, batch_size=256, device=device
+    )
+    t_svd = time.perf_counter() - start
+    error = (svd.A(x) - y).norm() / y.norm()
+
+    cg_prox = timeit(physics.prox_l2, x, y, 1.0, device=device)
+    svd_prox = timeit(svd.prox_l2, x, y, 1.0, device=device)
+    cg_dagger = timeit(physics.A_dagger, y, device=device)
+    svd_dagger = timeit(svd.A_dagger, y, device=device)
+    rows.append(
+        [
+            name,
+            rank,
+            t_svd,
+            cg_prox,
+            svd_prox,
+            cg_prox / svd_prox,
+            cg_dagger,
+            svd_dagger,
+            f"{error.item():.1e}",
+        ]
+    )
+
+print(f"Randomized SVD (batch={batch}, size={n}, device={device})")
+print_table(
+    [
+        "operator",
+        "rank",
+        "SVD time",
+        "CG prox",
+        "SVD prox",
+        "prox speedup",
+        "CG pinv",
+        "SVD pinv",
+        "rel. error",
+    ],
+    rows,
+)
@@ -0,0 +1,44 @@
+r"""
+Speed of the normal operator of :class:`deepinv.physics.Blur` for the different padding modes.
+
+Compares the composition ``A_adjoint(A(x))`` with spatial convolutions, and the normal operator ``A_adjoint_A(x)``
+computed with a single FFT pair (Toeplitz embedding for non-circular padding, see
+:meth:`deepinv.physics.blur.conv_normal_fft`). The normal operator dominates the cost of each conjugate-gradient
+iteration of :meth:`deepinv.physics.LinearPhysics.prox_l2`.
+"""
+
+import torch
+import deepinv as dinv
+
+from utils import get_device, timeit, print_table
+
+device = get_device()
+batch = 4
+sizes = [128, 256, 512]
+sigmas = [1.0, 3.0, 6.0]
+paddings = ["circular", "valid", "reflect", "replicate"]
+
+rows = []
+for n in sizes:
+    x = torch.randn(batch, 3, n, n, device=device)
+    for sigma in sigmas:
+        filter = dinv.physics.blur.gaussian_blur(sigma=(sigma, sigma))
+        for padding in paddings:
+            spatial = dinv.physics.Blur(
+                filter, padding=padding, conv_method="spatial", device=device
+            )
+            fast = dinv.physics.Blur(
+                filter, padding=padding, conv_method="fft", device=device
+            )
+            t_spatial = timeit(
+                lambda v: spatial.A_adjoint(spatial.A(v)), x, device=device
+            )
+            t_fast = timeit(fast.A_adjoint_A, x, device=device)
+            rows.append(
+                [n, filter.shape[-1], padding, t_spatial, t_fast, t_spatial / t_fast]
+            )
+
+print(f"Blur normal operator time in seconds (batch={batch}, device={device})")
+print_table(
+    ["size", "filter", "padding", "spatial A^T(A(x))", "A_adjoint_A", "speedup"], rows
+)
@@ -0,0 +1,48 @@
+r"""
+Speed of the angle-by-angle and vectorized Radon projectors.
+
+Times :meth:`deepinv.physics.Tomography.A` and :meth:`deepinv.physics.Tomography.A_adjoint` for several numbers of
+angles and image widths, with ``vectorized=False`` (one ``grid_sample`` call per angle) and ``vectorized=True``
+(one call per chunk of angles).
+"""
+
+import torch
+import deepinv as dinv
+
+from utils import get_device, timeit, print_table
+
+device = get_device()
+batch = 4
+widths = [64, 128, 256]
+angles = [90, 180, 360, 720]
+
+rows = []
+for n in widths:
+    x = torch.randn(batch, 1, n, n, device=device)
+    for a in angles:
+        times = []
+        for vectorized in [False, True]:
+            physics = dinv.physics.Tomography(
+                img_width=n, angles=a, vectorized=vectorized, device=device
+            )
+            y = physics.A(x)
+            times += [
+                timeit(physics.A, x, n_repeat=3, device=device),
+                timeit(physics.A_adjoint, y, n_repeat=3, device=device),
+            ]
+        rows.append([n, a] + times + [times[0] / times[2], times[1] / times[3]])
+
+print(f"Tomography time in seconds (batch={batch}, device={device})")
+print_table(
+    [
+        "width",
+        "angles",
+        "A loop",
+        "A_adjoint loop",
+        "A vectorized",
+        "A_adjoint vectorized",
+        "speedup A",
+        "speedup A_adjoint",
+    ],
+    rows,
+)
@@ -0,0 +1,51 @@
+r"""
+Speed of the interpolation-based and sparse-matrix Radon projectors.
+
+Reports the one-off assembly time of the sparse system matrix (first construction) and the loading time from the
+disk cache (second construction), then times one iteration :math:`A^{\top}(Ax)` of both backends.
+"""
+
+import time
+import tempfile
+import torch
+import deepinv as dinv
+
+from utils import get_device, timeit, print_table
+
+device = get_device()
+batch = 4
+widths = [64, 128, 256]
+n_angles = 180
+
+rows = []
+with tempfile.TemporaryDirectory() as cache_dir:
+    for n in widths:
+        x = torch.randn(batch, 1, n, n, device=device)
+        physics = dinv.physics.Tomography(img_width=n, angles=n_angles, device=device)
+
+        start = time.perf_counter()
+        dinv.physics.Tomography(
+            img_width=n, angles=n_angles, sparse=True, cache_dir=cache_dir
+        )
+        t_build = time.perf_counter() - start
+
+        start = time.perf_counter()
+        physics_sparse = dinv.physics.Tomography(
+            img_width=n,
+            angles=n_angles,
+            sparse=True,
+            cache_dir=cache_dir,
+            device=device,
+        )
+        t_load = time.perf_counter() - start
+
+        t_interp = timeit(lambda v: physics.A_adjoint(physics.A(v)), x, device=device)
+        t_sparse = timeit(
+            lambda v: physics_sparse.A_adjoint(physics_sparse.A(v)), x, device=device
+        )
+        rows.append([n, t_build, t_load, t_interp, t_sparse, t_interp / t_sparse])
+
+print(f"Tomography A^T A time in seconds (batch={batch}, angles={n_angles})")
+print_table(
+    ["width", "assembly", "cache load", "interpolation", "sparse", "speedup"], rows
+)
@@ -0,0 +1,51 @@
+import time
+import torch
+
+
+def get_device():
+    r"""
+    Returns the device used by the benchmarks.
+    """
+    return "cuda" if torch.cuda.is_available() else "cpu"
+
+
+def synchronize(device):
+    if str(device).startswith("cuda"):
+        torch.cuda.synchronize()
+
+
+def timeit(fn, *args, n_warmup=2, n_repeat=10, device="cpu"):
+    r"""
+    Average wall-clock time (in seconds) of ``fn(*args)``.
+
+    :param callable fn: function to benchmark.
+    :param args: arguments of the function.
+    :param int n_warmup: number of calls discarded before timing.
+    :param int n_repeat: number of timed calls.
+    :param str device: device on which the computations run (used for synchronization).
+    """
+    with torch.no_grad():
+        for _ in range(n_warmup):
+            fn(*args)
+        synchronize(device)
+        start = time.perf_counter()
+        for _ in range(n_repeat):
+            fn(*args)
+        synchronize(device)
+    return (time.perf_counter() - start) / n_repeat
+
+
+def print_table(header, rows):
+    r"""
+    Prints a simple aligned table.
+
+    :param list[str] header: column names.
+    :param list[list] rows: table entries.
+    """
+    rows = [[f"{v:.4g}" if isinstance(v, float) else str(v) for v in r] for r in rows]
+    widths = [
+        max(len(str(h)), *(len(r[i]) for r in rows)) for i, h in enumerate(header)
+    ]
+    print("  ".join(str(h).rjust(w) for h, w in zip(header, widths)))
+    for r in rows:
+        print("  ".join(v.rjust(w) for v, w in zip(r, widths)))
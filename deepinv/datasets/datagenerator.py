@@ -89,6 +89,12 @@ def generate_dataset(
         If set to ``False``, it will generate a training dataset with measurements only (y)
         and a test dataset with pairs (x,y)
 
+    .. note::
+
+        The measurements are stored with the size returned by the operator, so that operators with compact
+        measurements, such as :class:`deepinv.physics.MRI` or :class:`deepinv.physics.Inpainting` with
+        ``compact=True``, only store the observed entries of each sample.
+
     """
     if os.path.exists(os.path.join(save_dir, dataset_filename)):
         print(
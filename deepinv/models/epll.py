@@ -117,6 +117,8 @@ class EPLL(nn.Module):
                     self.reconstruction(
                         y[i : i + 1],
                         x_init[i : i + 1],
+                        sigma,
+                        physics,
                         betas=betas,
                         batch_size=batch_size,
                     )
@@ -181,10 +183,10 @@ class EPLL(nn.Module):
         # compute x_tilde
         x_tilde_flattened /= patch_multiplicities
 
-        # Image estimation by CG method
+        # Image estimation by CG method, warm-started at the current estimate
         rhs = Aty + beta * sigma_sq * x_tilde_flattened.view(x.shape)
-        op = lambda im: physics.A_adjoint(physics.A(im)) + beta * sigma_sq * im
-        hat_x = conjugate_gradient(op, rhs, max_iter=1e2, tol=1e-5)
+        op = lambda im: physics.A_adjoint_A(im) + beta * sigma_sq * im
+        hat_x = conjugate_gradient(op, rhs, max_iter=1e2, tol=1e-5, x0=x)
         return hat_x
 
 
@@ -131,6 +131,25 @@ class DataFidelity(nn.Module):
         """
         return physics.A_adjoint(self.grad_d(physics.A(x), y, *args, **kwargs))
 
+    def grad_subset(self, x, y, physics, idx, *args, **kwargs):
+        r"""
+        Calculates the gradient of the data fidelity term restricted to a subset :math:`S` of the measurements,
+        i.e., :math:`A_S^{\top} \nabla \distance{A_S x}{y_S}`, where the subsets are defined by
+        :meth:`deepinv.physics.LinearPhysics.subsets`.
+
+        Summing this gradient over all subsets gives :meth:`grad` for distances that are separable across the
+        measurements.
+
+        :param torch.tensor x: Variable :math:`x` at which the gradient is computed.
+        :param torch.tensor y: Data :math:`y` (all the measurements).
+        :param deepinv.physics.LinearPhysics physics: physics model.
+        :param torch.Tensor idx: indices of the subset :math:`S`.
+        :return: (torch.tensor) gradient of the data fidelity of the subset, computed in :math:`x`.
+        """
+        y_subset = physics.measurement_subset(y, idx)
+        u = physics.A_subset(x, idx)
+        return physics.A_adjoint_subset(self.grad_d(u, y_subset, *args, **kwargs), idx)
+
     def prox(
         self,
         x,
@@ -423,12 +442,12 @@ class IndicatorL2(DataFidelity):
         """
         radius = self.radius if radius is None else radius
 
-        if physics.A(x).shape == x.shape and (physics.A(x) == x).all():  # Identity case
+        u = physics.A(x)
+        if u.shape == x.shape and (u == x).all():  # Identity case
             return self.prox_d(x, y, gamma=None, radius=radius)
         else:
             norm_AtA = physics.compute_norm(x, verbose=False)
             stepsize = 1.0 / norm_AtA if stepsize is None else stepsize
-            u = physics.A(x)
             for it in range(max_iter):
                 u_prev = u.clone()
 
@@ -1,6 +1,7 @@
 import torch
 import torch.nn as nn
 import warnings
+from contextlib import nullcontext
 
 
 class FixedPoint(nn.Module):
@@ -77,6 +78,9 @@ class FixedPoint(nn.Module):
     :param int history_size: size of the history used for the Anderson acceleration. Default: ``5``.
     :param float beta_anderson_acc: momentum of the Anderson acceleration step. Default: ``1.0``.
     :param float eps_anderson_acc: regularization parameter of the Anderson acceleration step. Default: ``1e-4``.
+    :param deepinv.optim.utils.ProxCache prox_cache: cache warm-starting the inner linear solves of the proximal
+        operators (see :meth:`deepinv.physics.LinearPhysics.prox_l2`). It is reset at the start of each call to
+        :meth:`forward`. If ``None``, the inner solves start from zero. Default: ``None``.
     """
 
     def __init__(
@@ -96,6 +100,7 @@ class FixedPoint(nn.Module):
         history_size=5,
         beta_anderson_acc=1.0,
         eps_anderson_acc=1e-4,
+        prox_cache=None,
     ):
         super().__init__()
         self.iterator = iterator
@@ -113,6 +118,7 @@ class FixedPoint(nn.Module):
         self.history_size = history_size
         self.beta_anderson_acc = beta_anderson_acc
         self.eps_anderson_acc = eps_anderson_acc
+        self.prox_cache = prox_cache
 
         if self.check_conv_fn is None and self.early_stop:
             warnings.warn(
@@ -230,60 +236,71 @@ class FixedPoint(nn.Module):
                     ``metrics`` the computed along the iterations if ``compute_metrics`` is ``True`` or ``None``
                      otherwise.
         """
-        X = (
-            self.init_iterate_fn(*args, F_fn=self.iterator.F_fn)
-            if self.init_iterate_fn
-            else None
-        )
-        metrics = (
-            self.init_metrics_fn(X, x_gt=x_gt)
-            if self.init_metrics_fn and compute_metrics
-            else None
-        )
-        if self.anderson_acceleration:
-            x_hist, T_hist, H, q = self.init_anderson_acceleration(X)
-        it = 0
-        while it < self.max_iter:
-            cur_params = self.update_params_fn(it) if self.update_params_fn else None
-            cur_data_fidelity = (
-                self.update_data_fidelity_fn(it)
-                if self.update_data_fidelity_fn
+        if hasattr(self.iterator, "reset"):
+            self.iterator.reset()
+        if self.prox_cache is not None:
+            self.prox_cache.reset()
+        with self.prox_cache if self.prox_cache is not None else nullcontext():
+            X = (
+                self.init_iterate_fn(*args, F_fn=self.iterator.F_fn)
+                if self.init_iterate_fn
+                else None
+            )
+            metrics = (
+                self.init_metrics_fn(X, x_gt=x_gt)
+                if self.init_metrics_fn and compute_metrics
                 else None
             )
-            cur_prior = self.update_prior_fn(it) if self.update_prior_fn else None
-            X_prev = X
-            X = self.iterator(X_prev, cur_data_fidelity, cur_prior, cur_params, *args)
             if self.anderson_acceleration:
-                X = self.anderson_acceleration_step(
-                    it,
-                    X_prev,
-                    X,
-                    x_hist,
-                    T_hist,
-                    H,
-                    q,
-                    cur_data_fidelity,
-                    cur_prior,
-                    cur_params,
-                    *args,
+                x_hist, T_hist, H, q = self.init_anderson_acceleration(X)
+            it = 0
+            while it < self.max_iter:
+                cur_params = (
+                    self.update_params_fn(it) if self.update_params_fn else None
                 )
-            check_iteration = (
-                self.check_iteration_fn(X_prev, X) if self.check_iteration_fn else True
-            )
-            if check_iteration:
-                metrics = (
-                    self.update_metrics_fn(metrics, X_prev, X, x_gt=x_gt)
-                    if self.update_metrics_fn and compute_metrics
+                cur_data_fidelity = (
+                    self.update_data_fidelity_fn(it)
+                    if self.update_data_fidelity_fn
                     else None
                 )
-                if (
-                    self.early_stop
-                    and (self.check_conv_fn is not None)
-                    and it > 1
-                    and self.check_conv_fn(it, X_prev, X)
-                ):
-                    break
-                it += 1
-            else:
-                X = X_prev
-        return X, metrics
+                cur_prior = self.update_prior_fn(it) if self.update_prior_fn else None
+                X_prev = X
+                X = self.iterator(
+                    X_prev, cur_data_fidelity, cur_prior, cur_params, *args
+                )
+                if self.anderson_acceleration:
+                    X = self.anderson_acceleration_step(
+                        it,
+                        X_prev,
+                        X,
+                        x_hist,
+                        T_hist,
+                        H,
+                        q,
+                        cur_data_fidelity,
+                        cur_prior,
+                        cur_params,
+                        *args,
+                    )
+                check_iteration = (
+                    self.check_iteration_fn(X_prev, X)
+                    if self.check_iteration_fn
+                    else True
+                )
+                if check_iteration:
+                    metrics = (
+                        self.update_metrics_fn(metrics, X_prev, X, x_gt=x_gt)
+                        if self.update_metrics_fn and compute_metrics
+                        else None
+                    )
+                    if (
+                        self.early_stop
+                        and (self.check_conv_fn is not None)
+                        and it > 1
+                        and self.check_conv_fn(it, X_prev, X)
+                    ):
+                        break
+                    it += 1
+                else:
+                    X = X_prev
+            return X, metrics
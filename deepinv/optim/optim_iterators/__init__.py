@@ -1,7 +1,7 @@
 from .optim_iterator import OptimIterator
 from .optim_iterator import fStep, gStep
 from .admm import ADMMIteration
-from .pgd import PGDIteration
+from .pgd import PGDIteration, OSPGDIteration
 from .primal_dual_CP import CPIteration
 from .hqs import HQSIteration
 from .drs import DRSIteration
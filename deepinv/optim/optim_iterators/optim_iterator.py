@@ -51,6 +51,13 @@ class OptimIterator(nn.Module):
         self.requires_grad_g = False
         self.requires_prox_g = False
 
+    def reset(self):
+        r"""
+        Resets the internal state of the iterator, if any, before a new run of the algorithm. It is called by
+        :class:`deepinv.optim.FixedPoint` at the start of each run.
+        """
+        pass
+
     def relaxation_step(self, u, v, beta):
         r"""
         Performs a relaxation step of the form :math:`\beta u + (1-\beta) v`.
@@ -1,3 +1,4 @@
+import torch
 from .optim_iterator import OptimIterator, fStep, gStep
 from .utils import gradient_descent_step
 
@@ -89,3 +90,96 @@ class gStepPGD(gStep):
         else:
             grad = cur_params["stepsize"] * cur_prior.grad(x, cur_params["g_param"])
             return gradient_descent_step(x, grad)
+
+
+class OSPGDIteration(PGDIteration):
+    r"""
+    Iterator for ordered-subsets (or stochastic) proximal gradient descent.
+
+    Class for a single iteration of the proximal gradient descent algorithm where the gradient of the data-fidelity
+    term is only computed on a subset :math:`S_k` of the measurements, as in the ordered-subsets methods
+    used in tomography. The iteration is given by
+
+    .. math::
+        \begin{equation*}
+        \begin{aligned}
+        u_{k} &= x_k - \lambda \gamma n_S A_{S_k}^{\top} \nabla \distance{A_{S_k} x_k}{y_{S_k}} \\
+        x_{k+1} &= \operatorname{prox}_{\gamma g}(u_k),
+        \end{aligned}
+        \end{equation*}
+
+    where :math:`n_S` is the number of subsets, so that the subset gradient is an estimate of the full gradient
+    at a fraction of its cost. The subsets are given by :meth:`deepinv.physics.LinearPhysics.subsets`, and are
+    visited cyclically, or uniformly at random if ``stochastic=True``. They are computed once per run of the
+    algorithm, and each run starts from the first subset (see :meth:`reset`).
+
+    The physics must implement :meth:`deepinv.physics.LinearPhysics.A_subset` and
+    :meth:`deepinv.physics.LinearPhysics.A_adjoint_subset`, e.g., :class:`deepinv.physics.Tomography`,
+    :class:`deepinv.physics.MRI`, :class:`deepinv.physics.Inpainting` or
+    :class:`deepinv.physics.CompressedSensing`.
+
+    :param int n_subsets: number of subsets of measurements.
+    :param bool stochastic: if ``True``, a random subset is chosen at each iteration, otherwise the subsets are
+        visited in order.
+    """
+
+    def __init__(self, n_subsets=10, stochastic=False, **kwargs):
+        super(OSPGDIteration, self).__init__(**kwargs)
+        if self.g_first:
+            raise ValueError("OSPGDIteration does not support g_first=True.")
+        self.f_step = fStepOSPGD(n_subsets=n_subsets, stochastic=stochastic, **kwargs)
+
+    def reset(self):
+        r"""
+        Restarts the cycle of subsets from the first one, so that each run of the algorithm visits the subsets in
+        the same order.
+        """
+        self.f_step.reset()
+
+
+class fStepOSPGD(fStep):
+    r"""
+    Ordered-subsets PGD fStep module.
+
+    :param int n_subsets: number of subsets of measurements.
+    :param bool stochastic: if ``True``, a random subset is chosen at each iteration.
+    """
+
+    def __init__(self, n_subsets=10, stochastic=False, **kwargs):
+        super(fStepOSPGD, self).__init__(**kwargs)
+        self.n_subsets = n_subsets
+        self.stochastic = stochastic
+        self.reset()
+
+    def reset(self):
+        r"""
+        Resets the subset counter and the subsets of the measurements, which are computed once per run.
+        """
+        self.counter = 0
+        self.subsets = None
+
+    def forward(self, x, cur_data_fidelity, cur_params, y, physics):
+        r"""
+        Single gradient step on the data-fidelity term of a subset of the measurements.
+
+        :param torch.Tensor x: Current iterate :math:`x_k`.
+        :param deepinv.optim.DataFidelity cur_data_fidelity: Instance of the DataFidelity class defining the current data_fidelity.
+        :param dict cur_params: Dictionary containing the current parameters of the algorithm.
+        :param torch.Tensor y: Input data.
+        :param deepinv.physics.LinearPhysics physics: Instance of the physics modeling the data-fidelity term.
+        """
+        if self.subsets is None or self.subsets[0] is not physics:
+            self.subsets = (physics, physics.subsets(self.n_subsets))
+        subsets = self.subsets[1]
+        if self.stochastic:
+            k = int(torch.randint(len(subsets), (1,)))
+        else:
+            k = self.counter % len(subsets)
+            self.counter += 1
+        grad = (
+            cur_params["lambda"]
+            * cur_params["stepsize"]
+            * len(subsets)
+            * cur_data_fidelity.grad_subset(x, y, physics, subsets[k])
+        )
+        return gradient_descent_step(x, grad)
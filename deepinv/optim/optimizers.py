@@ -3,6 +3,7 @@ import warnings
 import torch
 import torch.nn as nn
 from deepinv.optim.fixed_point import FixedPoint
+from deepinv.optim.utils import ProxCache
 from collections.abc import Iterable
 from deepinv.utils import cal_psnr
 from deepinv.optim.optim_iterators import *
@@ -131,6 +132,9 @@ class BaseOptim(nn.Module):
     :param int history_size: size of the history of iterates used for Anderson acceleration. Default: ``5``.
     :param float beta_anderson_acc: momentum of the Anderson acceleration step. Default: ``1.0``.
     :param float eps_anderson_acc: regularization parameter of the Anderson acceleration step. Default: ``1e-4``.
+    :param bool warm_start_prox: whether to warm-start the conjugate gradient iterations of the proximal operators
+        of the data-fidelity term with the solution of the previous iteration (see
+        :class:`deepinv.optim.utils.ProxCache`). Default: ``False``.
     :param bool verbose: whether to print relevant information of the algorithm during its run,
         such as convergence criterion at each iterate. Default: ``False``.
     :return: a torch model that solves the optimization problem.
@@ -157,6 +161,7 @@ class BaseOptim(nn.Module):
         history_size=5,
         beta_anderson_acc=1.0,
         eps_anderson_acc=1e-4,
+        warm_start_prox=False,
         verbose=False,
     ):
         super(BaseOptim, self).__init__()
@@ -243,6 +248,7 @@ class BaseOptim(nn.Module):
             history_size=history_size,
             beta_anderson_acc=beta_anderson_acc,
             eps_anderson_acc=eps_anderson_acc,
+            prox_cache=ProxCache() if warm_start_prox else None,
         )
 
     def update_params_fn(self, it):
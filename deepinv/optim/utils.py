@@ -1,4 +1,4 @@
-from deepinv.utils import zeros_like
+from deepinv.utils import zeros_like, TensorList, PackedTensorList
 import torch
 
 
@@ -25,47 +25,337 @@ def check_conv(X_prev, X, it, crit_conv="residual", thres_conv=1e-3, verbose=Fal
         return False
 
 
-def conjugate_gradient(A, b, max_iter=1e2, tol=1e-5):
+def _batch_dot(s1, s2):
+    r"""
+    Inner products :math:`\langle s_1, s_2 \rangle` of each sample of the batch, returned as a tensor of size (B,).
+    The first dimension of the tensors (or of each tensor of a :class:`deepinv.utils.TensorList`) is the batch.
+    The inner products of two :class:`deepinv.utils.PackedTensorList` with the same shapes are computed on their
+    buffers.
     """
+    if (
+        isinstance(s1, PackedTensorList)
+        and isinstance(s2, PackedTensorList)
+        and s1.shape == s2.shape
+    ):
+        return (s1.data.conj() * s2.data).sum(-1)
+    if isinstance(s1, TensorList):
+        return sum(_batch_dot(a, b) for a, b in zip(s1, s2))
+    return (s1.conj() * s2).reshape(s1.shape[0], -1).sum(-1)
+
+
+def _batch_norm(s):
+    r"""
+    Euclidean norm of each sample of the batch, returned as a tensor of size (B,).
+    """
+    return torch.real(_batch_dot(s, s)).sqrt()
+
+
+def _expand(v, x):
+    r"""
+    Reshapes the per-sample scalars ``v`` of size (B,) so that they broadcast with ``x``. For a
+    :class:`deepinv.utils.PackedTensorList`, they are expanded (without copy) to the size of its buffer.
+    """
+    if isinstance(x, PackedTensorList):
+        return PackedTensorList(v.view(-1, 1).expand_as(x.data), x.shape)
+    if isinstance(x, TensorList):
+        return TensorList([_expand(v, xi) for xi in x])
+    return v.view(-1, *([1] * (x.dim() - 1)))
+
+
+def _safe_div(num, den, active):
+    r"""
+    Per-sample division, which returns zero for the inactive (converged) samples and for vanishing denominators.
+    """
+    mask = active & (den != 0)
+    return torch.where(mask, num / torch.where(mask, den, torch.ones_like(den)), 0.0)
+
+
+def _thresholds(b, tol, rtol):
+    r"""
+    Per-sample stopping thresholds :math:`\max(\text{tol}, \text{rtol}\|b\|)`.
+    """
+    return torch.clamp(rtol * _batch_norm(b), min=tol)
+
+
+def conjugate_gradient(A, b, max_iter=1e2, tol=1e-5, M=None, x0=None, rtol=0.0):
+    r"""
     Standard conjugate gradient algorithm.
 
     It solves the linear system :math:`Ax=b`, where :math:`A` is a (square) linear operator and :math:`b` is a tensor.
 
+    If a preconditioner :math:`M \approx A^{-1}` is given, the preconditioned conjugate gradient algorithm is used,
+    which converges in fewer iterations when :math:`MA` is better conditioned than :math:`A`.
+
+    The algorithm is batched: the operator is assumed to act independently on each sample of the batch (first
+    dimension of the tensors), and each sample has its own step sizes and stopping criterion. A sample stops
+    being updated once its residual :math:`\|b_i - Ax_i\|` is below :math:`\max(\text{tol}, \text{rtol}\|b_i\|)`,
+    and the iterations stop when all the samples have converged.
+
     For more details see: http://en.wikipedia.org/wiki/Conjugate_gradient_method
 
     :param (callable) A: Linear operator as a callable function, has to be square!
-    :param torch.Tensor b: input tensor
+    :param torch.Tensor, deepinv.utils.TensorList b: input tensor
     :param int max_iter: maximum number of CG iterations
     :param float tol: absolute tolerance for stopping the CG algorithm.
+    :param (callable) M: symmetric positive definite preconditioner approximating the inverse of :math:`A`, as a
+        callable function. If ``None``, no preconditioning is used.
+    :param torch.Tensor, deepinv.utils.TensorList x0: initial guess (warm start). If ``None``, the algorithm starts
+        from zero.
+    :param float rtol: relative tolerance for stopping the CG algorithm, with respect to the norm of :math:`b`.
     :return: torch.Tensor :math:`x` verifying :math:`Ax=b`.
 
     """
+    if x0 is None:
+        x = zeros_like(b)
+        r = b
+    else:
+        x = x0
+        r = b - A(x)
 
-    def dot(s1, s2):
-        dot = (s1.conj() * s2).flatten().sum()
-        return dot
-
-    x = zeros_like(b)
+    thres = _thresholds(b, tol, rtol)
+    active = _batch_norm(r) > thres
 
-    r = b
-    p = r
-    rsold = dot(r, r)
+    z = r if M is None else M(r)
+    p = z
+    rsold = torch.real(_batch_dot(r, z))
 
     for i in range(int(max_iter)):
-        Ap = A(p)
-        alpha = rsold / dot(p, Ap)
-        x = x + p * alpha
-        r = r + Ap * (-alpha)
-        rsnew = torch.real(dot(r, r))
-        # print(rsnew.sqrt())
-        if rsnew.sqrt() < tol:
+        if not active.any():
             break
-        p = r + p * (rsnew / rsold)
+        Ap = A(p)
+        alpha = _safe_div(rsold, torch.real(_batch_dot(p, Ap)), active)
+        x = x + p * _expand(alpha, p)
+        r = r - Ap * _expand(alpha, Ap)
+        active = active & (_batch_norm(r) > thres)
+        z = r if M is None else M(r)
+        rsnew = torch.real(_batch_dot(r, z))
+        beta = _safe_div(rsnew, rsold, active)
+        p = z + p * _expand(beta, p)
         rsold = rsnew
 
     return x
 
 
+def minres(A, b, max_iter=1e2, tol=1e-5, x0=None, rtol=0.0):
+    r"""
+    Minimal residual method.
+
+    It solves the linear system :math:`Ax=b`, where :math:`A` is a symmetric (possibly indefinite) linear operator,
+    by minimizing the residual :math:`\|b - Ax\|` over Krylov subspaces of increasing dimension. Contrary to
+    :meth:`deepinv.optim.utils.conjugate_gradient`, the residual decreases monotonically, and the operator does
+    not need to be positive definite.
+
+    As :meth:`deepinv.optim.utils.conjugate_gradient`, the algorithm is batched with a stopping criterion per
+    sample.
+
+    For more details see: https://en.wikipedia.org/wiki/Minimal_residual_method
+
+    :param (callable) A: symmetric linear operator as a callable function.
+    :param torch.Tensor, deepinv.utils.TensorList b: input tensor
+    :param int max_iter: maximum number of iterations.
+    :param float tol: absolute tolerance on the residual for stopping the algorithm.
+    :param torch.Tensor, deepinv.utils.TensorList x0: initial guess (warm start). If ``None``, the algorithm starts
+        from zero.
+    :param float rtol: relative tolerance for stopping the algorithm, with respect to the norm of :math:`b`.
+    :return: torch.Tensor :math:`x` verifying :math:`Ax=b`.
+    """
+    if x0 is None:
+        x = zeros_like(b)
+        r = b
+    else:
+        x = x0
+        r = b - A(x)
+
+    thres = _thresholds(b, tol, rtol)
+    active = _batch_norm(r) > thres
+
+    p0 = r
+    s0 = A(p0)
+    p1, s1 = p0, s0
+    for i in range(int(max_iter)):
+        if not active.any():
+            break
+        p2, p1 = p1, p0
+        s2, s1 = s1, s0
+        ss1 = torch.real(_batch_dot(s1, s1))
+        alpha = _safe_div(_batch_dot(s1, r), ss1, active)
+        x = x + p1 * _expand(alpha, p1)
+        r = r - s1 * _expand(alpha, s1)
+        active = active & (_batch_norm(r) > thres)
+        if not active.any():
+            break
+
+        # new direction, A-orthogonalized against the two previous ones
+        p0 = s1
+        s0 = A(s1)
+        beta1 = _safe_div(_batch_dot(s1, s0), ss1, active)
+        p0 = p0 - p1 * _expand(beta1, p1)
+        s0 = s0 - s1 * _expand(beta1, s1)
+        if i > 0:
+            ss2 = torch.real(_batch_dot(s2, s2))
+            beta2 = _safe_div(_batch_dot(s2, s0), ss2, active)
+            p0 = p0 - p2 * _expand(beta2, p2)
+            s0 = s0 - s2 * _expand(beta2, s2)
+
+    return x
+
+
+def lsqr(A, A_adjoint, b, max_iter=1e2, tol=1e-5, x0=None, rtol=0.0):
+    r"""
+    LSQR algorithm for least squares problems.
+
+    It solves :math:`\min_x \|Ax - b\|^2` for a (possibly rectangular) linear operator :math:`A`, i.e., it computes
+    the pseudo-inverse solution :math:`A^{\dagger}b` when starting from zero. LSQR is mathematically equivalent
+    to the conjugate gradient method on the normal equations :math:`A^{\top}Ax = A^{\top}b`, but it relies on the
+    Golub-Kahan bidiagonalization of :math:`A`, which is numerically more stable since it avoids squaring the
+    condition number of :math:`A`.
+
+    The algorithm is batched with a stopping criterion per sample: a sample stops being updated once either the
+    residual :math:`\|b_i - Ax_i\|` is below :math:`\max(\text{tol}, \text{rtol}\|b_i\|)` (consistent systems),
+    or the residual of the normal equations :math:`\|A^{\top}(b_i - Ax_i)\|` is below
+    :math:`\max(\text{tol}, \text{rtol}\|A^{\top}b_i\|)` (inconsistent systems).
+
+    For more details see: C. C. Paige and M. A. Saunders, "LSQR: An algorithm for sparse linear equations and
+    sparse least squares", ACM Transactions on Mathematical Software, 1982.
+
+    :param (callable) A: linear operator as a callable function.
+    :param (callable) A_adjoint: adjoint of the linear operator as a callable function.
+    :param torch.Tensor, deepinv.utils.TensorList b: measurements.
+    :param int max_iter: maximum number of iterations.
+    :param float tol: absolute tolerance for stopping the algorithm.
+    :param torch.Tensor, deepinv.utils.TensorList x0: initial guess (warm start). If ``None``, the algorithm starts
+        from zero.
+    :param float rtol: relative tolerance for stopping the algorithm.
+    :return: torch.Tensor :math:`x` minimizing :math:`\|Ax - b\|^2`.
+    """
+    if x0 is None:
+        u = b
+    else:
+        u = b - A(x0)
+
+    thres = _thresholds(b, tol, rtol)
+
+    beta = _batch_norm(u)
+    active = beta > thres
+    u = u * _expand(_safe_div(torch.ones_like(beta), beta, active), u)
+    v = A_adjoint(u)
+    x = zeros_like(v) if x0 is None else x0
+
+    alpha = _batch_norm(v)
+    thres_normal = _thresholds(v * _expand(beta, v), tol, rtol)
+    active = active & (alpha * beta > thres_normal)
+    v = v * _expand(_safe_div(torch.ones_like(alpha), alpha, active), v)
+
+    w = v
+    phibar = beta
+    rhobar = alpha
+    for i in range(int(max_iter)):
+        if not active.any():
+            break
+        # Golub-Kahan bidiagonalization
+        u = A(v) - u * _expand(alpha, u)
+        beta = _batch_norm(u)
+        u = u * _expand(_safe_div(torch.ones_like(beta), beta, active), u)
+        v = A_adjoint(u) - v * _expand(beta, v)
+        alpha = _batch_norm(v)
+        v = v * _expand(_safe_div(torch.ones_like(alpha), alpha, active), v)
+
+        # plane rotation eliminating the subdiagonal
+        rho = torch.sqrt(rhobar**2 + beta**2)
+        c = _safe_div(rhobar, rho, active)
+        s = _safe_div(beta, rho, active)
+        theta = s * alpha
+        rhobar = -c * alpha
+        phi = c * phibar
+        phibar = torch.where(active, s * phibar, phibar)
+
+        x = x + w * _expand(_safe_div(phi, rho, active), w)
+        w = v - w * _expand(_safe_div(theta, rho, active), w)
+
+        # phibar = |b - Ax| and phibar * alpha * |c| = |A^T(b - Ax)|
+        active = active & (phibar > thres) & (phibar * alpha * c.abs() > thres_normal)
+
+    return x
+
+
+class ProxCache:
+    r"""
+    Warm starts for the inner linear solves of proximal operators.
+
+    Within an optimization algorithm (e.g. HQS, ADMM or DRS), the proximal operator of the data-fidelity term
+    :meth:`deepinv.physics.LinearPhysics.prox_l2` is computed at each iteration with the conjugate gradient method,
+    at points which barely change between consecutive iterations. While the cache is active, the last solution
+    computed for each physics is stored, and used as initial guess for the next solve with the same physics,
+    which reduces the number of inner iterations.
+
+    The cache is activated as a context manager, and is used by :class:`deepinv.optim.FixedPoint` if
+    ``warm_start_prox=True`` in :class:`deepinv.optim.BaseOptim`:
+
+    ::
+
+        cache = ProxCache()
+        with cache:
+            for it in range(max_iter):
+                x = physics.prox_l2(z, y, gamma)  # warm-started after the first iteration
+                ...
+
+    The stored solutions are detached from the computational graph.
+    """
+
+    _active = None
+
+    def __init__(self):
+        self.solutions = {}
+        self._previous = None
+
+    def __enter__(self):
+        self._previous = ProxCache._active
+        ProxCache._active = self
+        return self
+
+    def __exit__(self, *args):
+        ProxCache._active = self._previous
+        self._previous = None
+
+    @staticmethod
+    def current():
+        r"""
+        Returns the active cache, or ``None`` if there is no active cache.
+        """
+        return ProxCache._active
+
+    def reset(self):
+        r"""
+        Removes all the stored solutions.
+        """
+        self.solutions = {}
+
+    def get(self, physics, like):
+        r"""
+        Returns the last solution stored for ``physics``, or ``None`` if there is no stored solution with the
+        same shape, device and dtype as ``like``.
+
+        :param deepinv.physics.Physics physics: physics of the solve.
+        :param torch.Tensor like: tensor with the expected shape of the solution.
+        """
+        stored = self.solutions.get(id(physics))
+        if stored is None or stored[0] is not physics:
+            return None
+        x = stored[1]
+        if x.shape != like.shape or x.device != like.device or x.dtype != like.dtype:
+            return None
+        return x
+
+    def update(self, physics, x):
+        r"""
+        Stores the last solution computed for ``physics``.
+
+        :param deepinv.physics.Physics physics: physics of the solve.
+        :param torch.Tensor x: solution.
+        """
+        self.solutions[id(physics)] = (physics, x.detach())
+
+
 def gradient_descent(grad_f, x, step_size=1.0, max_iter=1e2, tol=1e-5):
     """
     Standard gradient descent algorithm`.
@@ -1,6 +1,6 @@
 from .inpainting import Inpainting
 from .compressed_sensing import CompressedSensing
-from .blur import Blur, BlindBlur, Downsampling, BlurFFT
+from .blur import Blur, BlindBlur, Downsampling, BlurFFT, SpaceVaryingBlur
 from .range import Decolorize
 from .haze import Haze
 from .forward import (
@@ -18,8 +18,9 @@ from .noise import (
     UniformGaussianNoise,
     LogPoissonNoise,
 )
-from .mri import MRI
+from .mri import MRI, MultiCoilMRI, NonCartesianMRI
 from .tomography import Tomography
+from .svd import SVDPhysics, to_decomposable
 from .lidar import SinglePhotonLidar
 from .singlepixel import SinglePixelCamera
 from .remote_sensing import Pansharpen
@@ -4,9 +4,18 @@ import torch.nn.functional as F
 import torch
 import numpy as np
 import torch.fft as fft
-from deepinv.physics.forward import Physics, LinearPhysics, DecomposablePhysics
+import math
+from deepinv.physics.forward import (
+    Physics,
+    LinearPhysics,
+    DecomposablePhysics,
+    _version,
+)
 from deepinv.utils import TensorList
 
+# relative cost of one FFT operation w.r.t. one multiply-add of a spatial convolution
+FFT_CONV_COST = 4.0
+
 
 def filter_fft(filter, img_size, real_fft=True):
     ph = int((filter.shape[2] - 1) / 2)
@@ -59,6 +68,40 @@ def gaussian_blur(sigma=(1, 1), angle=0):
     return filt.unsqueeze(0).unsqueeze(0)
 
 
+def random_gaussian_blur(
+    batch_size, kernel_size, sigma_range=None, generator=None, device="cpu"
+):
+    r"""
+    Batch of random anisotropic Gaussian blur filters, computed without any loop over the batch.
+
+    The standard deviations along the two axes of each filter are drawn uniformly in ``sigma_range``, and its
+    orientation uniformly in :math:`[0, \pi)`.
+
+    :param int batch_size: number of filters.
+    :param int, tuple[int] kernel_size: support (h, w) of the filters.
+    :param tuple[float] sigma_range: interval of the standard deviations. If ``None``, it is set to
+        :math:`[0.5, (\min(h, w) - 1) / 6]`, so that the filters fit in their support.
+    :param torch.Generator generator: random number generator. If ``None``, the global generator is used.
+    :param torch.device device: cpu or gpu.
+    :return: (torch.Tensor) filters of size (batch_size, 1, h, w), which sum to one.
+    """
+    if isinstance(kernel_size, int):
+        kernel_size = (kernel_size, kernel_size)
+    h, w = kernel_size
+    if sigma_range is None:
+        sigma_range = (0.5, max(0.5, (min(h, w) - 1) / 6))
+
+    u = torch.rand((3, batch_size, 1, 1, 1), generator=generator, device=device)
+    sx, sy = sigma_range[0] + (sigma_range[1] - sigma_range[0]) * u[:2]
+    cos, sin = torch.cos(math.pi * u[2]), torch.sin(math.pi * u[2])
+
+    x = (torch.arange(h, device=device) - (h - 1) / 2).view(-1, 1)
+    y = (torch.arange(w, device=device) - (w - 1) / 2).view(1, -1)
+    filt = ((cos * x + sin * y) / sx) ** 2 + ((cos * y - sin * x) / sy) ** 2
+    filt = torch.exp(-filt / 2.0)
+    return filt / filt.sum(dim=(-2, -1), keepdim=True)
+
+
 def bilinear_filter(factor=2):
     x = np.arange(start=-factor + 0.5, stop=factor, step=1) / factor
     w = 1 - np.abs(x)
@@ -101,6 +144,9 @@ class Downsampling(LinearPhysics):
     :param str padding: options are ``'valid'``, ``'circular'``, ``'replicate'`` and ``'reflect'``.
         If ``padding='valid'`` the blurred output is smaller than the image (no padding)
         otherwise the blurred output has the same size as the image.
+    :param str conv_method: ``'spatial'``, ``'fft'`` or ``'auto'``, see :class:`deepinv.physics.Blur`.
+    :param float separable_tol: relative error of the separable decomposition of the filter, see
+        :class:`deepinv.physics.Blur`.
 
     |sep|
 
@@ -126,6 +172,8 @@ class Downsampling(LinearPhysics):
         filter="gaussian",
         device="cpu",
         padding="circular",
+        conv_method="auto",
+        separable_tol=1e-6,
         **kwargs,
     ):
         super().__init__(**kwargs)
@@ -148,27 +196,157 @@ class Downsampling(LinearPhysics):
         else:
             raise Exception("The chosen downsampling filter doesn't exist")
 
+        self.fourier_tables = {}
+        self.adjoint_buffer = {}
+        if self.filter is not None:
+            self._set_filter(self.filter)
+
+        self.conv_dispatcher = ConvolutionDispatcher(conv_method, separable_tol)
+
+    def _set_filter(self, filter):
+        self.Fh = filter_fft(filter, self.imsize, real_fft=False).to(filter.device)
+        Fhc = torch.conj(self.Fh)
+        self.filter = torch.nn.Parameter(filter, requires_grad=False)
+        self.Fhc = torch.nn.Parameter(Fhc, requires_grad=False)
+        self.Fh2 = torch.nn.Parameter(Fhc * self.Fh, requires_grad=False)
+        self.fourier_tables.clear()
+
+    def _fourier_tables(self, img_size, device, dtype):
+        r"""
+        Returns the (cached) gamma-independent tables of the closed-form normal operator and proximal operator with
+        circular padding: the spectrum :math:`\hat{h}` of the filter and its conjugate, viewed as
+        :math:`\text{factor}^2` blocks of size (H/factor, W/factor), and the block-average of :math:`|\hat{h}|^2`.
+        They are computed once per image size, device and dtype of the images.
+        """
+        key = (tuple(img_size), str(device), dtype)
+        cached = self.fourier_tables.get(key)
+        if cached is None:
+            if tuple(img_size) == tuple(self.Fh.shape[-2:]):
+                Fh = self.Fh
+            else:
+                Fh = filter_fft(self.filter, img_size, real_fft=False)
+            Fh = Fh.to(device, torch.promote_types(dtype, torch.cfloat))
+            Fh = _blocks(Fh, self.factor)
+            Fh2 = (Fh.real**2 + Fh.imag**2).mean(dim=(-4, -2))
+            cached = (Fh, torch.conj(Fh), Fh2)
+            self.fourier_tables[key] = cached
+        return cached
+
+    def sample_params(self, batch_size, generator=None, sigma_range=None):
+        r"""
+        Samples one random Gaussian filter per sample with :meth:`deepinv.physics.blur.random_gaussian_blur`, with
+        the same support as the current filter. If there is no filter, only the noise parameters are sampled.
+
+        :param int batch_size: number of filters.
+        :param torch.Generator generator: random number generator. If ``None``, the global generator is used.
+        :param tuple[float] sigma_range: interval of the standard deviations of the filters.
+        :return: (dict) parameters, with the filters of size (batch_size, 1, h, w) under the key ``'filter'``.
+        """
+        params = super().sample_params(batch_size, generator)
         if self.filter is not None:
-            self.Fh = filter_fft(self.filter, img_size, real_fft=False).to(device)
-            self.Fhc = torch.conj(self.Fh)
-            self.Fh2 = self.Fhc * self.Fh
-            self.filter = torch.nn.Parameter(self.filter, requires_grad=False)
-            self.Fhc = torch.nn.Parameter(self.Fhc, requires_grad=False)
-            self.Fh2 = torch.nn.Parameter(self.Fh2, requires_grad=False)
+            params["filter"] = random_gaussian_blur(
+                batch_size,
+                self.filter.shape[-2:],
+                sigma_range=sigma_range,
+                generator=generator,
+                device=self._params_device(generator, self.filter),
+            ).to(self.filter.dtype)
+        return params
+
+    def update_parameters(self, filter=None, **kwargs):
+        r"""
+        Updates the filter of the operator.
+
+        :param torch.Tensor filter: new filter, of size (B, 1, h, w) for one filter per sample,
+            see :meth:`sample_params`.
+        """
+        if filter is not None:
+            self._set_filter(filter.to(self._params_device(like=self.filter)))
+        super().update_parameters(**kwargs)
 
     def A(self, x):
         if self.filter is not None:
-            x = conv(x, self.filter, padding=self.padding)
+            x = self.conv_dispatcher.conv(x, self.filter, padding=self.padding)
         x = x[:, :, :: self.factor, :: self.factor]  # downsample
         return x
 
+    def _zero_upsampling(self, y):
+        r"""
+        Upsampling of ``y`` with zeros to the image size, or to the size of the blurred image if ``padding='valid'``.
+
+        If the upsampled image is only used as the input of the transposed convolution (i.e., if there is a
+        filter and no gradient is tracked through ``y`` or the filter, which would save it for the backward pass),
+        it is written in a buffer which is reused across calls: its entries between the samples are never written,
+        so that they remain zero and the buffer is not cleared.
+        """
+        shape = (y.shape[0],) + tuple(self.imsize)
+        if self.filter is not None and self.padding == "valid":
+            kh, kw = (_extended_size(k) for k in self.filter.shape[-2:])
+            shape = shape[:-2] + (shape[-2] - kh + 1, shape[-1] - kw + 1)
+        if self.filter is None or (
+            torch.is_grad_enabled() and (y.requires_grad or self.filter.requires_grad)
+        ):
+            x = torch.zeros(shape, device=y.device, dtype=y.dtype)
+        else:
+            key = (shape, str(y.device), y.dtype, torch.is_inference_mode_enabled())
+            x = self.adjoint_buffer.get(key)
+            if x is None:
+                self.adjoint_buffer.clear()  # only keep the buffer of the last size
+                x = torch.zeros(shape, device=y.device, dtype=y.dtype)
+                self.adjoint_buffer[key] = x
+        x[:, :, :: self.factor, :: self.factor] = y
+        return x
+
     def A_adjoint(self, y):
-        x = torch.zeros((y.shape[0],) + self.imsize, device=y.device)
-        x[:, :, :: self.factor, :: self.factor] = y  # upsample
+        x = self._zero_upsampling(y)
         if self.filter is not None:
-            x = conv_transpose(x, self.filter, padding=self.padding)
+            x = self.conv_dispatcher.conv_transpose(
+                x, self.filter, padding=self.padding
+            )
         return x
 
+    def A_adjoint_A(self, x):
+        r"""
+        Computes the normal operator :math:`A^{\top}Ax`.
+
+        If the padding is circular and the image size is a multiple of the factor, the subsampling followed by
+        zero-filled upsampling corresponds to an aliasing of the spectrum, so that
+
+        .. math::
+
+            A^{\top}Ax = F^{-1}\left(\overline{\hat{h}} \cdot \text{alias}(\hat{h} \cdot Fx)\right)
+
+        where :math:`\text{alias}` averages the :math:`\text{factor}^2` blocks of the spectrum, which only requires
+        two FFTs. With replicate or reflect padding, the same formula is applied on a grid embedding the linear
+        convolution, see :meth:`deepinv.physics.blur.conv_normal_fft`.
+
+        :param torch.Tensor x: signal/image.
+        :return: (torch.Tensor) :math:`A^{\top}Ax`.
+        """
+        H, W = x.shape[-2:]
+        if self.filter is None:
+            out = torch.zeros_like(x)
+            out[:, :, :: self.factor, :: self.factor] = x[
+                :, :, :: self.factor, :: self.factor
+            ]
+            return out
+        elif (
+            self.padding == "circular"
+            and H % self.factor == 0
+            and W % self.factor == 0
+            and x.shape[-2:] == self.Fh.shape[-2:]
+        ):
+            Fh, Fhc, _ = self._fourier_tables((H, W), x.device, x.dtype)
+            u = (Fh * _blocks(fft.fft2(x), self.factor)).mean(dim=(-4, -2))
+            u = Fhc * u.unsqueeze(-2).unsqueeze(-4)
+            return torch.real(fft.ifft2(u.reshape(u.shape[:-4] + (H, W))))
+        elif self.padding != "valid" and x.shape[-2:] == self.imsize[-2:]:
+            return self.conv_dispatcher.conv_normal(
+                x, self.filter, self.padding, factor=self.factor
+            )
+        else:
+            return LinearPhysics.A_adjoint_A(self, x)
+
     def prox_l2(self, z, y, gamma, use_fft=True):
         r"""
         If the padding is circular, it computes the proximal operator with the closed-formula of
@@ -179,28 +357,58 @@ class Downsampling(LinearPhysics):
 
         if use_fft and self.padding == "circular":  # Formula from (Zhao, 2016)
             z_hat = self.A_adjoint(y) + 1 / gamma * z
-            Fz_hat = fft.fft2(z_hat)
-
-            def splits(a, sf):
-                """split a into sfxsf distinct blocks
-                Args:
-                    a: NxCxWxH
-                    sf: split factor
-                Returns:
-                    b: NxCx(W/sf)x(H/sf)x(sf^2)
-                """
-                b = torch.stack(torch.chunk(a, sf, dim=2), dim=4)
-                b = torch.cat(torch.chunk(b, sf, dim=3), dim=4)
-                return b
-
-            top = torch.mean(splits(self.Fh * Fz_hat, self.factor), dim=-1)
-            below = torch.mean(splits(self.Fh2, self.factor), dim=-1) + 1 / gamma
-            rc = self.Fhc * (top / below).repeat(1, 1, self.factor, self.factor)
-            r = torch.real(fft.ifft2(rc))
-            return (z_hat - r) * gamma
+            return self._circular_normal_solve(z_hat, gamma)
         else:
             return LinearPhysics.prox_l2(self, z, y, gamma)
 
+    def _circular_normal_solve(self, b, gamma):
+        r"""
+        Solves :math:`(A^{\top}A + \frac{1}{\gamma}I)x = b` for circular padding, with the closed-formula of
+        https://arxiv.org/abs/1510.00143.
+
+        Only the division by :math:`\text{alias}(|\hat{h}|^2) + \frac{1}{\gamma}` depends on :math:`\gamma`; the
+        other Fourier tables are cached (see :meth:`_fourier_tables`) and the blocks of the spectra are
+        broadcast instead of being repeated.
+        """
+        H, W = b.shape[-2:]
+        Fh, Fhc, Fh2 = self._fourier_tables((H, W), b.device, b.dtype)
+        top = (Fh * _blocks(fft.fft2(b), self.factor)).mean(dim=(-4, -2))
+        rc = Fhc * (top / (Fh2 + 1 / gamma)).unsqueeze(-2).unsqueeze(-4)
+        r = torch.real(fft.ifft2(rc.reshape(rc.shape[:-4] + (H, W))))
+        return (b - r) * gamma
+
+    def preconditioner(self, gamma):
+        r"""
+        Preconditioner for the conjugate gradient iterations of :meth:`prox_l2` with non-circular padding.
+
+        It solves exactly :math:`(A^{\top}A + \frac{1}{\gamma}I)x = r` for the operator with circular padding
+        (see :meth:`prox_l2`), which is a good approximation of the operator with the other padding modes.
+
+        :param float gamma: hyperparameter of the proximal operator.
+        :return: (callable, None) preconditioner.
+        """
+        H, W = self.imsize[-2:]
+        if self.filter is None or H % self.factor != 0 or W % self.factor != 0:
+            return None
+        return lambda r: self._circular_normal_solve(r, gamma)
+
+
+def _blocks(a, sf):
+    r"""
+    Splits a spectrum of size (..., H, W) into its :math:`sf \times sf` blocks of size (H/sf, W/sf), as a view
+    of size (..., sf, H/sf, sf, W/sf).
+    """
+    H, W = a.shape[-2:]
+    return a.reshape(a.shape[:-2] + (sf, H // sf, sf, W // sf))
+
+
+def _fold_spectrum(a, sf):
+    r"""
+    Averages the :math:`sf \times sf` blocks of a spectrum of size (..., H, W), which gives a spectrum of size
+    (..., H/sf, W/sf). This is the Fourier counterpart of a subsampling by a factor :math:`sf`.
+    """
+    return _blocks(a, sf).mean(dim=(-4, -2))
+
 
 def extend_filter(filter):
     b, c, h, w = filter.shape
@@ -222,17 +430,63 @@ def extend_filter(filter):
     elif h % 2 == 0:
         h_new += 1
 
-    out = torch.zeros((b, c, h_new, w_new), device=filter.device)
+    out = torch.zeros((b, c, h_new, w_new), device=filter.device, dtype=filter.dtype)
     out[:, :, offset_h : h + offset_h, offset_w : w + offset_w] = filter
     return out
 
 
+def _grouped_conv2d(x, filter):
+    r"""
+    Valid correlation of every channel of ``x`` with a single-channel filter, in one call to ``conv2d``.
+
+    Batch and channels are folded into the channel dimension. If the filter has one entry per batch element
+    (i.e. ``filter.shape[0] == x.shape[0]``) each sample is filtered with its own kernel using a grouped convolution.
+
+    :param torch.Tensor x: Image of size (B,C,H,W).
+    :param torch.Tensor filter: Filter of size (1,1,h,w) or (B,1,h,w).
+    """
+    b, c, h, w = x.shape
+    if filter.shape[0] == 1:
+        y = F.conv2d(x.reshape(b * c, 1, h, w), filter)
+    elif filter.shape[0] == b:
+        y = F.conv2d(
+            x.reshape(1, b * c, h, w), filter.repeat_interleave(c, dim=0), groups=b * c
+        )
+    else:
+        raise ValueError(
+            f"The filter batch size ({filter.shape[0]}) should be 1 or match the batch size of the input ({b})."
+        )
+    return y.view(b, c, y.shape[-2], y.shape[-1])
+
+
+def _grouped_conv_transpose2d(y, filter):
+    r"""
+    Transposed operation of :meth:`deepinv.physics.blur._grouped_conv2d`.
+
+    :param torch.Tensor y: Image of size (B,C,H,W).
+    :param torch.Tensor filter: Filter of size (1,1,h,w) or (B,1,h,w).
+    """
+    b, c, h, w = y.shape
+    if filter.shape[0] == 1:
+        x = F.conv_transpose2d(y.reshape(b * c, 1, h, w), filter)
+    elif filter.shape[0] == b:
+        x = F.conv_transpose2d(
+            y.reshape(1, b * c, h, w), filter.repeat_interleave(c, dim=0), groups=b * c
+        )
+    else:
+        raise ValueError(
+            f"The filter batch size ({filter.shape[0]}) should be 1 or match the batch size of the input ({b})."
+        )
+    return x.view(b, c, x.shape[-2], x.shape[-1])
+
+
 def conv(x, filter, padding):
     r"""
     Convolution of x and filter. The transposed of this operation is conv_transpose(x, filter, padding)
 
     :param x: (torch.Tensor) Image of size (B,C,W,H).
     :param filter: (torch.Tensor) Filter of size (1,C,W,H) for colour filtering or (1,1,W,H) for filtering each channel with the same filter.
+        A filter of size (B,1,W,H) applies a different filter to each element of the batch.
     :param padding: (string) options = 'valid','circular','replicate','reflect'. If padding='valid' the blurred output is smaller than the image (no padding), otherwise the blurred output has the same size as the image.
 
     """
@@ -247,23 +501,14 @@ def conv(x, filter, padding):
     ph = (filter.shape[2] - 1) / 2
     pw = (filter.shape[3] - 1) / 2
 
-    if padding == "valid":
-        h_out = int(h - 2 * ph)
-        w_out = int(w - 2 * pw)
-    else:
-        h_out = h
-        w_out = w
+    if padding != "valid":
         pw = int(pw)
         ph = int(ph)
         x = F.pad(x, (pw, pw, ph, ph), mode=padding, value=0)
 
     if filter.shape[1] == 1:
-        y = torch.zeros((b, c, h_out, w_out), device=x.device)
-        for i in range(b):
-            for j in range(c):
-                y[i, j, :, :] = F.conv2d(
-                    x[i, j, :, :].unsqueeze(0).unsqueeze(1), filter, padding="valid"
-                ).unsqueeze(1)
+        # fold batch and channels into a single (grouped) convolution call
+        y = _grouped_conv2d(x, filter)
     else:
         y = F.conv2d(x, filter, padding="valid")
 
@@ -276,6 +521,7 @@ def conv_transpose(y, filter, padding):
 
     :param torch.tensor x: Image of size (B,C,W,H).
     :param torch.tensor filter: Filter of size (1,C,W,H) for colour filtering or (1,C,W,H) for filtering each channel with the same filter.
+        A filter of size (B,1,W,H) applies a different filter to each element of the batch.
     :param str padding: options are ``'valid'``, ``'circular'``, ``'replicate'`` and ``'reflect'``.
         If ``padding='valid'`` the blurred output is smaller than the image (no padding)
         otherwise the blurred output has the same size as the image.
@@ -292,26 +538,28 @@ def conv_transpose(y, filter, padding):
     ph = (filter.shape[2] - 1) / 2
     pw = (filter.shape[3] - 1) / 2
 
-    h_out = int(h + 2 * ph)
-    w_out = int(w + 2 * pw)
     pw = int(pw)
     ph = int(ph)
 
-    x = torch.zeros((b, c, h_out, w_out), device=y.device)
     if filter.shape[1] == 1:
-        for i in range(b):
-            if filter.shape[0] > 1:
-                f = filter[i, :, :, :].unsqueeze(0)
-            else:
-                f = filter
-
-            for j in range(c):
-                x[i, j, :, :] = F.conv_transpose2d(
-                    y[i, j, :, :].unsqueeze(0).unsqueeze(1), f
-                )
+        # fold batch and channels into a single (grouped) transposed convolution call
+        x = _grouped_conv_transpose2d(y, filter)
     else:
         x = F.conv_transpose2d(y, filter)
 
+    return _pad_adjoint(x, padding, ph, pw)
+
+
+def _pad_adjoint(x, padding, ph, pw):
+    r"""
+    Transposed of the padding of :meth:`deepinv.physics.blur.conv`, which folds the borders of ``x`` back
+    into the image.
+
+    :param torch.Tensor x: Image of size (B,C,H+2ph,W+2pw).
+    :param str padding: options are ``'valid'``, ``'circular'``, ``'replicate'`` and ``'reflect'``.
+    :param int ph: padding size along the height.
+    :param int pw: padding size along the width.
+    """
     if padding == "valid":
         out = x
     elif padding == "zero":
@@ -357,6 +605,506 @@ def conv_transpose(y, filter, padding):
     return out
 
 
+def _extended_size(n):
+    r"""
+    Size of a filter dimension after :meth:`deepinv.physics.blur.extend_filter`.
+    """
+    if n == 1:
+        return 3
+    return n + 1 if n % 2 == 0 else n
+
+
+def filter_spectrum(filter, fft_size, padding, dtype=None):
+    r"""
+    Real Fourier transform of a filter, as used by :meth:`deepinv.physics.blur.conv_fft` and
+    :meth:`deepinv.physics.blur.conv_transpose_fft`.
+
+    For circular padding, the filter is centered at the origin of a grid of the size of the image, otherwise
+    it is zero-padded on the (padded) image grid.
+
+    :param torch.Tensor filter: Filter of size (B,C,h,w).
+    :param tuple[int] fft_size: size (H, W) of the Fourier grid.
+    :param str padding: options are ``'valid'``, ``'circular'``, ``'replicate'`` and ``'reflect'``.
+    :param torch.dtype dtype: real dtype of the images to be filtered. If ``None``, the dtype of the filter is used.
+    :return: (torch.Tensor) complex tensor of size (B,C,H,W//2+1).
+    """
+    filter = extend_filter(filter.flip(-1).flip(-2))
+    if dtype is not None:
+        filter = filter.to(dtype)
+    kh, kw = filter.shape[-2:]
+    if padding == "circular":
+        filter = F.pad(filter, (0, fft_size[1] - kw, 0, fft_size[0] - kh))
+        filter = torch.roll(filter, shifts=(-(kh // 2), -(kw // 2)), dims=(-2, -1))
+        return fft.rfft2(filter)
+    return fft.rfft2(filter, s=tuple(fft_size))
+
+
+def conv_fft(x, filter, padding, spectrum=None):
+    r"""
+    FFT-based computation of :meth:`deepinv.physics.blur.conv`, which gives the same output up to numerical precision.
+
+    Circular convolutions are computed on the image grid. The other padding modes pad the image first,
+    and compute the linear convolution on the padded grid.
+
+    :param torch.Tensor x: Image of size (B,C,H,W).
+    :param torch.Tensor filter: Filter of size (1,C,h,w), (1,1,h,w) or (B,1,h,w), see :meth:`deepinv.physics.blur.conv`.
+    :param str padding: options are ``'valid'``, ``'circular'``, ``'replicate'`` and ``'reflect'``.
+    :param torch.Tensor spectrum: precomputed :meth:`deepinv.physics.blur.filter_spectrum` on the grid of the
+        (padded) image. If ``None``, it is computed on the fly.
+    """
+    kh, kw = _extended_size(filter.shape[-2]), _extended_size(filter.shape[-1])
+    if padding not in ("valid", "circular"):
+        x = F.pad(x, (kw // 2, kw // 2, kh // 2, kh // 2), mode=padding)
+
+    fft_size = x.shape[-2:]
+    if spectrum is None:
+        spectrum = filter_spectrum(filter, fft_size, padding, dtype=x.dtype)
+
+    # correlation with the flipped filter, i.e. a convolution with the filter
+    y = fft.rfft2(x) * torch.conj(spectrum)
+    if filter.shape[1] > 1:
+        y = y.sum(dim=1, keepdim=True)
+    y = fft.irfft2(y, s=fft_size)
+
+    if padding != "circular":
+        y = y[:, :, : fft_size[0] - kh + 1, : fft_size[1] - kw + 1]
+    return y
+
+
+def conv_transpose_fft(y, filter, padding, spectrum=None):
+    r"""
+    FFT-based computation of :meth:`deepinv.physics.blur.conv_transpose`, which gives the same output up to
+    numerical precision.
+
+    :param torch.Tensor y: Image of size (B,C,H,W).
+    :param torch.Tensor filter: Filter of size (1,C,h,w), (1,1,h,w) or (B,1,h,w), see :meth:`deepinv.physics.blur.conv`.
+    :param str padding: options are ``'valid'``, ``'circular'``, ``'replicate'`` and ``'reflect'``.
+    :param torch.Tensor spectrum: precomputed :meth:`deepinv.physics.blur.filter_spectrum` on the grid of the
+        (padded) image. If ``None``, it is computed on the fly.
+    """
+    kh, kw = _extended_size(filter.shape[-2]), _extended_size(filter.shape[-1])
+    if padding == "circular":
+        fft_size = y.shape[-2:]
+    else:
+        fft_size = (y.shape[-2] + kh - 1, y.shape[-1] + kw - 1)
+
+    if spectrum is None:
+        spectrum = filter_spectrum(filter, fft_size, padding, dtype=y.dtype)
+
+    x = fft.irfft2(fft.rfft2(y, s=fft_size) * spectrum, s=fft_size)
+
+    if padding == "circular":
+        return x
+    return _pad_adjoint(x, padding, kh // 2, kw // 2)
+
+
+def _toeplitz_size(n, k, factor=1):
+    r"""
+    Size of the Fourier grid embedding the full (linear) convolution of a signal of size ``n`` with a filter of
+    size ``k``, rounded up to a multiple of ``factor``.
+    """
+    n = n + k - 1
+    return n + (-n) % factor
+
+
+def normal_spectrum(filter, fft_size, padding, factor=1, dtype=None):
+    r"""
+    Spectrum used by :meth:`deepinv.physics.blur.conv_normal_fft`.
+
+    If ``factor=1``, it is the squared modulus of the real Fourier transform of the filter (see
+    :meth:`deepinv.physics.blur.filter_spectrum`), which is the spectrum of the autocorrelation of the filter.
+    Otherwise, it is the complex (full) Fourier transform of the filter.
+
+    :param torch.Tensor filter: Filter of size (B,1,h,w).
+    :param tuple[int] fft_size: size (H, W) of the Fourier grid.
+    :param str padding: options are ``'valid'``, ``'circular'``, ``'replicate'`` and ``'reflect'``.
+    :param int factor: subsampling factor of the convolution output.
+    :param torch.dtype dtype: real dtype of the images to be filtered. If ``None``, the dtype of the filter is used.
+    """
+    if factor == 1:
+        return filter_spectrum(filter, fft_size, padding, dtype=dtype).abs() ** 2
+    filter = extend_filter(filter.flip(-1).flip(-2))
+    if dtype is not None:
+        filter = filter.to(dtype)
+    return fft.fft2(filter, s=tuple(fft_size))
+
+
+def _border_correction(x, filter, factor=1):
+    r"""
+    Normal operator :math:`C^{\top}MCx` restricted to the outputs of the full correlation :math:`C` of ``x`` with
+    ``filter`` which are not in the valid region, where :math:`M` keeps one output every ``factor`` pixels.
+
+    The full correlation is only computed (in the spatial domain) on the four bands of width :math:`h-1` (resp.
+    :math:`w-1`) around the valid region, which costs :math:`O((H+W)h^2w)` operations.
+
+    :param torch.Tensor x: (padded) image of size (B,C,H,W).
+    :param torch.Tensor filter: flipped and extended filter of size (1,1,h,w) or (B,1,h,w).
+    :param int factor: subsampling factor of the valid outputs.
+    """
+    kh, kw = filter.shape[-2:]
+    hout, wout = x.shape[-2] - kh + 1, x.shape[-1] - kw + 1
+    x = F.pad(x, (kw - 1, kw - 1, kh - 1, kh - 1))
+    out = torch.zeros_like(x)
+
+    # rows and columns of the zero-padded image seen by each band of outputs (top, bottom, left, right)
+    bands = [
+        (0, 2 * kh - 2, 0, x.shape[-1]),
+        (hout + kh - 1, x.shape[-2], 0, x.shape[-1]),
+        (kh - 1, hout + 2 * kh - 2, 0, 2 * kw - 2),
+        (kh - 1, hout + 2 * kh - 2, wout + kw - 1, x.shape[-1]),
+    ]
+    for r0, r1, c0, c1 in bands:
+        z = _grouped_conv2d(x[:, :, r0:r1, c0:c1], filter)
+        if factor > 1:
+            # position of the outputs with respect to the first valid output
+            rows = torch.arange(z.shape[-2], device=x.device) + r0 - kh + 1
+            cols = torch.arange(z.shape[-1], device=x.device) + c0 - kw + 1
+            mask = (rows % factor == 0)[:, None] & (cols % factor == 0)[None, :]
+            z = z * mask
+        out[:, :, r0:r1, c0:c1] += _grouped_conv_transpose2d(z, filter)
+    return out[:, :, kh - 1 : x.shape[-2] - kh + 1, kw - 1 : x.shape[-1] - kw + 1]
+
+
+def conv_normal_fft(x, filter, padding, factor=1, spectrum=None):
+    r"""
+    Computes the normal operator ``conv_transpose(S^T S conv(x, filter, padding), filter, padding)`` of a
+    (subsampled) convolution with FFTs, where :math:`S` keeps one pixel every ``factor`` pixels.
+
+    For non-circular padding, the image is padded and the full linear correlation :math:`C` is embedded in a
+    circular one on a grid of size :math:`(H+h-1, W+w-1)`. On this grid, :math:`C^{\top}C` is a Toeplitz
+    operator which is diagonalized by the FFT, so that it is applied with a single FFT pair using the
+    autocorrelation spectrum of the filter. If ``factor > 1``, the subsampling is applied in the Fourier
+    domain by aliasing the spectrum. The outputs of the full correlation outside the valid region are then
+    removed with a spatial correction on the borders of the image
+    (see :meth:`deepinv.physics.blur._border_correction`), which is exact.
+
+    :param torch.Tensor x: Image of size (B,C,H,W).
+    :param torch.Tensor filter: Filter of size (1,1,h,w) or (B,1,h,w).
+    :param str padding: options are ``'valid'``, ``'circular'``, ``'replicate'`` and ``'reflect'``. Circular
+        padding is only supported with ``factor=1``.
+    :param int factor: subsampling factor of the convolution output.
+    :param torch.Tensor spectrum: precomputed :meth:`deepinv.physics.blur.normal_spectrum`. If ``None``, it is
+        computed on the fly.
+    """
+    kh, kw = _extended_size(filter.shape[-2]), _extended_size(filter.shape[-1])
+    if padding == "circular":
+        fft_size = x.shape[-2:]
+        if spectrum is None:
+            spectrum = normal_spectrum(filter, fft_size, padding, dtype=x.dtype)
+        return fft.irfft2(fft.rfft2(x) * spectrum, s=fft_size)
+
+    if padding != "valid":
+        x = F.pad(x, (kw // 2, kw // 2, kh // 2, kh // 2), mode=padding)
+    h, w = x.shape[-2:]
+    fft_size = (_toeplitz_size(h, kh, factor), _toeplitz_size(w, kw, factor))
+    if spectrum is None:
+        spectrum = normal_spectrum(filter, fft_size, padding, factor, dtype=x.dtype)
+
+    if factor == 1:
+        z = fft.irfft2(fft.rfft2(x, s=fft_size) * spectrum, s=fft_size)
+    else:
+        z = fft.fft2(x, s=fft_size) * torch.conj(spectrum)
+        z = _fold_spectrum(z, factor).repeat(1, 1, factor, factor)
+        z = torch.real(fft.ifft2(z * spectrum))
+
+    filter = extend_filter(filter.flip(-1).flip(-2)).to(x.dtype)
+    z = z[:, :, :h, :w] - _border_correction(x, filter, factor)
+
+    if padding == "valid":
+        return z
+    return _pad_adjoint(z, padding, kh // 2, kw // 2)
+
+
+def fft_conv_is_faster(img_size, filter_size, padding, rank=None):
+    r"""
+    Simple cost model choosing between spatial and FFT-based convolutions.
+
+    The spatial convolution costs :math:`HWhw` operations per channel (or :math:`HWr(h+w)` for a sum of :math:`r`
+    separable filters, see :meth:`deepinv.physics.blur.separable_decomposition`), whereas the FFT-based one costs
+    :math:`c N\log_2 N` operations, where :math:`N` is the number of pixels of the (padded) Fourier grid and
+    :math:`c` is given by the module constant ``FFT_CONV_COST``, which can be calibrated for a given machine with the
+    ``benchmarks/bench_conv_fft_crossover.py`` script.
+
+    :param tuple[int] img_size: size (H, W) of the image.
+    :param tuple[int] filter_size: size (h, w) of the filter.
+    :param str padding: options are ``'valid'``, ``'circular'``, ``'replicate'`` and ``'reflect'``.
+    :param int rank: number of separable terms of the spatial convolution, or ``None`` for a 2D convolution.
+    :return: (bool) ``True`` if the FFT-based convolution is expected to be faster.
+    """
+    h, w = img_size
+    kh, kw = _extended_size(filter_size[0]), _extended_size(filter_size[1])
+    if padding == "circular" and (kh > h or kw > w):
+        return False
+    if padding in ("valid", "circular"):
+        n = h * w
+    else:
+        n = (h + kh - 1) * (w + kw - 1)
+    spatial = kh * kw if rank is None else rank * (kh + kw)
+    return FFT_CONV_COST * n * math.log2(max(n, 2)) < h * w * spatial
+
+
+def separable_decomposition(filter, tol=1e-6):
+    r"""
+    Decomposes a 2D filter into a sum of separable filters
+
+    .. math::
+
+        h \approx \sum_{i=1}^{r} u_i v_i^{\top}
+
+    with a truncated SVD, where the rank :math:`r` is the smallest one such that the relative error (in Frobenius
+    norm) is below ``tol``. With the default tolerance, only filters which are exactly separable up to numerical
+    precision (e.g. :meth:`deepinv.physics.blur.bilinear_filter`, :meth:`deepinv.physics.blur.bicubic_filter`
+    or axis-aligned :meth:`deepinv.physics.blur.gaussian_blur`) have rank 1.
+
+    :param torch.Tensor filter: filter of size (h, w) or (1, 1, h, w).
+    :param float tol: relative approximation error.
+    :return: (tuple) the vertical factors :math:`u_i` of size (r, h) and the horizontal factors :math:`v_i` of size
+        (r, w).
+    """
+    f = filter.reshape(filter.shape[-2:]).to(torch.float64)
+    U, s, Vh = torch.linalg.svd(f, full_matrices=False)
+    # squared error of the truncation to the first i terms, for each i
+    residual = s.pow(2).flip(0).cumsum(0).flip(0)
+    rank = max(int((residual > tol**2 * residual[0]).sum()), 1)
+    scale = s[:rank].sqrt()
+    u = (U[:, :rank] * scale).t()
+    v = Vh[:rank] * scale.unsqueeze(1)
+    return u.to(filter.dtype), v.to(filter.dtype)
+
+
+def _conv_separable(x, col, row, padding):
+    r"""
+    Computes :meth:`deepinv.physics.blur.conv` with a sum of separable filters, with a vertical then a horizontal
+    correlation.
+
+    :param torch.Tensor x: Image of size (B,C,H,W).
+    :param torch.Tensor col: vertical factors of the flipped and extended filter, of size (r,1,h,1).
+    :param torch.Tensor row: horizontal factors of the flipped and extended filter, of size (1,r,1,w).
+    :param str padding: options are ``'valid'``, ``'circular'``, ``'replicate'`` and ``'reflect'``.
+    """
+    b, c = x.shape[:2]
+    kh, kw = col.shape[-2], row.shape[-1]
+    if padding != "valid":
+        x = F.pad(x, (kw // 2, kw // 2, kh // 2, kh // 2), mode=padding)
+    y = F.conv2d(F.conv2d(x.reshape((b * c, 1) + x.shape[-2:]), col), row)
+    return y.view((b, c) + y.shape[-2:])
+
+
+def _conv_transpose_separable(y, col, row, padding):
+    r"""
+    Transposed operation of :meth:`deepinv.physics.blur._conv_separable`, which computes
+    :meth:`deepinv.physics.blur.conv_transpose`.
+    """
+    b, c = y.shape[:2]
+    x = F.conv_transpose2d(y.reshape((b * c, 1) + y.shape[-2:]), row)
+    x = F.conv_transpose2d(x, col)
+    x = x.view((b, c) + x.shape[-2:])
+    return _pad_adjoint(x, padding, col.shape[-2] // 2, row.shape[-1] // 2)
+
+
+class ConvolutionDispatcher:
+    r"""
+    Applies :meth:`deepinv.physics.blur.conv` and :meth:`deepinv.physics.blur.conv_transpose` either in the
+    spatial domain or in the Fourier domain.
+
+    If ``method='auto'``, the choice is made at every call with :meth:`deepinv.physics.blur.fft_conv_is_faster`,
+    which depends on the image size, the filter size and the padding.
+    The spectra of the filters are cached for each Fourier grid size, device and dtype, and recomputed if the filter
+    is replaced or modified in-place. They are not cached for filters which require gradients.
+
+    In the spatial domain, single-channel filters which are (nearly) a sum of a few separable filters (see
+    :meth:`deepinv.physics.blur.separable_decomposition`) are applied as vertical and horizontal 1D convolutions,
+    whose cost is :math:`O(r(h+w))` per pixel instead of :math:`O(hw)`. The transposed convolution uses the same
+    factors, so that the adjoint remains exact. The decomposition is computed once per filter, and recomputed if
+    the filter is replaced or modified in-place. Filters which require gradients are always applied as 2D
+    convolutions.
+
+    :param str method: ``'auto'``, ``'spatial'`` or ``'fft'``.
+    :param float separable_tol: relative error of the separable decomposition of the filters. If ``None``, the
+        filters are always applied as 2D convolutions.
+    """
+
+    def __init__(self, method="auto", separable_tol=1e-6):
+        if method not in ("auto", "spatial", "fft"):
+            raise ValueError(
+                f"Unknown convolution method {method}, options are 'auto', 'spatial' and 'fft'."
+            )
+        self.method = method
+        self.separable_tol = separable_tol
+        self.spectra = {}
+        self.normal_spectra = {}
+        self.separable = None
+
+    def use_fft(self, img_size, filter, padding):
+        r"""
+        Returns ``True`` if the convolution of an image of size ``img_size`` should be computed with FFTs.
+        """
+        if self.method == "auto":
+            factors = self.separable_factors(filter)
+            rank = None if factors is None else factors[0].shape[0]
+            return fft_conv_is_faster(img_size, filter.shape[-2:], padding, rank=rank)
+        return self.method == "fft"
+
+    def separable_factors(self, filter):
+        r"""
+        Returns the (cached) factors of the separable decomposition of the flipped and extended filter, of sizes
+        (r,1,h,1) and (1,r,1,w), or ``None`` if the filter has several channels or batch elements, requires
+        gradients, or if the separable convolution is not cheaper than the 2D one.
+        """
+        if self.separable_tol is None or filter.shape[0] != 1 or filter.shape[1] != 1:
+            return None
+        if filter.requires_grad:
+            return None
+        version = _version(filter)
+        if (
+            self.separable is None
+            or self.separable[0] is not filter
+            or self.separable[1] != version  # the filter has been modified in-place
+        ):
+            f = extend_filter(filter.flip(-1).flip(-2))
+            kh, kw = f.shape[-2:]
+            u, v = separable_decomposition(f, self.separable_tol)
+            r = u.shape[0]
+            factors = None
+            if r * (kh + kw) < kh * kw:
+                factors = (u.reshape(r, 1, kh, 1), v.reshape(1, r, 1, kw))
+            self.separable = (filter, version, factors)
+        return self.separable[2]
+
+    def _spatial_factors(self, filter, like):
+        r"""
+        Separable factors of the filter (see :meth:`separable_factors`) on the device and dtype of ``like``.
+        """
+        factors = self.separable_factors(filter)
+        if factors is None:
+            return None
+        return [f.to(like.device, like.dtype) for f in factors]
+
+    def spectrum(self, filter, fft_size, padding, device, dtype):
+        r"""
+        Returns the (cached) spectrum of the filter on a Fourier grid of size ``fft_size``.
+        """
+        key = (
+            tuple(fft_size),
+            padding == "circular",
+            tuple(filter.shape),
+            str(device),
+            dtype,
+        )
+        if filter.requires_grad:
+            return filter_spectrum(filter.to(device), fft_size, padding, dtype=dtype)
+        version = _version(filter)
+        cached = self.spectra.get(key)
+        # the filter has been replaced or modified in-place
+        if cached is None or cached[0] is not filter or cached[1] != version:
+            spectrum = filter_spectrum(
+                filter.to(device), fft_size, padding, dtype=dtype
+            )
+            cached = (filter, version, spectrum)
+            self.spectra[key] = cached
+        return cached[2]
+
+    def conv(self, x, filter, padding):
+        r"""
+        Computes :meth:`deepinv.physics.blur.conv`.
+        """
+        if not self.use_fft(x.shape[-2:], filter, padding):
+            factors = self._spatial_factors(filter, x)
+            if factors is not None:
+                return _conv_separable(x, *factors, padding)
+            return conv(x, filter, padding)
+
+        size = x.shape[-2:]
+        if padding not in ("valid", "circular"):
+            kh = _extended_size(filter.shape[-2])
+            kw = _extended_size(filter.shape[-1])
+            size = (size[0] + kh - 1, size[1] + kw - 1)
+        spectrum = self.spectrum(filter, size, padding, x.device, x.dtype)
+        return conv_fft(x, filter, padding, spectrum=spectrum)
+
+    def conv_transpose(self, y, filter, padding):
+        r"""
+        Computes :meth:`deepinv.physics.blur.conv_transpose`.
+        """
+        kh, kw = _extended_size(filter.shape[-2]), _extended_size(filter.shape[-1])
+        size = y.shape[-2:]
+        if padding != "circular":
+            size = (size[0] + kh - 1, size[1] + kw - 1)
+        img_size = size if padding == "valid" else y.shape[-2:]
+
+        if not self.use_fft(img_size, filter, padding):
+            factors = self._spatial_factors(filter, y)
+            if factors is not None:
+                return _conv_transpose_separable(y, *factors, padding)
+            return conv_transpose(y, filter, padding)
+
+        spectrum = self.spectrum(filter, size, padding, y.device, y.dtype)
+        return conv_transpose_fft(y, filter, padding, spectrum=spectrum)
+
+    def conv_normal(self, x, filter, padding, factor=1):
+        r"""
+        Computes ``conv_transpose(S^T S conv(x, filter, padding), filter, padding)``, where :math:`S` keeps one pixel
+        every ``factor`` pixels.
+
+        If the FFT is used (see :meth:`use_fft`), it is computed with :meth:`deepinv.physics.blur.conv_normal_fft`,
+        which only requires one FFT pair, and the spectrum of the filter is cached for each image size.
+        Filters with several channels and circular padding with ``factor > 1`` use the spatial/FFT convolutions.
+        """
+        kh, kw = _extended_size(filter.shape[-2]), _extended_size(filter.shape[-1])
+        if (
+            filter.shape[1] > 1
+            or (padding == "circular" and factor > 1)
+            or not self.use_fft(x.shape[-2:], filter, padding)
+        ):
+            y = self.conv(x, filter, padding)
+            if factor > 1:
+                mask = torch.zeros_like(y)
+                mask[:, :, ::factor, ::factor] = 1
+                y = y * mask
+            return self.conv_transpose(y, filter, padding)
+
+        if padding == "circular":
+            size = tuple(x.shape[-2:])
+        else:
+            h, w = x.shape[-2:]
+            if padding != "valid":
+                h, w = h + kh - 1, w + kw - 1
+            size = (_toeplitz_size(h, kh, factor), _toeplitz_size(w, kw, factor))
+
+        spectrum = self.normal_spectrum(
+            filter, size, padding, factor, x.device, x.dtype
+        )
+        return conv_normal_fft(x, filter, padding, factor, spectrum=spectrum)
+
+    def normal_spectrum(self, filter, fft_size, padding, factor, device, dtype):
+        r"""
+        Returns the (cached) :meth:`deepinv.physics.blur.normal_spectrum` of the filter on a Fourier grid of size
+        ``fft_size``.
+        """
+        key = (
+            tuple(fft_size),
+            padding == "circular",
+            factor,
+            tuple(filter.shape),
+            str(device),
+            dtype,
+        )
+        if filter.requires_grad:
+            return normal_spectrum(
+                filter.to(device), fft_size, padding, factor, dtype=dtype
+            )
+        version = _version(filter)
+        cached = self.normal_spectra.get(key)
+        # the filter has been replaced or modified in-place
+        if cached is None or cached[0] is not filter or cached[1] != version:
+            spectrum = normal_spectrum(
+                filter.to(device), fft_size, padding, factor, dtype=dtype
+            )
+            cached = (filter, version, spectrum)
+            self.normal_spectra[key] = cached
+        return cached[2]
+
+
 class BlindBlur(Physics):
     r"""
     Blind blur operator.
@@ -429,12 +1177,19 @@ class Blur(LinearPhysics):
 
     where :math:`*` denotes convolution and :math:`w` is a filter.
 
-    This class uses :meth:`torch.nn.functional.conv2d` for performing the convolutions.
+    This class uses :meth:`torch.nn.functional.conv2d` for performing the convolutions, or FFTs for large filters
+    (see :class:`deepinv.physics.blur.ConvolutionDispatcher`).
 
     :param torch.Tensor filter: Tensor of size (1, 1, H, W) or (1, C, H, W) containing the blur filter, e.g., :meth:`deepinv.physics.blur.gaussian_blur`.
     :param str padding: options are ``'valid'``, ``'circular'``, ``'replicate'`` and ``'reflect'``. If ``padding='valid'`` the blurred output is smaller than the image (no padding)
         otherwise the blurred output has the same size as the image.
     :param str device: cpu or cuda.
+    :param str conv_method: ``'spatial'`` computes the convolutions with :meth:`torch.nn.functional.conv2d`,
+        ``'fft'`` computes them with FFTs, and ``'auto'`` chooses the cheapest option at each call depending on the
+        sizes of the image and of the filter.
+    :param float separable_tol: relative error of the decomposition of the filter into a sum of separable filters
+        (see :meth:`deepinv.physics.blur.separable_decomposition`), which are applied as two 1D convolutions in the
+        spatial domain when it is cheaper. If ``None``, the filter is always applied as a 2D convolution.
 
     |sep|
 
@@ -455,17 +1210,350 @@ class Blur(LinearPhysics):
 
     """
 
-    def __init__(self, filter, padding="circular", device="cpu", **kwargs):
+    def __init__(
+        self,
+        filter,
+        padding="circular",
+        device="cpu",
+        conv_method="auto",
+        separable_tol=1e-6,
+        **kwargs,
+    ):
         super().__init__(**kwargs)
         self.padding = padding
         self.device = device
         self.filter = torch.nn.Parameter(filter, requires_grad=False).to(device)
+        self.conv_dispatcher = ConvolutionDispatcher(conv_method, separable_tol)
+
+    def sample_params(self, batch_size, generator=None, sigma_range=None):
+        r"""
+        Samples one random Gaussian filter per sample with :meth:`deepinv.physics.blur.random_gaussian_blur`, with
+        the same support as the current filter.
+
+        :param int batch_size: number of filters.
+        :param torch.Generator generator: random number generator. If ``None``, the global generator is used.
+        :param tuple[float] sigma_range: interval of the standard deviations of the filters.
+        :return: (dict) parameters, with the filters of size (batch_size, 1, h, w) under the key ``'filter'``.
+        """
+        params = super().sample_params(batch_size, generator)
+        params["filter"] = random_gaussian_blur(
+            batch_size,
+            self.filter.shape[-2:],
+            sigma_range=sigma_range,
+            generator=generator,
+            device=self._params_device(generator, self.filter),
+        ).to(self.filter.dtype)
+        return params
+
+    def update_parameters(self, filter=None, **kwargs):
+        r"""
+        Updates the filter of the operator.
+
+        :param torch.Tensor filter: new filter, of size (B, 1, h, w) for one filter per sample,
+            see :meth:`sample_params`.
+        """
+        if filter is not None:
+            self.filter = torch.nn.Parameter(
+                filter.to(self.filter.device), requires_grad=False
+            )
+        super().update_parameters(**kwargs)
 
     def A(self, x):
-        return conv(x, self.filter, self.padding)
+        return self.conv_dispatcher.conv(x, self.filter, self.padding)
 
     def A_adjoint(self, y):
-        return conv_transpose(y, self.filter, self.padding)
+        return self.conv_dispatcher.conv_transpose(y, self.filter, self.padding)
+
+    def A_adjoint_A(self, x):
+        r"""
+        Computes the normal operator :math:`A^{\top}Ax`, with a single FFT pair if the FFT-based convolution is
+        selected (see :meth:`deepinv.physics.blur.conv_normal_fft`).
+
+        :param torch.Tensor x: signal/image.
+        :return: (torch.Tensor) :math:`A^{\top}Ax`.
+        """
+        return self.conv_dispatcher.conv_normal(x, self.filter, self.padding)
+
+    def preconditioner(self, gamma):
+        r"""
+        Circulant preconditioner for the conjugate gradient iterations of :meth:`prox_l2`.
+
+        It inverts exactly in the Fourier domain the normal operator of the blur with circular boundary
+        conditions (as in :class:`deepinv.physics.BlurFFT`), i.e. it computes
+        :math:`F^{-1}\left(Fr / (|\hat{w}|^2 + \frac{1}{\gamma})\right)`, which is a good approximation of
+        :math:`(A^{\top}A + \frac{1}{\gamma}I)^{-1}` for the other padding modes.
+
+        :param float gamma: hyperparameter of the proximal operator.
+        :return: (callable) preconditioner.
+        """
+
+        def apply(r):
+            size = r.shape[-2:]
+            kh = _extended_size(self.filter.shape[-2])
+            kw = _extended_size(self.filter.shape[-1])
+            if kh > size[0] or kw > size[1]:
+                return r
+            spectrum = self.conv_dispatcher.normal_spectrum(
+                self.filter, size, "circular", 1, r.device, r.dtype
+            )
+            return fft.irfft2(fft.rfft2(r) / (spectrum + 1 / gamma), s=size)
+
+        return apply
+
+
+def interpolation_windows(img_size, grid_size, device="cpu", dtype=torch.float):
+    r"""
+    Bilinear interpolation windows of a regular grid of PSFs, as used by :class:`deepinv.physics.SpaceVaryingBlur`.
+
+    The PSFs are located at the centers of the cells of a :math:`g_h \times g_w` grid covering the image. The
+    window of each PSF is the tensor product of 1D hat functions which are equal to one at its center and vanish
+    at the centers of the neighbouring cells, and to one between the outermost centers and the borders of the
+    image, so that the windows sum to one at every pixel. Each window is supported on at most
+    :math:`2\times 2` cells, which is exploited by the overlap-add convolutions of
+    :class:`deepinv.physics.SpaceVaryingBlur`.
+
+    :param tuple[int] img_size: size (H, W) of the images.
+    :param tuple[int] grid_size: size :math:`(g_h, g_w)` of the grid of PSFs.
+    :param torch.device device: device of the windows.
+    :param torch.dtype dtype: data type of the windows.
+    :return: (torch.Tensor) windows of size :math:`(g_hg_w, H, W)`, in row-major order of the grid.
+    """
+    hats = []
+    for n, g in zip(img_size, grid_size):
+        step = n / g
+        # position of the pixels in units of cells, from the first to the last center
+        u = (torch.arange(n, device=device, dtype=torch.float64) + 0.5) / step - 0.5
+        u = u.clamp(0, g - 1)
+        k = torch.arange(g, device=device, dtype=torch.float64)
+        hats.append((1 - (u.view(1, -1) - k.view(-1, 1)).abs()).clamp(min=0))
+    windows = hats[0][:, None, :, None] * hats[1][None, :, None, :]
+    return windows.reshape(-1, *img_size).to(dtype)
+
+
+def _support(mask):
+    r"""
+    First and last (excluded) indices of the nonzero entries of a 1D boolean tensor.
+    """
+    idx = torch.nonzero(mask).flatten()
+    if idx.numel() == 0:
+        return 0, 0
+    return int(idx[0]), int(idx[-1]) + 1
+
+
+class SpaceVaryingBlur(LinearPhysics):
+    r"""
+    Space-varying blur operator, defined as a product-convolution
+
+    .. math::
+
+        y = \sum_{i=1}^{P} h_i * (w_i \odot x)
+
+    where :math:`*` denotes convolution, :math:`h_1, \dots, h_P` are the PSFs measured at different locations of
+    the field of view, and :math:`w_1, \dots, w_P` are interpolation windows which sum to one, e.g. the bilinear
+    windows of a regular grid of PSFs (see :meth:`deepinv.physics.blur.interpolation_windows`). The blur kernel
+    at a pixel :math:`p` is thus the interpolation :math:`\sum_i w_i(p) h_i` of the PSFs. If :math:`P=1` and
+    :math:`w_1 = 1`, it is equal to :class:`deepinv.physics.Blur` with the same padding.
+
+    The operator and its adjoint are computed with overlap-add FFT convolutions: each windowed image
+    :math:`w_i \odot x` is restricted to a patch covering the support of :math:`w_i`, the patches of all the PSFs
+    are filtered with a single batched FFT call, and the results are added back into the output. The cost is thus
+    proportional to the total area of the supports of the windows (plus the size of the PSFs), instead of
+    :math:`P` times the area of the image. The patch positions and the spectra of the PSFs are cached for each
+    image size, device and dtype.
+
+    :param torch.Tensor filters: PSFs of size (P, 1, h, w), which are applied to every channel.
+    :param torch.Tensor, tuple[int] windows: interpolation windows of size (P, H, W), or size :math:`(g_h, g_w)`
+        of a regular grid of PSFs (with :math:`g_hg_w = P`, in row-major order), in which case the bilinear
+        windows of :meth:`deepinv.physics.blur.interpolation_windows` are computed for each image size.
+        With ``padding='valid'``, the windows are defined on the input images.
+    :param str padding: options are ``'valid'``, ``'circular'``, ``'replicate'`` and ``'reflect'``. If
+        ``padding='valid'`` the blurred output is smaller than the image (no padding) otherwise the blurred output
+        has the same size as the image. The windows are padded as the image.
+    :param str device: cpu or cuda.
+
+    |sep|
+
+    :Examples:
+
+        Blur which is vertical on the left of the image and horizontal on its right:
+
+        >>> from deepinv.physics.blur import gaussian_blur
+        >>> filters = torch.cat([gaussian_blur((2.0, 0.5)), gaussian_blur((0.5, 2.0))])
+        >>> physics = SpaceVaryingBlur(filters, windows=(1, 2), padding="reflect")
+        >>> x = torch.rand(1, 1, 32, 32)
+        >>> physics(x).shape
+        torch.Size([1, 1, 32, 32])
+
+    """
+
+    def __init__(self, filters, windows, padding="circular", device="cpu", **kwargs):
+        super().__init__(**kwargs)
+        self.padding = padding
+        self.device = device
+        self.filters = torch.nn.Parameter(filters, requires_grad=False).to(device)
+        self._set_windows(windows)
+
+    def _set_windows(self, windows):
+        if isinstance(windows, torch.Tensor):
+            if windows.shape[0] != self.filters.shape[0]:
+                raise ValueError(
+                    f"The number of windows ({windows.shape[0]}) should match the number of PSFs "
+                    f"({self.filters.shape[0]})."
+                )
+            self.windows = torch.nn.Parameter(windows, requires_grad=False).to(
+                self.device
+            )
+            self.grid_size = None
+        else:
+            if windows[0] * windows[1] != self.filters.shape[0]:
+                raise ValueError(
+                    f"The grid of size {tuple(windows)} does not match the number of PSFs "
+                    f"({self.filters.shape[0]})."
+                )
+            self.windows = None
+            self.grid_size = tuple(windows)
+        self.plans = {}
+
+    def update_parameters(self, filters=None, windows=None, **kwargs):
+        r"""
+        Updates the PSFs and/or the interpolation windows of the operator.
+
+        :param torch.Tensor filters: new PSFs, with the same number of PSFs.
+        :param torch.Tensor, tuple[int] windows: new interpolation windows, see :class:`SpaceVaryingBlur`.
+        """
+        if filters is not None:
+            self.filters = torch.nn.Parameter(
+                filters.to(self.filters.device), requires_grad=False
+            )
+        if filters is not None or windows is not None:
+            self._set_windows(
+                windows
+                if windows is not None
+                else (self.windows if self.grid_size is None else self.grid_size)
+            )
+        super().update_parameters(**kwargs)
+
+    def _plan(self, img_size, device, dtype):
+        r"""
+        Returns the (cached) patches of the windows, their positions in the padded image and in the full
+        correlation, and the spectra of the PSFs on the grid of the patches, for images of size ``img_size``.
+        """
+        key = (tuple(img_size), str(device), dtype)
+        plan = self.plans.get(key)
+        if plan is not None:
+            return plan
+
+        if self.grid_size is not None:
+            windows = interpolation_windows(
+                img_size, self.grid_size, device=device, dtype=dtype
+            )
+        elif self.windows.shape[-2:] != tuple(img_size):
+            raise ValueError(
+                f"The windows of size {tuple(self.windows.shape[-2:])} do not match the image size "
+                f"{tuple(img_size)}."
+            )
+        else:
+            windows = self.windows.to(device, dtype)
+
+        filters = extend_filter(self.filters.flip(-1).flip(-2)).to(device, dtype)
+        kh, kw = filters.shape[-2:]
+        if self.padding != "valid":
+            windows = F.pad(
+                windows.unsqueeze(0),
+                (kw // 2, kw // 2, kh // 2, kh // 2),
+                mode=self.padding,
+            ).squeeze(0)
+        n, hp, wp = windows.shape
+
+        # bounding boxes of the supports of the windows, and common size of the patches
+        rows = [_support(w.abs().sum(-1) > 0) for w in windows]
+        cols = [_support(w.abs().sum(-2) > 0) for w in windows]
+        ph = max(max(r1 - r0 for r0, r1 in rows), 1)
+        pw = max(max(c1 - c0 for c0, c1 in cols), 1)
+        r0 = torch.tensor([min(r[0], hp - ph) for r in rows], device=device)
+        c0 = torch.tensor([min(c[0], wp - pw) for c in cols], device=device)
+
+        # patch of the padded image seen by each window
+        r = r0.view(-1, 1, 1) + torch.arange(ph, device=device).view(1, -1, 1)
+        c = c0.view(-1, 1, 1) + torch.arange(pw, device=device).view(1, 1, -1)
+        patch_index = (r * wp + c).reshape(-1)
+        windows = windows.reshape(n, -1).gather(1, patch_index.view(n, -1))
+        windows = windows.view(n, ph, pw)
+
+        # outputs of the full correlation of each patch, on a canvas of size (hp + kh - 1, wp + kw - 1)
+        fft_size = (ph + kh - 1, pw + kw - 1)
+        r = r0.view(-1, 1, 1) + torch.arange(fft_size[0], device=device).view(1, -1, 1)
+        c = c0.view(-1, 1, 1) + torch.arange(fft_size[1], device=device).view(1, 1, -1)
+        out_index = (r * (wp + kw - 1) + c).reshape(-1)
+
+        spectra = fft.rfft2(filters, s=fft_size).transpose(0, 1)
+        plan = {
+            "windows": windows,
+            "patch_index": patch_index,
+            "out_index": out_index,
+            "spectra": spectra,
+            "patch_size": (ph, pw),
+            "fft_size": fft_size,
+        }
+        self.plans[key] = plan
+        return plan
+
+    def A(self, x):
+        r"""
+        Computes :math:`\sum_i h_i * (w_i \odot x)` with overlap-add FFT convolutions.
+
+        :param torch.Tensor x: image of size (B, C, H, W).
+        :return: (torch.Tensor) blurred image.
+        """
+        b, c = x.shape[:2]
+        plan = self._plan(x.shape[-2:], x.device, x.dtype)
+        kh = _extended_size(self.filters.shape[-2])
+        kw = _extended_size(self.filters.shape[-1])
+        if self.padding != "valid":
+            x = F.pad(x, (kw // 2, kw // 2, kh // 2, kh // 2), mode=self.padding)
+        hp, wp = x.shape[-2:]
+        n = plan["windows"].shape[0]
+
+        patches = x.reshape(b, c, -1)[..., plan["patch_index"]]
+        patches = patches.view(b, c, n, *plan["patch_size"]) * plan["windows"]
+        # the full correlation of each patch is a circular correlation on the zero-padded patch
+        patches = F.pad(patches, (kw - 1, 0, kh - 1, 0))
+        z = fft.rfft2(patches) * torch.conj(plan["spectra"])
+        z = fft.irfft2(z, s=plan["fft_size"])
+
+        y = torch.zeros(
+            (b, c, (hp + kh - 1) * (wp + kw - 1)), device=x.device, dtype=x.dtype
+        )
+        y.index_add_(2, plan["out_index"], z.reshape(b, c, -1))
+        return y.view(b, c, hp + kh - 1, wp + kw - 1)[..., kh - 1 : hp, kw - 1 : wp]
+
+    def A_adjoint(self, y):
+        r"""
+        Computes the adjoint :math:`\sum_i w_i \odot (h_i \star y)`, where :math:`\star` denotes the transposed
+        convolution, with overlap-add FFT convolutions.
+
+        :param torch.Tensor y: blurred image.
+        :return: (torch.Tensor) image of size (B, C, H, W).
+        """
+        b, c = y.shape[:2]
+        kh = _extended_size(self.filters.shape[-2])
+        kw = _extended_size(self.filters.shape[-1])
+        hp, wp = y.shape[-2] + kh - 1, y.shape[-1] + kw - 1
+        if self.padding == "valid":
+            img_size = (hp, wp)
+        else:
+            img_size = y.shape[-2:]
+        plan = self._plan(img_size, y.device, y.dtype)
+        n = plan["windows"].shape[0]
+
+        z = F.pad(y, (kw - 1, kw - 1, kh - 1, kh - 1)).reshape(b, c, -1)
+        z = z[..., plan["out_index"]].view(b, c, n, *plan["fft_size"])
+        z = fft.irfft2(fft.rfft2(z) * plan["spectra"], s=plan["fft_size"])
+        z = z[..., kh - 1 :, kw - 1 :] * plan["windows"]
+
+        x = torch.zeros((b, c, hp * wp), device=y.device, dtype=y.dtype)
+        x.index_add_(2, plan["patch_index"], z.reshape(b, c, -1))
+        return _pad_adjoint(x.view(b, c, hp, wp), self.padding, kh // 2, kw // 2)
 
 
 class BlurFFT(DecomposablePhysics):
@@ -511,17 +1599,52 @@ class BlurFFT(DecomposablePhysics):
     def __init__(self, img_size, filter, device="cpu", **kwargs):
         super().__init__(**kwargs)
         self.img_size = img_size
+        self.device = device
+        self._set_filter(filter.to("cpu"))
+
+    def _set_filter(self, filter):
+        self.kernel_size = tuple(filter.shape[-2:])
+        if self.img_size[0] > filter.shape[1]:
+            filter = filter.repeat(1, self.img_size[0], 1, 1)
 
-        if img_size[0] > filter.shape[1]:
-            filter = filter.repeat(1, img_size[0], 1, 1)
+        spectrum = filter_fft(filter, self.img_size)
+        self.angle = torch.exp(-1j * torch.angle(spectrum)).to(self.device)
+        mask = torch.abs(spectrum).unsqueeze(-1)
+        mask = torch.cat([mask, mask], dim=-1)
 
-        self.mask = filter_fft(filter, img_size).to("cpu")
-        self.angle = torch.angle(self.mask)
-        self.angle = torch.exp(-1j * self.angle).to(device)
-        self.mask = torch.abs(self.mask).unsqueeze(-1)
-        self.mask = torch.cat([self.mask, self.mask], dim=-1)
+        self.mask = torch.nn.Parameter(mask, requires_grad=False).to(self.device)
 
-        self.mask = torch.nn.Parameter(self.mask, requires_grad=False).to(device)
+    def sample_params(self, batch_size, generator=None, sigma_range=None):
+        r"""
+        Samples one random Gaussian filter per sample with :meth:`deepinv.physics.blur.random_gaussian_blur`, with
+        the same support as the current filter.
+
+        :param int batch_size: number of filters.
+        :param torch.Generator generator: random number generator. If ``None``, the global generator is used.
+        :param tuple[float] sigma_range: interval of the standard deviations of the filters.
+        :return: (dict) parameters, with the filters of size (batch_size, 1, h, w) under the key ``'filter'``.
+        """
+        params = super().sample_params(batch_size, generator)
+        params["filter"] = random_gaussian_blur(
+            batch_size,
+            self.kernel_size,
+            sigma_range=sigma_range,
+            generator=generator,
+            device=self._params_device(generator, self.angle),
+        )
+        return params
+
+    def update_parameters(self, filter=None, **kwargs):
+        r"""
+        Updates the filter of the operator. Its singular values and vectors are computed on the device of the
+        filter.
+
+        :param torch.Tensor filter: new filter, of size (B, 1, h, w) for one filter per sample,
+            see :meth:`sample_params`.
+        """
+        if filter is not None:
+            self._set_filter(filter)
+        super().update_parameters(**kwargs)
 
     def V_adjoint(self, x):
         return torch.view_as_real(
@@ -1,31 +1,9 @@
 from deepinv.physics.forward import LinearPhysics
+from deepinv.physics.structured_random import dst1, structured_transform, TRANSFORMS
 import torch
 import numpy as np
 
 
-def dst1(x):
-    r"""
-    Orthogonal Discrete Sine Transform, Type I
-    The transform is performed across the last dimension of the input signal
-    Due to orthogonality we have ``dst1(dst1(x)) = x``.
-
-    :param torch.tensor x: the input signal
-    :return: (torch.tensor) the DST-I of the signal over the last dimension
-
-    """
-    x_shape = x.shape
-
-    b = int(np.prod(x_shape[:-1]))
-    n = x_shape[-1]
-    x = x.view(-1, n)
-
-    z = torch.zeros(b, 1, device=x.device)
-    x = torch.cat([z, x, z, -x.flip([1])], dim=1)
-    x = torch.view_as_real(torch.fft.rfft(x, norm="ortho"))
-    x = x[:, 1:-1, 1]
-    return x.view(*x_shape)
-
-
 class CompressedSensing(LinearPhysics):
     r"""
     Compressed Sensing forward operator. Creates a random sampling :math:`m \times n` matrix where :math:`n` is the
@@ -44,12 +22,25 @@ class CompressedSensing(LinearPhysics):
         A = \text{diag}(m)D\text{diag}(s)
 
     where :math:`s\in\{-1,1\}^{n}` is a random sign flip with probability 0.5,
-    :math:`D\in\mathbb{R}^{n\times n}` is a fast orthogonal transform (DST-1) and
+    :math:`D\in\mathbb{R}^{n\times n}` is a fast orthogonal transform (DST-1 by default, see ``transform``) and
     :math:`\text{diag}(m)\in\mathbb{R}^{m\times n}` is random subsampling matrix, which keeps :math:`m` out of :math:`n` entries.
 
     It is recommended to use ``fast=True`` for image sizes bigger than 32 x 32, since the forward computation with
     ``fast=False`` has an :math:`O(mn)` complexity, whereas with ``fast=True`` it has an :math:`O(n \log n)` complexity.
 
+    If ``fast=False``, the matrix and its pseudo-inverse are stored by default as dense :math:`m \times n` and
+    :math:`n \times m` matrices, which becomes prohibitive for large images. The matrix can instead be
+
+    - stored in reduced precision with ``storage_dtype=torch.float16`` or ``torch.bfloat16``,
+    - replaced by a Rademacher matrix with ``distribution='rademacher'``, i.e., :math:`A_{i,j} = \pm \frac{1}{\sqrt{m}}`
+      with probability 0.5, whose signs are stored with 8-bit integers,
+    - never stored with ``matrix_free=True``: the rows of the matrix are regenerated block by block at each call
+      from a random seed, so that the memory footprint is the one of a block of ``block_size`` rows.
+
+    In all these cases, the matrix is applied by blocks of rows, and the pseudo-inverse is computed with the
+    iterative least squares solver :meth:`deepinv.optim.utils.lsqr` (see :meth:`deepinv.physics.LinearPhysics.A_dagger`).
+    The blocks are generated on the device given at construction, so that the matrix only depends on the seed.
+
     An existing operator can be loaded from a saved .pth file via ``self.load_state_dict(save_path)``,
     in a similar fashion to :class:`torch.nn.Module`.
 
@@ -63,9 +54,22 @@ class CompressedSensing(LinearPhysics):
     :param int m: number of measurements.
     :param tuple img_shape: shape (C, H, W) of inputs.
     :param bool fast: The operator is iid Gaussian if false, otherwise A is a SORS matrix with the Discrete Sine Transform (type I).
+    :param str transform: fast orthogonal transform of the SORS matrix if ``fast=True``, among ``'dst1'`` (default),
+        ``'dct'`` (DCT-II), ``'dct4'`` (DCT-IV, even number of entries) and ``'hadamard'`` (Walsh-Hadamard, number of
+        entries which is a power of 2), see :meth:`deepinv.physics.structured_random.structured_transform`.
     :param bool channelwise: Channels are processed independently using the same random forward operator.
     :param torch.type dtype: Forward matrix is stored as a dtype.
     :param str device: Device to store the forward matrix.
+    :param bool matrix_free: if ``True`` and ``fast=False``, the rows of the matrix are regenerated from ``seed``
+        at each call instead of being stored.
+    :param str distribution: distribution of the entries of the matrix if ``fast=False``, either ``'gaussian'``
+        or ``'rademacher'``.
+    :param torch.dtype storage_dtype: if not ``None`` and ``fast=False``, the (Gaussian) matrix is stored with this
+        dtype, e.g. ``torch.float16`` or ``torch.bfloat16``, and cast to the dtype of the signal by blocks of rows.
+    :param int block_size: number of rows of the blocks used to apply the matrix if it is not stored densely.
+        If ``None``, blocks of approximately :math:`2^{24}` entries are used.
+    :param int seed: random seed of the matrix if it is not stored densely. If ``None``, it is drawn with the
+        default random generator of torch.
 
     |sep|
 
@@ -90,14 +94,31 @@ class CompressedSensing(LinearPhysics):
         channelwise=False,
         dtype=torch.float,
         device="cpu",
+        matrix_free=False,
+        distribution="gaussian",
+        storage_dtype=None,
+        block_size=None,
+        seed=None,
+        transform="dst1",
         **kwargs,
     ):
         super().__init__(**kwargs)
         self.name = f"CS_m{m}"
+        self.m = m
         self.img_shape = img_shape
         self.fast = fast
         self.channelwise = channelwise
         self.dtype = dtype
+        self.device = device
+        self.matrix_free = matrix_free
+        self.distribution = distribution
+        self.storage_dtype = storage_dtype
+        self.transform = transform
+
+        if transform not in TRANSFORMS:
+            raise ValueError(f"transform must be one of {TRANSFORMS}")
+        if distribution not in ("gaussian", "rademacher"):
+            raise ValueError("distribution must be 'gaussian' or 'rademacher'")
 
         if channelwise:
             n = int(np.prod(img_shape[1:]))
@@ -115,6 +136,18 @@ class CompressedSensing(LinearPhysics):
 
             self.D = torch.nn.Parameter(self.D, requires_grad=False)
             self.mask = torch.nn.Parameter(self.mask, requires_grad=False)
+        elif self.blocked:
+            self.n = n
+            if block_size is None:
+                block_size = max(1, 2**24 // n)
+            self.block_size = block_size
+            if seed is None:
+                seed = int(torch.randint(2**62, (1,)).item())
+            self.seed = torch.nn.Parameter(torch.tensor(seed), requires_grad=False)
+            if not matrix_free:
+                n_blocks = (m + block_size - 1) // block_size
+                self._A = torch.cat([self._generate_block(k) for k in range(n_blocks)])
+                self._A = torch.nn.Parameter(self._A, requires_grad=False)
         else:
             self._A = torch.randn((m, n), device=device) / np.sqrt(m)
             self._A_dagger = torch.linalg.pinv(self._A)
@@ -126,6 +159,80 @@ class CompressedSensing(LinearPhysics):
                 .to(device)
             )
 
+    @property
+    def blocked(self):
+        r"""
+        Whether the (non-fast) matrix is applied by blocks of rows instead of being stored densely with its
+        pseudo-inverse.
+        """
+        return (
+            self.matrix_free
+            or self.distribution == "rademacher"
+            or self.storage_dtype is not None
+        )
+
+    def _generate_block(self, k):
+        r"""
+        Generates the ``k``-th block of rows of the matrix in its storage format (unnormalized), from the seed
+        of the operator and the block index.
+        """
+        start, stop = k * self.block_size, min((k + 1) * self.block_size, self.m)
+        g = torch.Generator(device=self.device)
+        g.manual_seed(int(self.seed) + k)
+        shape = (stop - start, self.n)
+        if self.distribution == "rademacher":
+            block = torch.randint(
+                0, 2, shape, generator=g, device=self.device, dtype=torch.int8
+            )
+            return 2 * block - 1
+        block = torch.randn(shape, generator=g, device=self.device)
+        if self.storage_dtype is not None:
+            block = block.to(self.storage_dtype)
+        return block
+
+    def _blocks(self, x, idx=None):
+        r"""
+        Iterates over the blocks of rows of the matrix, restricted to the rows ``idx`` if not ``None``.
+
+        Yields the positions of the rows of the block in the measurements, and the (normalized) block with the
+        dtype and device of ``x``.
+        """
+        n_blocks = (self.m + self.block_size - 1) // self.block_size
+        if idx is None:
+            blocks = []
+            for k in range(n_blocks):
+                pos = slice(k * self.block_size, (k + 1) * self.block_size)
+                blocks.append((k, pos, None))
+        else:
+            idx = torch.as_tensor(idx).cpu()
+            block_idx = idx // self.block_size
+            blocks = []
+            for k in torch.unique(block_idx).tolist():
+                pos = (block_idx == k).nonzero().flatten()
+                blocks.append((k, pos.to(x.device), idx[pos] - k * self.block_size))
+
+        for k, pos, rows in blocks:
+            if self.matrix_free:
+                block = self._generate_block(k)
+            else:
+                block = self._A[k * self.block_size : (k + 1) * self.block_size]
+            if rows is not None:
+                block = block[rows.to(block.device)]
+            yield pos, block.to(device=x.device, dtype=x.dtype) / np.sqrt(self.m)
+
+    def _blocked_A(self, x, idx=None):
+        m = self.m if idx is None else len(idx)
+        y = torch.empty((x.shape[0], m), device=x.device, dtype=x.dtype)
+        for pos, block in self._blocks(x, idx):
+            y[:, pos] = x @ block.t()
+        return y
+
+    def _blocked_A_adjoint(self, y, idx=None):
+        x = torch.zeros((y.shape[0], self.n), device=y.device, dtype=y.dtype)
+        for pos, block in self._blocks(y, idx):
+            x = x + y[:, pos] @ block
+        return x
+
     def A(self, x):
         N, C = x.shape[:2]
         if self.channelwise:
@@ -134,7 +241,9 @@ class CompressedSensing(LinearPhysics):
             x = x.reshape(N, -1)
 
         if self.fast:
-            y = dst1(x * self.D)[:, self.mask]
+            y = structured_transform(x * self.D, self.transform)[:, self.mask]
+        elif self.blocked:
+            y = self._blocked_A(x)
         else:
             y = torch.einsum("in, mn->im", x, self._A)
 
@@ -156,16 +265,42 @@ class CompressedSensing(LinearPhysics):
         if self.fast:
             y2 = torch.zeros((N2, self.n), device=y.device)
             y2[:, self.mask] = y.type(y2.dtype)
-            x = dst1(y2) * self.D
+            x = structured_transform(y2, self.transform, adjoint=True) * self.D
+        elif self.blocked:
+            x = self._blocked_A_adjoint(y)
         else:
             x = torch.einsum("im, nm->in", y, self._A_adjoint)  # x:(N, n, 1)
 
         x = x.view(N, C, H, W)
         return x
 
+    def A_adjoint_A(self, x):
+        r"""
+        Computes the normal operator :math:`A^{\top}Ax`.
+
+        If ``fast=True``, it is computed as :math:`\text{diag}(s)D^{\top}\text{diag}(m)D\text{diag}(s)x`, without
+        extracting and zero-filling the measurements.
+
+        :param torch.Tensor x: signal/image.
+        :return: (torch.Tensor) :math:`A^{\top}Ax`.
+        """
+        if not self.fast:
+            return super().A_adjoint_A(x)
+
+        N, C = x.shape[:2]
+        if self.channelwise:
+            z = x.reshape(N * C, -1)
+        else:
+            z = x.reshape(N, -1)
+        z = structured_transform(z * self.D, self.transform) * self.mask
+        z = structured_transform(z, self.transform, adjoint=True) * self.D
+        return z.view(x.shape)
+
     def A_dagger(self, y):
         if self.fast:
             return self.A_adjoint(y)
+        elif self.blocked:
+            return super().A_dagger(y)
         else:
             N = y.shape[0]
             C, H, W = self.img_shape[0], self.img_shape[1], self.img_shape[2]
@@ -177,6 +312,61 @@ class CompressedSensing(LinearPhysics):
             x = x.reshape(N, C, H, W)
         return x
 
+    def subsets(self, n_subsets):
+        r"""
+        Splits the ``m`` measurements into ``n_subsets`` interleaved subsets of rows of the forward matrix.
+
+        :param int n_subsets: number of subsets.
+        :return: (list) list of ``n_subsets`` index tensors.
+        """
+        return [torch.arange(k, self.m, n_subsets) for k in range(n_subsets)]
+
+    def measurement_subset(self, y, idx):
+        return y[..., idx]
+
+    def A_subset(self, x, idx):
+        N, C = x.shape[:2]
+        if self.channelwise:
+            x = x.reshape(N * C, -1)
+        else:
+            x = x.reshape(N, -1)
+
+        if self.fast:
+            rows = self.mask.nonzero().flatten()[idx]
+            y = structured_transform(x * self.D, self.transform)[:, rows]
+        elif self.blocked:
+            y = self._blocked_A(x, idx)
+        else:
+            y = torch.einsum("in, mn->im", x, self._A[idx])
+
+        if self.channelwise:
+            y = y.view(N, C, -1)
+
+        return y
+
+    def A_adjoint_subset(self, y, idx):
+        N = y.shape[0]
+        C, H, W = self.img_shape[0], self.img_shape[1], self.img_shape[2]
+
+        if self.channelwise:
+            N2 = N * C
+            y = y.reshape(N2, -1)
+        else:
+            N2 = N
+
+        if self.fast:
+            rows = self.mask.nonzero().flatten()[idx]
+            y2 = torch.zeros((N2, self.n), device=y.device)
+            y2[:, rows] = y.type(y2.dtype)
+            x = structured_transform(y2, self.transform, adjoint=True) * self.D
+        elif self.blocked:
+            x = self._blocked_A_adjoint(y, idx)
+        else:
+            x = torch.einsum("im, mn->in", y, self._A[idx])
+
+        x = x.view(N, C, H, W)
+        return x
+
 
 # if __name__ == "__main__":
 #     device = "cuda:0"
@@ -1,7 +1,8 @@
+import weakref
 import torch
-from deepinv.optim.utils import conjugate_gradient
+from deepinv.optim.utils import conjugate_gradient, lsqr, ProxCache
 from deepinv.physics.noise import GaussianNoise
-from deepinv.utils import randn_like, TensorList
+from deepinv.utils import randn_like, TensorList, PackedTensorList
 
 
 def adjoint_function(A, input_size, device="cpu"):
@@ -46,6 +47,54 @@ def adjoint_function(A, input_size, device="cpu"):
     return adjoint
 
 
+# spectral norms computed by LinearPhysics.compute_norm, indexed by physics
+_norm_registry = weakref.WeakKeyDictionary()
+
+
+def _unchanged(state, tensors):
+    r"""
+    Checks that the tensors are the ones recorded in ``state`` (weak references and version counters), and that
+    they have not been modified in-place since.
+    """
+    return len(state) == len(tensors) and all(
+        ref() is t and version == _version(t)
+        for (ref, version), t in zip(state, tensors)
+    )
+
+
+def _version(t):
+    r"""
+    In-place modification counter of a tensor (``None`` for inference tensors, which do not track it).
+    """
+    try:
+        return t._version
+    except RuntimeError:
+        return None
+
+
+def _stack_measurements(y1, y2):
+    r"""
+    Concatenates the measurements of two stacked operators into a :class:`deepinv.utils.TensorList`.
+
+    If all the measurements have the same batch size, dtype and device, they are stored in a single buffer as a
+    :class:`deepinv.utils.PackedTensorList`, whose arithmetic operations, dot products and norms (e.g. in the
+    iterative solvers) are applied to the whole buffer at once.
+
+    :param torch.Tensor, deepinv.utils.TensorList y1: measurements of the first operator.
+    :param torch.Tensor, deepinv.utils.TensorList y2: measurements of the second operator.
+    :return: (deepinv.utils.TensorList) stacked measurements.
+    """
+    y = TensorList(y1).append(TensorList(y2))
+    if all(
+        yi.shape[0] == y[0].shape[0]
+        and yi.dtype == y[0].dtype
+        and yi.device == y[0].device
+        for yi in y
+    ):
+        return PackedTensorList(y)
+    return y
+
+
 class Physics(torch.nn.Module):  # parent class for forward models
     r"""
     Parent class for forward operators
@@ -117,13 +166,14 @@ class Physics(torch.nn.Module):  # parent class for forward models
         via the add operation.
 
         The measurements produced by the resulting model are :class:`deepinv.utils.TensorList` objects, where
-        each entry corresponds to the measurements of the corresponding operator.
+        each entry corresponds to the measurements of the corresponding operator. They are packed in a single
+        buffer (see :class:`deepinv.utils.PackedTensorList`) if they have the same batch size, dtype and device.
 
         :param deepinv.physics.Physics other: Physics operator :math:`A_2`
         :return: (deepinv.physics.Physics) stacked operator
 
         """
-        A = lambda x: TensorList(self.A(x)).append(TensorList(other.A(x)))
+        A = lambda x: _stack_measurements(self.A(x), other.A(x))
 
         class noise(torch.nn.Module):
             def __init__(self, noise1, noise2):
@@ -132,7 +182,7 @@ class Physics(torch.nn.Module):  # parent class for forward models
                 self.noise2 = noise2
 
             def forward(self, x):
-                return TensorList(self.noise1(x[:-1])).append(self.noise2(x[-1]))
+                return _stack_measurements(self.noise1(x[:-1]), self.noise2(x[-1]))
 
         class sensor(torch.nn.Module):
             def __init__(self, sensor1, sensor2):
@@ -141,7 +191,7 @@ class Physics(torch.nn.Module):  # parent class for forward models
                 self.sensor2 = sensor2
 
             def forward(self, x):
-                return TensorList(self.sensor1(x[:-1])).append(self.sensor2(x[-1]))
+                return _stack_measurements(self.sensor1(x[:-1]), self.sensor2(x[-1]))
 
         return Physics(
             A=A,
@@ -155,6 +205,60 @@ class Physics(torch.nn.Module):  # parent class for forward models
         if isinstance(self.noise_model, torch.nn.Module):
             self.noise_model.__init__(**kwargs)
 
+    def sample_params(self, batch_size, generator=None):
+        r"""
+        Samples the random parameters (e.g. masks, blur filters or noise levels) of ``batch_size`` independent
+        realizations of the operator, stacked along a first batch dimension.
+
+        Once loaded with :meth:`update_parameters`, each sample of a batch of size ``batch_size`` is measured with
+        its own operator, while :meth:`A`, :meth:`A_adjoint` and the proximal operators remain vectorized over the
+        batch. By default, only the standard deviation of the noise models drawn in an interval
+        :math:`[\sigma_{\text{min}}, \sigma_{\text{max}}]`, such as :class:`deepinv.physics.UniformGaussianNoise`,
+        is sampled.
+
+        :param int batch_size: number of realizations.
+        :param torch.Generator generator: random number generator. If ``None``, the global generator is used.
+        :return: (dict) parameters of size (batch_size, ...), indexed by the name of the keyword argument of
+            :meth:`update_parameters`.
+        """
+        params = {}
+        noise = self.noise_model
+        if hasattr(noise, "sigma_min") and hasattr(noise, "sigma_max"):
+            u = torch.rand(
+                batch_size, generator=generator, device=self._params_device(generator)
+            )
+            params["sigma"] = noise.sigma_min + (noise.sigma_max - noise.sigma_min) * u
+        return params
+
+    def update_parameters(self, sigma=None, **kwargs):
+        r"""
+        Updates the parameters of the operator, e.g. with the parameters of a batch of operators sampled with
+        :meth:`sample_params`.
+
+        :param torch.Tensor sigma: standard deviation of the noise, of size (B,) for one value per sample.
+        """
+        if sigma is not None:
+            if isinstance(getattr(self.noise_model, "sigma", None), torch.nn.Parameter):
+                sigma = torch.nn.Parameter(sigma, requires_grad=False)
+            self.noise_model.sigma = sigma
+        if kwargs:
+            raise ValueError(
+                f"Unknown parameters {list(kwargs)} for {self.__class__.__name__}."
+            )
+
+    def _params_device(self, generator=None, like=None):
+        r"""
+        Device on which the parameters of :meth:`sample_params` are sampled, i.e. the device of the generator if
+        any, otherwise the device of the tensor ``like`` or of the parameters of the operator.
+        """
+        if generator is not None:
+            return generator.device
+        if like is not None:
+            return like.device
+        for p in self.parameters():
+            return p.device
+        return torch.device(getattr(self, "device", "cpu"))
+
     def forward(self, x):
         r"""
         Computes forward operator :math:`y = N(A(x))` (with noise and/or sensor non-linearities)
@@ -248,6 +352,8 @@ class LinearPhysics(Physics):
             A_adjoint can be generated automatically using the :meth:`deepinv.physics.adjoint_function`
             method which relies on automatic differentiation, at the cost of a few extra computations per adjoint call.
 
+    :param callable A_adjoint_A: optional closed form of the normal operator :math:`x\mapsto A^{\top}Ax`. If ``None``,
+        it is computed as ``A_adjoint(A(x))``, see :meth:`A_adjoint_A`.
     :param callable noise_model: function that adds noise to the measurements :math:`N(z)`.
         See the noise module for some predefined functions.
     :param callable sensor_model: function that incorporates any sensor non-linearities to the sensing process,
@@ -314,6 +420,7 @@ class LinearPhysics(Physics):
         self,
         A=lambda x: x,
         A_adjoint=lambda x: x,
+        A_adjoint_A=None,
         noise_model=lambda x: x,
         sensor_model=lambda x: x,
         max_iter=50,
@@ -328,6 +435,7 @@ class LinearPhysics(Physics):
             tol=tol,
         )
         self.A_adj = A_adjoint
+        self.A_adj_A = A_adjoint_A
 
     def A_adjoint(self, y):
         r"""
@@ -346,6 +454,22 @@ class LinearPhysics(Physics):
 
         return self.A_adj(y)
 
+    def A_adjoint_A(self, x):
+        r"""
+        Computes the normal operator :math:`A^{\top}Ax`.
+
+        By default, it applies :meth:`A` followed by :meth:`A_adjoint`. Operators for which the normal operator has
+        a cheaper closed form (e.g., a single multiplication in the Fourier domain) override this method, which
+        is used by the internal solvers (conjugate gradient in :meth:`prox_l2` and :meth:`A_dagger`, power method
+        in :meth:`compute_norm`).
+
+        :param torch.Tensor x: signal/image.
+        :return: (torch.Tensor) :math:`A^{\top}Ax`.
+        """
+        if self.A_adj_A is not None:
+            return self.A_adj_A(x)
+        return self.A_adjoint(self.A(x))
+
     def __mul__(self, other):
         r"""
         Concatenates two linear forward operators :math:`A = A_1\circ A_2` via the * operation
@@ -358,23 +482,28 @@ class LinearPhysics(Physics):
         """
         A = lambda x: self.A(other.A(x))  # (A' = A_1 A_2)
         A_adjoint = lambda x: other.A_adjoint(self.A_adjoint(x))
+        A_adjoint_A = lambda x: other.A_adjoint(self.A_adjoint_A(other.A(x)))
         noise = self.noise_model
         sensor = self.sensor_model
-        return LinearPhysics(
+        physics = LinearPhysics(
             A=A,
             A_adjoint=A_adjoint,
+            A_adjoint_A=A_adjoint_A,
             noise_model=noise,
             sensor_model=sensor,
             max_iter=self.max_iter,
             tol=self.tol,
         )
+        physics._operands = (self, other)  # see compute_norm
+        return physics
 
     def __add__(self, other):
         r"""
         Stacks two linear forward operators :math:`A = \begin{bmatrix} A_1 \\ A_2 \end{bmatrix}` via the add operation.
 
         The measurements produced by the resulting model are :class:`deepinv.utils.TensorList` objects, where
-        each entry corresponds to the measurements of the corresponding operator.
+        each entry corresponds to the measurements of the corresponding operator. They are packed in a single
+        buffer (see :class:`deepinv.utils.PackedTensorList`) if they have the same batch size, dtype and device.
 
         .. note::
 
@@ -385,12 +514,14 @@ class LinearPhysics(Physics):
         :return: (deepinv.physics.LinearPhysics) stacked operator
 
         """
-        A = lambda x: TensorList(self.A(x)).append(TensorList(other.A(x)))
+        A = lambda x: _stack_measurements(self.A(x), other.A(x))
 
         def A_adjoint(y):
             at1 = self.A_adjoint(y[:-1]) if len(y) > 2 else self.A_adjoint(y[0])
             return at1 + other.A_adjoint(y[-1])
 
+        A_adjoint_A = lambda x: self.A_adjoint_A(x) + other.A_adjoint_A(x)
+
         class noise(torch.nn.Module):
             def __init__(self, noise1, noise2):
                 super().__init__()
@@ -398,7 +529,7 @@ class LinearPhysics(Physics):
                 self.noise2 = noise2
 
             def forward(self, x):
-                return TensorList(self.noise1(x[:-1])).append(self.noise2(x[-1]))
+                return _stack_measurements(self.noise1(x[:-1]), self.noise2(x[-1]))
 
         class sensor(torch.nn.Module):
             def __init__(self, sensor1, sensor2):
@@ -407,18 +538,23 @@ class LinearPhysics(Physics):
                 self.sensor2 = sensor2
 
             def forward(self, x):
-                return TensorList(self.sensor1(x[:-1])).append(self.sensor2(x[-1]))
+                return _stack_measurements(self.sensor1(x[:-1]), self.sensor2(x[-1]))
 
-        return LinearPhysics(
+        physics = LinearPhysics(
             A=A,
             A_adjoint=A_adjoint,
+            A_adjoint_A=A_adjoint_A,
             noise_model=noise(self.noise_model, other.noise_model),
             sensor_model=sensor(self.sensor_model, other.sensor_model),
             max_iter=self.max_iter,
             tol=self.tol,
         )
+        physics._operands = (self, other)
+        return physics
 
-    def compute_norm(self, x0, max_iter=100, tol=1e-3, verbose=True):
+    def compute_norm(
+        self, x0, max_iter=100, tol=1e-3, verbose=True, per_sample=False, use_cache=True
+    ):
         r"""
         Computes the spectral :math:`\ell_2` norm (Lipschitz constant) of the operator
 
@@ -426,32 +562,93 @@ class LinearPhysics(Physics):
 
         using the `power method <https://en.wikipedia.org/wiki/Power_iteration>`_.
 
+        The norms are memoized for each operator, input shape, device and dtype, and are only recomputed when the
+        tensors defining the operator (its parameters, buffers and tensor attributes, or those of the composed
+        operators) are replaced or modified in-place, e.g. by :meth:`reset` or :meth:`update_parameters`, or when a
+        more precise estimate (smaller ``tol`` or larger ``max_iter``) is requested. In that case, the power method
+        is warm-started from the last computed singular vector. The noise and sensor models are not taken into
+        account. The norms of operators defined by functions, e.g. ``LinearPhysics(A=lambda x: w * x)``, are never
+        memoized, as the tensors captured by the functions cannot be tracked.
+
         :param torch.Tensor x0: initialisation point of the algorithm
         :param int max_iter: maximum number of iterations
         :param float tol: relative variation criterion for convergence
         :param bool verbose: print information
+        :param bool per_sample: if ``True``, computes the norm of the operator of each sample of the batch
+            independently (e.g., for operators with per-sample parameters), otherwise the batch is treated as a
+            single vector.
+        :param bool use_cache: if ``False``, the norm is recomputed from a random initialisation, and not stored.
 
-        :returns z: (float) spectral norm of :math:`A^{\top}A`, i.e., :math:`\|A^{\top}A\|`.
+        :returns z: (torch.Tensor) spectral norm of :math:`A^{\top}A`, i.e., :math:`\|A^{\top}A\|`, of size (B,)
+            if ``per_sample=True``.
         """
-        x = torch.randn_like(x0)
-        x /= torch.norm(x)
-        zold = torch.zeros_like(x)
+        use_cache = use_cache and self._norm_cacheable()
+        key = (tuple(x0.shape), x0.device, x0.dtype, per_sample)
+        tensors = self._norm_tensors()
+        entry = _norm_registry.get(self, {}).get(key) if use_cache else None
+        if (
+            entry is not None
+            and _unchanged(entry[0], tensors)
+            and entry[3] <= tol
+            and entry[4] >= max_iter
+        ):
+            return entry[1].clone()
+
+        dims = tuple(range(1, x0.dim())) if per_sample else tuple(range(x0.dim()))
+        x = torch.randn_like(x0) if entry is None else entry[2]
+        x = x / torch.sqrt((x * x).sum(dims, keepdim=True))
+        zold = torch.zeros_like(x.sum(dims))
         for it in range(max_iter):
-            y = self.A(x)
-            y = self.A_adjoint(y)
-            z = torch.matmul(x.reshape(-1), y.reshape(-1)) / torch.norm(x) ** 2
-
-            rel_var = torch.norm(z - zold)
-            if rel_var < tol and verbose:
-                print(
-                    f"Power iteration converged at iteration {it}, value={z.item():.2f}"
-                )
+            y = self.A_adjoint_A(x)
+            z = (x * y).sum(dims) / (x * x).sum(dims)
+
+            rel_var = torch.norm(z - zold, p=float("inf"))
+            if rel_var < tol:
+                if verbose:
+                    print(
+                        f"Power iteration converged at iteration {it}, "
+                        f"value={z.max().item():.2f}"
+                    )
                 break
             zold = z
-            x = y / torch.norm(y)
+            x = y / torch.sqrt((y * y).sum(dims, keepdim=True))
 
+        if use_cache:
+            state = [(weakref.ref(t), _version(t)) for t in tensors]
+            entry = (state, z.detach().clone(), x.detach(), tol, max_iter)
+            _norm_registry.setdefault(self, {})[key] = entry
         return z
 
+    def _norm_cacheable(self):
+        r"""
+        Checks that the operator is defined by its class, or is a sum or composition of such operators, so that
+        the tensors returned by :meth:`_norm_tensors` define it entirely.
+        """
+        operands = getattr(self, "_operands", None)
+        if operands is not None:
+            return all(
+                isinstance(operand, LinearPhysics) and operand._norm_cacheable()
+                for operand in operands
+            )
+        return type(self).A is not Physics.A
+
+    def _norm_tensors(self):
+        r"""
+        Tensors defining the operator (parameters, buffers and tensor attributes, including those of the composed
+        operators), whose replacement or in-place modification invalidates the norms stored by
+        :meth:`compute_norm`.
+        """
+        tensors = [
+            t
+            for name, t in list(self.named_parameters()) + list(self.named_buffers())
+            if not name.startswith(("noise_model.", "sensor_model."))
+        ]
+        tensors += [t for t in vars(self).values() if isinstance(t, torch.Tensor)]
+        for operand in getattr(self, "_operands", ()):
+            if isinstance(operand, LinearPhysics):
+                tensors += operand._norm_tensors()
+        return tensors
+
     def adjointness_test(self, u):
         r"""
         Numerically check that :math:`A^{\top}` is indeed the adjoint of :math:`A`.
@@ -489,6 +686,9 @@ class LinearPhysics(Physics):
 
             \underset{x}{\arg\min} \; \frac{\gamma}{2}\|Ax-y\|^2 + \frac{1}{2}\|x-z\|^2
 
+        The conjugate gradient iterations are warm-started with the previous solution if a
+        :class:`deepinv.optim.utils.ProxCache` is active.
+
         :param torch.Tensor y: measurements tensor
         :param torch.Tensor z: signal tensor
         :param float gamma: hyperparameter of the proximal operator
@@ -496,18 +696,27 @@ class LinearPhysics(Physics):
 
         """
         b = self.A_adjoint(y) + 1 / gamma * z
-        H = lambda x: self.A_adjoint(self.A(x)) + 1 / gamma * x
-        x = conjugate_gradient(H, b, self.max_iter, self.tol)
+        H = lambda x: self.A_adjoint_A(x) + 1 / gamma * x
+        cache = ProxCache.current()
+        x0 = None
+        if cache is not None and isinstance(b, torch.Tensor):
+            x0 = cache.get(self, b)
+        x = conjugate_gradient(
+            H, b, self.max_iter, self.tol, M=self.preconditioner(gamma), x0=x0
+        )
+        if cache is not None and isinstance(x, torch.Tensor):
+            cache.update(self, x)
         return x
 
     def A_dagger(self, y):
         r"""
         Computes the solution in :math:`x` to :math:`y = Ax` using the
-        `conjugate gradient method <https://en.wikipedia.org/wiki/Conjugate_gradient_method>`_,
-        see :meth:`deepinv.optim.utils.conjugate_gradient`.
+        `LSQR algorithm <https://web.stanford.edu/group/SOL/software/lsqr/>`_,
+        see :meth:`deepinv.optim.utils.lsqr`.
 
-        If the size of :math:`y` is larger than :math:`x` (overcomplete problem), it computes :math:`(A^{\top} A)^{-1} A^{\top} y`,
-        otherwise (incomplete problem) it computes :math:`A^{\top} (A A^{\top})^{-1} y`.
+        It computes the least squares solution of minimal norm :math:`A^{\dagger}y`, without forming the normal
+        equations :math:`A^{\top}Ax = A^{\top}y` (overcomplete problem) or :math:`AA^{\top}u = y` (incomplete
+        problem), whose condition number is the square of the one of :math:`A`.
 
         This function can be overwritten by a more efficient pseudoinverse in cases where closed form formulas exist.
 
@@ -515,23 +724,74 @@ class LinearPhysics(Physics):
         :return: (torch.Tensor) The reconstructed image :math:`x`.
 
         """
-        Aty = self.A_adjoint(y)
+        return lsqr(self.A, self.A_adjoint, y, max_iter=self.max_iter, tol=self.tol)
 
-        overcomplete = Aty.flatten().shape[0] < y.flatten().shape[0]
+    def preconditioner(self, gamma):
+        r"""
+        Returns a preconditioner for the conjugate gradient iterations of :meth:`prox_l2`.
 
-        if not overcomplete:
-            A = lambda x: self.A(self.A_adjoint(x))
-            b = y
-        else:
-            A = lambda x: self.A_adjoint(self.A(x))
-            b = Aty
+        The preconditioner is a callable approximating :math:`(A^{\top}A + \frac{1}{\gamma}I)^{-1}`. By default,
+        there is no preconditioner.
+
+        :param float gamma: hyperparameter of the proximal operator.
+        :return: (callable, None) preconditioner, or ``None`` if the operator does not provide one.
+        """
+        return None
 
-        x = conjugate_gradient(A=A, b=b, max_iter=self.max_iter, tol=self.tol)
+    def subsets(self, n_subsets):
+        r"""
+        Splits the rows of the operator (i.e., the measurements) into ``n_subsets`` disjoint subsets.
 
-        if not overcomplete:
-            x = self.A_adjoint(x)
+        The subsets are used by ordered-subsets and stochastic algorithms such as
+        :class:`deepinv.optim.optim_iterators.OSPGDIteration`, which only apply the rows
+        :math:`A_S` of a subset :math:`S` at each iteration. Operators with a row-separable structure
+        (e.g., the angles of a tomography scan) override this method, together with :meth:`measurement_subset`,
+        :meth:`A_subset` and :meth:`A_adjoint_subset`.
 
-        return x
+        :param int n_subsets: number of subsets.
+        :return: (list) list of ``n_subsets`` index tensors.
+        """
+        raise NotImplementedError(
+            f"{type(self).__name__} does not support measurement subsets."
+        )
+
+    def measurement_subset(self, y, idx):
+        r"""
+        Extracts the measurements :math:`y_S` of the subset :math:`S` from the full measurements :math:`y`.
+
+        :param torch.Tensor y: measurements.
+        :param torch.Tensor idx: subset indices, as returned by :meth:`subsets`.
+        :return: (torch.Tensor) measurements of the subset.
+        """
+        raise NotImplementedError(
+            f"{type(self).__name__} does not support measurement subsets."
+        )
+
+    def A_subset(self, x, idx):
+        r"""
+        Computes the measurements :math:`A_S x` of the subset :math:`S`.
+
+        By default, the full operator is applied and the subset is extracted afterwards. Subclasses override this
+        method to only compute the rows of the subset.
+
+        :param torch.Tensor x: signal/image.
+        :param torch.Tensor idx: subset indices, as returned by :meth:`subsets`.
+        :return: (torch.Tensor) measurements of the subset.
+        """
+        return self.measurement_subset(self.A(x), idx)
+
+    def A_adjoint_subset(self, y, idx):
+        r"""
+        Computes the adjoint :math:`A_S^{\top} y` of the rows of the subset :math:`S`, such that
+        :math:`\sum_S A_S^{\top} y_S = A^{\top} y`.
+
+        :param torch.Tensor y: measurements of the subset, as returned by :meth:`A_subset`.
+        :param torch.Tensor idx: subset indices, as returned by :meth:`subsets`.
+        :return: (torch.Tensor) signal/image.
+        """
+        raise NotImplementedError(
+            f"{type(self).__name__} does not support measurement subsets."
+        )
 
 
 class DecomposablePhysics(LinearPhysics):
@@ -603,7 +863,7 @@ class DecomposablePhysics(LinearPhysics):
         return self._U(x)
 
     def V(self, x):
-        return self._U(x)
+        return self._V(x)
 
     def U_adjoint(self, x):
         return self._U_adjoint(x)
@@ -619,6 +879,44 @@ class DecomposablePhysics(LinearPhysics):
 
         return self.V(mask * self.U_adjoint(y))
 
+    def A_adjoint_A(self, x):
+        r"""
+        Computes the normal operator :math:`A^{\top}Ax = V\text{diag}(|s|^2)V^{\top}x`, which does not require
+        applying :math:`U` and :math:`U^{\top}`.
+
+        :param torch.Tensor x: signal/image.
+        :return: (torch.Tensor) :math:`A^{\top}Ax`.
+        """
+        if isinstance(self.mask, float):
+            mask = self.mask**2
+        else:
+            mask = torch.conj(self.mask) * self.mask
+        return self.V(mask * self.V_adjoint(x))
+
+    def compute_norm(
+        self, x0, max_iter=100, tol=1e-3, verbose=True, per_sample=False, use_cache=True
+    ):
+        r"""
+        Computes the spectral norm of :math:`A^{\top}A` in closed form, i.e., the largest squared singular value
+        :math:`\max_i |s_i|^2` (e.g. :math:`\max |h|^2` for the Fourier transform :math:`h` of the filter of
+        :class:`deepinv.physics.BlurFFT`).
+
+        The arguments are the same as in :meth:`deepinv.physics.LinearPhysics.compute_norm`, and only ``x0`` (which
+        sets the batch size, device and dtype of the output) and ``per_sample`` are used.
+
+        :param torch.Tensor x0: input of the operator.
+        :param bool per_sample: if ``True``, computes the norm of the operator of each sample of the batch.
+        :returns z: (torch.Tensor) spectral norm of :math:`A^{\top}A`, of size (B,) if ``per_sample=True``.
+        """
+        if isinstance(self.mask, (int, float)):
+            z = torch.tensor(float(self.mask) ** 2, device=x0.device, dtype=x0.dtype)
+            return z.expand(x0.shape[0]) if per_sample else z
+        mask = self.mask.abs().pow(2).to(x0.dtype)
+        if per_sample:
+            mask = mask.reshape(mask.shape[0], -1).amax(dim=1)
+            return mask.expand(x0.shape[0]).to(x0.device)
+        return mask.max().to(x0.device)
+
     def prox_l2(self, z, y, gamma):
         r"""
         Computes proximal operator of :math:`f(x)=\frac{\gamma}{2}\|Ax-y\|^2`
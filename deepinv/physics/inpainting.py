@@ -1,5 +1,53 @@
 from deepinv.physics.forward import DecomposablePhysics
 import torch
+import math
+
+
+def mask_gather(x, index):
+    r"""
+    Gathers the entries ``index`` of the flattened samples of a batch, i.e. computes the compact measurements
+    :math:`y = Sx` where :math:`S` selects the entries of a mask.
+
+    :param torch.Tensor x: batch of size (B, ...).
+    :param torch.Tensor index: flat indices of the selected entries of a sample, of size (m,).
+    :return: (torch.Tensor) selected entries, of size (B, m).
+    """
+    return x.reshape(x.shape[0], -1).index_select(1, index)
+
+
+def mask_scatter(y, index, shape):
+    r"""
+    Adjoint of :meth:`deepinv.physics.inpainting.mask_gather`, which scatters compact measurements in zero-filled
+    samples.
+
+    :param torch.Tensor y: compact measurements of size (B, m).
+    :param torch.Tensor index: flat indices of the selected entries of a sample, of size (m,).
+    :param tuple[int] shape: size of a sample.
+    :return: (torch.Tensor) zero-filled batch of size (B, \*shape).
+    """
+    out = torch.zeros((y.shape[0], math.prod(shape)), device=y.device, dtype=y.dtype)
+    return out.index_add_(1, index, y).view((y.shape[0],) + tuple(shape))
+
+
+class _MaskIndex:
+    r"""
+    Flat indices of the nonzero entries of the mask of an operator, which are only recomputed when the mask is
+    replaced or moved to another device.
+    """
+
+    def __init__(self):
+        self.cached = None
+
+    def __call__(self, mask):
+        if mask.shape[0] > 1:
+            raise ValueError(
+                "Compact measurements require a single mask shared by all the samples."
+            )
+        cached = self.cached
+        if cached is None or cached[0] is not mask or cached[1].device != mask.device:
+            index = torch.nonzero(mask[0].reshape(-1) != 0).flatten()
+            self.cached = (mask, index)
+        return self.cached[1]
 
 
 class Inpainting(DecomposablePhysics):
@@ -27,6 +75,11 @@ class Inpainting(DecomposablePhysics):
         the mask will be set to this tensor.
     :param torch.device device: gpu or cpu
     :param bool pixelwise: Apply the mask in a pixelwise fashion, i.e., zero all channels in a given pixel simultaneously.
+    :param bool compact: If ``True``, the measurements only contain the observed entries, i.e., they are tensors of
+        size (B, m) where m is the number of nonzero entries of the mask, which are gathered and scattered with
+        precomputed indices (see :meth:`deepinv.physics.inpainting.mask_gather`). This reduces the memory of the
+        measurements (e.g. in :meth:`deepinv.datasets.generate_dataset`) by the sampling ratio. It requires a mask
+        shared by all the samples.
 
     |sep|
 
@@ -56,14 +109,27 @@ class Inpainting(DecomposablePhysics):
 
     """
 
-    def __init__(self, tensor_size, mask=0.3, pixelwise=True, device="cpu", **kwargs):
+    def __init__(
+        self,
+        tensor_size,
+        mask=0.3,
+        pixelwise=True,
+        device="cpu",
+        compact=False,
+        **kwargs,
+    ):
         super().__init__(**kwargs)
         self.tensor_size = tensor_size
+        self.pixelwise = pixelwise
+        self.compact = compact
+        self.mask_index = _MaskIndex()
 
         if isinstance(mask, torch.Tensor):  # check if the user created mask
             self.mask = mask
+            self.mask_rate = None
         else:  # otherwise create new random mask
             mask_rate = mask
+            self.mask_rate = mask_rate
             self.mask = torch.ones(tensor_size, device=device)
             aux = torch.rand_like(self.mask)
             if not pixelwise:
@@ -73,6 +139,50 @@ class Inpainting(DecomposablePhysics):
 
         self.mask = torch.nn.Parameter(self.mask.unsqueeze(0), requires_grad=False)
 
+    def sample_params(self, batch_size, generator=None):
+        r"""
+        Samples one random mask per sample, with the same distribution as the mask created by the constructor.
+
+        If the operator was created with a fixed mask, the entries are kept with a probability equal to the
+        proportion of ones in this mask.
+
+        :param int batch_size: number of masks.
+        :param torch.Generator generator: random number generator. If ``None``, the global generator is used.
+        :return: (dict) parameters, with the masks of size (batch_size, ...) under the key ``'mask'``.
+        """
+        params = super().sample_params(batch_size, generator)
+        rate = self.mask_rate if self.mask_rate is not None else self.mask.mean().item()
+        shape = (batch_size,) + self.mask.shape[1:]
+        aux = torch.rand(
+            (batch_size, 1) + shape[2:] if self.pixelwise else shape,
+            generator=generator,
+            device=self._params_device(generator, self.mask),
+        )
+        params["mask"] = (aux <= rate).to(self.mask.dtype).expand(shape)
+        return params
+
+    def update_parameters(self, mask=None, **kwargs):
+        r"""
+        Updates the mask of the operator.
+
+        :param torch.Tensor mask: new mask, of size (B, ...) for one mask per sample, see :meth:`sample_params`.
+        """
+        if mask is not None:
+            self.mask = torch.nn.Parameter(
+                mask.to(self.mask.device), requires_grad=False
+            )
+        super().update_parameters(**kwargs)
+
+    def U(self, x):
+        if self.compact:
+            return mask_gather(x, self.mask_index(self.mask))
+        return super().U(x)
+
+    def U_adjoint(self, y):
+        if self.compact:
+            return mask_scatter(y, self.mask_index(self.mask), self.mask.shape[1:])
+        return super().U_adjoint(y)
+
     def noise(self, x):
         r"""
         Incorporates noise into the measurements :math:`\tilde{y} = N(y)`
@@ -84,3 +194,29 @@ class Inpainting(DecomposablePhysics):
             self.V_adjoint(self.V(self.U_adjoint(self.noise_model(x)) * self.mask))
         )
         return noise
+
+    def subsets(self, n_subsets):
+        r"""
+        Splits the rows of the image into ``n_subsets`` interleaved subsets.
+
+        :param int n_subsets: number of subsets.
+        :return: (list) list of ``n_subsets`` index tensors.
+        """
+        return [
+            torch.arange(k, self.mask.shape[-2], n_subsets) for k in range(n_subsets)
+        ]
+
+    def measurement_subset(self, y, idx):
+        if self.compact:
+            y = self.U_adjoint(y)
+        return y[..., idx, :]
+
+    def A_subset(self, x, idx):
+        return x[..., idx, :] * self.mask[..., idx, :]
+
+    def A_adjoint_subset(self, y, idx):
+        x = torch.zeros(
+            y.shape[:-2] + self.mask.shape[-2:], device=y.device, dtype=y.dtype
+        )
+        x[..., idx, :] = y * self.mask[..., idx, :]
+        return x
@@ -1,4 +1,7 @@
+import math
 import torch
+import torch.nn.functional as F
+from deepinv.physics import blur
 from deepinv.physics.forward import Physics
 from deepinv.physics.noise import PoissonNoise
 
@@ -23,15 +26,32 @@ class SinglePhotonLidar(Physics):
     contains the depth of the scene :math:`d`, the second channel contains the intensity of the scene :math:`r` and
     the third channel contains the per pixel background noise levels :math:`b`.
 
+    The histograms are computed by tiles of ``chunk_size`` pixels, and the impulse response of each pixel is only
+    evaluated on the bins around its depth where it is not negligible w.r.t. the machine precision, which are
+    added to the background. The memory used on top of the histograms is thus independent of the number of bins.
+    The matched filter of :meth:`A_dagger` is also applied by tiles of pixels.
+
     :param float sigma: Standard deviation of the Gaussian impulse response function.
     :param int bins: Number of histogram bins per pixel.
     :param str device: Device to use (gpu or cpu).
+    :param int chunk_size: number of pixels processed at once by :meth:`A` and :meth:`A_dagger`.
+    :param str conv_method: ``'spatial'`` applies the matched filter of :meth:`A_dagger` with
+        :meth:`torch.nn.functional.conv1d`, ``'fft'`` computes the cross-correlation with FFTs, and ``'auto'``
+        chooses the cheapest option depending on the number of bins and on the length of the impulse response.
     """
 
-    def __init__(self, sigma=1.0, bins=50, device="cpu"):
+    def __init__(
+        self, sigma=1.0, bins=50, device="cpu", chunk_size=4096, conv_method="auto"
+    ):
         super().__init__()
+        if conv_method not in ("auto", "spatial", "fft"):
+            raise ValueError(
+                f"Unknown convolution method {conv_method}, options are 'auto', 'spatial' and 'fft'."
+            )
 
         self.T = bins
+        self.chunk_size = chunk_size
+        self.conv_method = conv_method
         self.grid = torch.meshgrid(torch.arange(bins), indexing="ij")[0].to(device)
         self.sigma = torch.nn.Parameter(
             torch.tensor(sigma, device=device), requires_grad=False
@@ -44,6 +64,15 @@ class SinglePhotonLidar(Physics):
         h = h / h.sum()
         self.irf = h.unsqueeze(0).unsqueeze(0)  # set impulse response function
         self.grid = self.grid.unsqueeze(0).unsqueeze(2).unsqueeze(3)
+        self.irf_spectra = {}
+
+    def _support_radius(self, dtype):
+        r"""
+        Half-width (in bins) of the window around the depth outside of which the Gaussian impulse response is
+        below the machine precision of ``dtype`` relative to its peak.
+        """
+        eps = torch.finfo(dtype).eps
+        return math.ceil(float(self.sigma) * math.sqrt(-2 * math.log(eps))) + 1
 
     def A(self, x):
         r"""
@@ -53,51 +82,119 @@ class SinglePhotonLidar(Physics):
 
         :param torch.tensor x: tensor containing the depth, intensity and background noise levels.
         """
-
-        h = ((self.grid - x[:, 0, :, :]) / self.sigma).pow(2)
-        h = torch.exp(-h / 2.0)
-        h = h / h.sum(dim=1, keepdim=True)
-        y = x[:, 1, :, :] * h + x[:, 2, :, :]
-        return y
-
-    def A_dagger(self, y):
+        B, _, H, W = x.shape
+        d, r, b = x.reshape(B, 3, 1, H * W).unbind(1)
+
+        # background, to which the (truncated) impulse responses are added
+        y = b.expand(B, self.T, H * W).clone()
+        radius = self._support_radius(x.dtype)
+        offsets = torch.arange(-radius, radius + 1, device=x.device).view(1, -1, 1)
+        for start in range(0, H * W, self.chunk_size):
+            tile = slice(start, start + self.chunk_size)
+            t = d[..., tile].round().clamp(0, self.T - 1) + offsets
+            h = torch.exp(-((t - d[..., tile]) / self.sigma).pow(2) / 2.0)
+            h = h * ((t >= 0) & (t < self.T))
+            h = h / h.sum(dim=1, keepdim=True)
+            index = t.clamp(0, self.T - 1).long()
+            y[..., tile].scatter_add_(1, index, r[..., tile] * h)
+        return y.view(B, self.T, H, W)
+
+    def _use_fft(self):
         r"""
-        Applies Matched filtering to find the peaks.
-
-        Input is of size (B, bins, H, W), output of size (B, 3, H, W).
+        Returns ``True`` if the matched filter should be computed with FFTs, with the cost model of
+        :meth:`deepinv.physics.blur.fft_conv_is_faster`.
+        """
+        if self.conv_method == "auto":
+            n = self.T + self.irf.shape[-1] - 1
+            return blur.FFT_CONV_COST * n * math.log2(n) < self.T * self.irf.shape[-1]
+        return self.conv_method == "fft"
 
-        :param torch.tensor y: measurements
+    def _irf_spectrum(self, n, device, dtype):
+        r"""
+        Returns the (cached) real Fourier transform of the impulse response function on a grid of size ``n``.
         """
-        B, T, H, W = y.shape
+        key = (n, str(device), dtype)
+        if key not in self.irf_spectra:
+            irf = self.irf.view(-1, 1).to(device, dtype)
+            self.irf_spectra[key] = torch.fft.rfft(irf, n=n, dim=0)
+        return self.irf_spectra[key]
 
-        # reshape to (B*H*W, 1, T)
-        y = y.permute(0, 2, 3, 1).reshape(B * H * W, 1, T)
+    def matched_filter(self, y):
+        r"""
+        Cross-correlation of the histograms with the impulse response function, with the alignment of
+        :meth:`torch.nn.functional.conv1d` with ``padding='same'``.
 
-        # Apply irf using convolution
-        x = torch.nn.functional.conv1d(y, self.irf, padding="same")
+        :param torch.Tensor y: histograms of size (B, bins, N).
+        :return: (torch.Tensor) filtered histograms of size (B, bins, N).
+        """
+        B, T, N = y.shape
+        L = self.irf.shape[-1]
+        left = (L - 1) // 2
+        if not self._use_fft():
+            z = y.permute(0, 2, 1).reshape(B * N, 1, T)
+            z = F.conv1d(z, self.irf.to(y.dtype), padding="same")
+            return z.view(B, N, T).permute(0, 2, 1)
+
+        n = T + L - 1
+        z = torch.fft.rfft(y, n=n, dim=1) * torch.conj(
+            self._irf_spectrum(n, y.device, y.dtype)
+        )
+        z = torch.fft.irfft(z, n=n, dim=1)
+        # the correlation at lag i - left is stored at index (i - left) mod n
+        return torch.roll(z, left, dims=1)[:, :T]
 
-        # Find peak value in each channel
-        _, x = torch.max(x, dim=-1, keepdim=True)
-        x = x.type(torch.float32)
-        offset = self.irf.shape[-1] // 2
-        x -= 3 * self.sigma - offset - 0.5
+    def A_dagger(self, y):
+        r"""
+        Applies Matched filtering to find the peaks.
 
-        mask = torch.ones_like(y)
-        grid = self.grid.squeeze(-1).squeeze(-1)  # (1, T)
+        The depth is the position of the maximum of the matched filter, refined below the bin size by fitting a
+        Gaussian to the maximum and its two neighbours,
 
-        mask *= (x - 4 * self.sigma) < grid
-        mask *= (x + 4 * self.sigma) > grid
+        .. math::
 
-        b = (y * (1 - mask)).sum(dim=-1, keepdim=True)
-        r = y.sum(dim=-1, keepdim=True) - b
-        b /= T
+            \delta = \frac{1}{2}\frac{\log c_{i-1} - \log c_{i+1}}{\log c_{i-1} - 2\log c_i + \log c_{i+1}},
 
-        x = torch.stack([x, r, b], dim=-1)
+        which is exact for a noiseless Gaussian peak. The filtering and the peak search are applied by tiles of
+        ``chunk_size`` pixels, with FFTs if they are cheaper (see ``conv_method``).
 
-        # reshape to (B, 3, H, W)
-        x = x.reshape(B, H, W, 3).permute(0, 3, 1, 2)
+        Input is of size (B, bins, H, W), output of size (B, 3, H, W).
 
-        return x
+        :param torch.tensor y: measurements
+        """
+        B, T, H, W = y.shape
+        dtype = y.dtype if y.is_floating_point() else torch.float32
+        y = y.reshape(B, T, H * W).to(dtype)
+        x = torch.zeros((B, 3, H * W), device=y.device, dtype=dtype)
+
+        grid = torch.arange(T, device=y.device, dtype=dtype).view(1, T, 1)
+        # position of the peak of the impulse response relative to the alignment of the matched filter
+        offset = 3 * self.sigma.to(dtype) - (self.irf.shape[-1] - 1) // 2
+        tiny = torch.finfo(dtype).tiny
+        for start in range(0, H * W, self.chunk_size):
+            tile = slice(start, start + self.chunk_size)
+            yt = y[..., tile]
+            c = self.matched_filter(yt)
+
+            i = torch.argmax(c, dim=1, keepdim=True)
+            neighbours = torch.cat([i - 1, i, i + 1], dim=1).clamp(0, T - 1)
+            lm, l0, lp = c.gather(1, neighbours).clamp(min=tiny).log().unbind(1)
+            curvature = lm - 2 * l0 + lp
+            # no refinement at the first and last bins, or if the peak is flat
+            valid = (curvature < 0) & (i.squeeze(1) > 0) & (i.squeeze(1) < T - 1)
+            delta = 0.5 * (lm - lp) / torch.where(valid, curvature, -1.0)
+            delta = torch.where(valid, delta, 0.0).clamp(-0.5, 0.5)
+            depth = i.squeeze(1).to(dtype) + delta + offset
+
+            mask = (depth.unsqueeze(1) - 4 * self.sigma < grid) & (
+                depth.unsqueeze(1) + 4 * self.sigma > grid
+            )
+            total = yt.sum(dim=1)
+            b = total - (yt * mask).sum(dim=1)
+            x[:, 0, tile] = depth
+            x[:, 1, tile] = total - b
+            x[:, 2, tile] = b / T
+
+        return x.view(B, 3, H, W)
 
 
 # if __name__ == "__main__":
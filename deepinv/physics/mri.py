@@ -1,8 +1,39 @@
+import math
 import numpy as np
 import torch
 import torch.fft
 from typing import List, Optional
-from deepinv.physics.forward import DecomposablePhysics
+from deepinv.physics.forward import DecomposablePhysics, LinearPhysics
+from deepinv.physics.inpainting import mask_gather, mask_scatter, _MaskIndex
+from deepinv.physics.nufft import (
+    _load_interpolation_matrix,
+    deapodization,
+    density_compensation,
+    oversampled_grid_size,
+)
+
+# relative cost of one FFT operation w.r.t. one complex multiply-add of a matrix product
+FFT_COST = 4.0
+
+
+def line_dft_is_faster(img_size, n_lines):
+    r"""
+    Returns ``True`` if computing ``n_lines`` k-space lines (columns) of an image of size ``img_size`` with a
+    partial DFT along the width (a matrix product) followed by 1D FFTs of the sampled lines along the height is
+    cheaper than a full 2D FFT.
+
+    The partial transform costs :math:`HWL + c\,LH\log_2 H` operations for :math:`L` lines, against
+    :math:`c\,HW(\log_2 H + \log_2 W)` for the 2D FFT, where :math:`c` is the relative cost ``FFT_COST`` of one
+    FFT operation w.r.t. one multiply-add.
+
+    :param tuple[int] img_size: size (H, W) of the images.
+    :param int n_lines: number of sampled lines.
+    :return: (bool) ``True`` if the partial DFT is cheaper.
+    """
+    H, W = img_size
+    full = FFT_COST * H * W * (math.log2(H) + math.log2(W))
+    partial = H * W * n_lines + FFT_COST * n_lines * H * math.log2(H)
+    return partial < full
 
 
 class MRI(DecomposablePhysics):
@@ -22,9 +53,20 @@ class MRI(DecomposablePhysics):
     The complex images :math:`x` and measurements :math:`y` should be of size (B, 2, H, W) where the first channel corresponds to the real part
     and the second channel corresponds to the imaginary part.
 
+    The measurements only contain the sampled k-space coefficients, i.e. they are tensors of size (B, m), which are
+    gathered and scattered with indices precomputed once per mask (see
+    :meth:`deepinv.physics.inpainting.mask_gather`).
+
+    If the mask samples full vertical lines of the k-space (as the masks of :meth:`sample_mask`), the forward
+    operator and its adjoint only compute the sampled lines, with a 1D FFT along the height of the images and a
+    partial DFT along the width (see :meth:`A_subset`), instead of a full 2D FFT.
+
     :param torch.Tensor mask: the mask values should be binary.
         The mask size should be of the form (H,W) where H is the image height and W is the image width.
     :param torch.device device: cpu or gpu.
+    :param str line_method: computation of :meth:`A` and :meth:`A_adjoint` for masks made of full lines.
+        ``'dft'`` always uses the partial DFT of the sampled lines, ``'fft'`` always uses the 2D FFT, and ``'auto'``
+        chooses the cheapest option with :meth:`deepinv.physics.mri.line_dft_is_faster`.
 
     |sep|
 
@@ -49,11 +91,21 @@ class MRI(DecomposablePhysics):
         acceleration_factor=4,
         device="cpu",
         seed=None,
+        line_method="auto",
         **kwargs,
     ):
         super().__init__(**kwargs)
+        if line_method not in ("auto", "dft", "fft"):
+            raise ValueError(
+                f"Unknown line method {line_method}, options are 'auto', 'dft' and 'fft'."
+            )
         self.device = device
         self.image_size = image_size
+        self.acceleration_factor = acceleration_factor
+        self.line_method = line_method
+        self.mask_index = _MaskIndex()
+        self.lines_cache = None
+        self.dft_cache = None
 
         if mask is not None:
             mask = mask.to(device).unsqueeze(0).unsqueeze(0)
@@ -87,34 +139,157 @@ class MRI(DecomposablePhysics):
             torch.cat([mask, mask], dim=1), requires_grad=False
         )
 
-    def V_adjoint(self, x):  # (B, 2, H, W) -> (B, H, W, 2)
-        y = fft2c_new(x.permute(0, 2, 3, 1)).permute(0, 3, 1, 2)
-        return y
+    def sample_params(self, batch_size, generator=None):
+        r"""
+        Samples one mask per sample, with the same distribution as :meth:`sample_mask` and the size of the current
+        mask, directly on the device of the operator.
+
+        :param int batch_size: number of masks.
+        :param torch.Generator generator: random number generator. If ``None``, the global generator is used.
+        :return: (dict) parameters, with the masks of size (batch_size, H, W) under the key ``'mask'``.
+        """
+        params = super().sample_params(batch_size, generator)
+        device = self._params_device(generator, self.mask)
+        H, W = self.mask.shape[-2:]
+        center, num_random = self._sampling_pattern((H, W), self.acceleration_factor)
+        lines = torch.zeros((batch_size, W), device=device)
+        lines[:, center.to(device)] = 1
+        order = torch.rand((batch_size, W), generator=generator, device=device)
+        order = order.argsort(dim=-1)
+        lines.scatter_(-1, order[:, :num_random], 1.0)
+        params["mask"] = lines.unsqueeze(1).expand(-1, H, -1)
+        return params
+
+    def update_parameters(self, mask=None, **kwargs):
+        r"""
+        Updates the mask of the operator.
+
+        If several masks are given, the measurements are the zero-filled k-spaces of size (B, 2, H, W) instead of
+        the vector of sampled k-space coefficients, so that samples with different masks can be batched.
+
+        :param torch.Tensor mask: new mask of size (H, W), or (B, H, W) for one mask per sample,
+            see :meth:`sample_params`.
+        """
+        if mask is not None:
+            mask = mask.to(self.mask.device)
+            mask = mask.unsqueeze(0) if mask.dim() == 2 else mask
+            self.mask = torch.nn.Parameter(
+                torch.stack([mask, mask], dim=1), requires_grad=False
+            )
+        super().update_parameters(**kwargs)
+
+    def noise(self, x):
+        r"""
+        Incorporates noise into the measurements :math:`\tilde{y} = N(y)`. With one mask per sample, the
+        non-sampled coefficients of the zero-filled k-spaces remain equal to zero.
+
+        :param torch.Tensor x:  clean measurements
+        :return torch.Tensor: noisy measurements
+        """
+        if self.mask.shape[0] > 1:
+            return self.noise_model(x) * self.mask
+        return self.noise_model(x)
+
+    def A(self, x):
+        lines = self._partial_lines(x.shape[-2:])
+        if lines is None:
+            return super().A(x)
+        return self.A_subset(x, lines).reshape(x.shape[0], -1)
+
+    def A_adjoint(self, y):
+        lines = self._partial_lines(self.mask.shape[-2:])
+        if lines is None:
+            return super().A_adjoint(y)
+        y = y.reshape(y.shape[0], 2, self.mask.shape[-2], len(lines))
+        return self.A_adjoint_subset(y, lines)
+
+    def A_adjoint_A(self, x):
+        if self._partial_lines(x.shape[-2:]) is None:
+            return super().A_adjoint_A(x)
+        return self.A_adjoint(self.A(x))
+
+    def sampled_lines(self):
+        r"""
+        Indices of the sampled k-space lines (columns of the mask) if the mask only contains full lines and is
+        shared by all the samples, otherwise ``None``. The indices are only recomputed when the mask is replaced.
+
+        :return: (torch.Tensor, None) sorted indices of the sampled lines.
+        """
+        mask, cached = self.mask, self.lines_cache
+        if (
+            cached is None
+            or cached[0] is not mask
+            or (cached[1] is not None and cached[1].device != mask.device)
+        ):
+            lines = None
+            if mask.shape[0] == 1 and bool((mask == mask[..., :1, :]).all()):
+                lines = torch.nonzero(mask[0, 0, 0] != 0).flatten()
+            self.lines_cache = (mask, lines)
+        return self.lines_cache[1]
+
+    def _partial_lines(self, img_size):
+        r"""
+        Sampled lines if :meth:`A` and :meth:`A_adjoint` are computed with the partial DFT, otherwise ``None``.
+        """
+        if self.line_method == "fft":
+            return None
+        lines = self.sampled_lines()
+        if lines is None or (
+            self.line_method == "auto"
+            and not line_dft_is_faster(tuple(img_size), len(lines))
+        ):
+            return None
+        return lines
+
+    def V_adjoint(self, x):  # (B, 2, H, W) -> (B, 2, H, W)
+        y = _fft2c(torch.complex(x[:, 0], x[:, 1]))
+        return torch.stack([y.real, y.imag], dim=1)
 
     def U(self, x):
-        return x[:, self.mask.squeeze(0) > 0]
+        if self.mask.shape[0] > 1:  # one mask per sample, zero-filled k-space
+            return x
+        return mask_gather(x, self.mask_index(self.mask))
 
     def U_adjoint(self, x):
-        _, c, h, w = self.mask.shape
-        out = torch.zeros((x.shape[0], c, h, w), device=x.device)
-        out[:, self.mask.squeeze(0) > 0] = x
-        return out
+        if self.mask.shape[0] > 1:
+            return x
+        return mask_scatter(x, self.mask_index(self.mask), self.mask.shape[1:])
 
-    def V(self, x):  # (B, 2, H, W) -> (B, H, W, 2)
-        x = x.permute(0, 2, 3, 1)
-        return ifft2c_new(x).permute(0, 3, 1, 2)
+    def V(self, x):  # (B, 2, H, W) -> (B, 2, H, W)
+        x = _fft2c(torch.complex(x[:, 0], x[:, 1]), inverse=True)
+        return torch.stack([x.real, x.imag], dim=1)
 
     def sample_mask(self, image_size=(320, 320), acceleration_factor=4, seed=None):
         r"""
         Create a mask of vertical lines.
 
-        :param tuple image_size: image size.
+        The fully sampled central lines and the random lines are columns of the mask, i.e., indices along the width
+        ``W = image_size[-1]``, for square and non-square images.
+
+        :param tuple image_size: image size (H, W).
         :param int acceleration_factor: acceleration factor.
         :param int seed: random seed.
         :return: mask of size (H, W) with values in {0, 1}.
         """
         if seed is not None:
             np.random.seed(seed)
+        center_line_indices, num_random = self._sampling_pattern(
+            image_size, acceleration_factor
+        )
+        mask = torch.zeros(image_size)
+        mask[:, center_line_indices] = 1
+        random_line_indices = np.random.choice(
+            image_size[-1], size=(num_random,), replace=False
+        )
+        mask[:, random_line_indices] = 1
+        return mask.float().to(self.device)
+
+    @staticmethod
+    def _sampling_pattern(image_size, acceleration_factor):
+        r"""
+        Indices of the fully sampled central lines and number of random lines of the masks of :meth:`sample_mask`,
+        which are columns of the mask (indices along the width ``image_size[-1]``).
+        """
         if acceleration_factor == 4:
             central_lines_percent = 0.08
             num_lines_center = int(central_lines_percent * image_size[-1])
@@ -125,19 +300,407 @@ class MRI(DecomposablePhysics):
             num_lines_center = int(central_lines_percent * image_size[-1])
             side_lines_percent = 0.125 - central_lines_percent
             num_lines_side = int(side_lines_percent * image_size[-1])
-        mask = torch.zeros(image_size)
         center_line_indices = torch.linspace(
-            image_size[0] // 2 - num_lines_center // 2,
-            image_size[0] // 2 + num_lines_center // 2 + 1,
+            image_size[-1] // 2 - num_lines_center // 2,
+            image_size[-1] // 2 + num_lines_center // 2 + 1,
             steps=50,
             dtype=torch.long,
         )
-        mask[:, center_line_indices] = 1
-        random_line_indices = np.random.choice(
-            image_size[0], size=(num_lines_side // 2,), replace=False
+        return center_line_indices, num_lines_side // 2
+
+    def subsets(self, n_subsets):
+        r"""
+        Splits the sampled k-space lines (columns of the mask) into ``n_subsets`` interleaved subsets.
+
+        :param int n_subsets: number of subsets.
+        :return: (list) list of ``n_subsets`` index tensors.
+        """
+        lines = torch.nonzero(self.mask[:, 0].sum((0, 1)) > 0).flatten()
+        return [lines[k::n_subsets] for k in range(n_subsets)]
+
+    def measurement_subset(self, y, idx):
+        return self.U_adjoint(y)[..., idx]
+
+    def _line_dft(self, idx, dtype, device):
+        r"""
+        Rows ``idx`` of the centered orthonormal DFT matrix along the width of the images. The matrix of the last
+        indices is cached.
+        """
+        cached = self.dft_cache
+        if cached is not None and cached[0] is idx and cached[1].dtype == dtype:
+            if cached[1].device == torch.device(device):
+                return cached[1]
+        W = self.mask.shape[-1]
+        k = idx.to(device).view(-1, 1) - W // 2
+        w = torch.arange(W, device=device).view(1, -1) + (W + 1) // 2
+        phase = -2 * np.pi * ((k * w) % W).to(torch.float64) / W
+        dft = (torch.polar(torch.ones_like(phase), phase) / np.sqrt(W)).to(dtype)
+        self.dft_cache = (idx, dft)
+        return dft
+
+    def A_subset(self, x, idx):
+        r"""
+        Computes the k-space lines ``idx`` with a partial DFT along the width of the images, followed by 1D FFTs of
+        the lines along the height, which costs :math:`O(HW|\text{idx}| + |\text{idx}|H\log H)` instead of a full
+        2D FFT.
+        """
+        x = torch.complex(x[:, 0], x[:, 1])
+        x = x @ self._line_dft(idx, x.dtype, x.device).t()
+        x = torch.fft.ifftshift(x, dim=-2)
+        y = torch.fft.fftshift(torch.fft.fft(x, dim=-2, norm="ortho"), dim=-2)
+        return torch.stack([y.real, y.imag], dim=1) * self.mask[..., idx]
+
+    def A_adjoint_subset(self, y, idx):
+        y = y * self.mask[..., idx]
+        y = torch.complex(y[:, 0], y[:, 1])
+        y = torch.fft.ifftshift(y, dim=-2)
+        y = torch.fft.fftshift(torch.fft.ifft(y, dim=-2, norm="ortho"), dim=-2)
+        x = y @ self._line_dft(idx, y.dtype, y.device).conj()
+        return torch.stack([x.real, x.imag], dim=1)
+
+
+def _fft2c(x, inverse=False):
+    r"""
+    Centered orthonormal 2D (inverse) FFT of a complex tensor over its last two dimensions.
+    """
+    x = torch.fft.ifftshift(x, dim=(-2, -1))
+    x = torch.fft.ifft2(x, norm="ortho") if inverse else torch.fft.fft2(x, norm="ortho")
+    return torch.fft.fftshift(x, dim=(-2, -1))
+
+
+class MultiCoilMRI(LinearPhysics):
+    r"""
+    Multi-coil accelerated magnetic resonance imaging (SENSE model).
+
+    The linear operator is defined as
+
+    .. math::
+
+        y_c = SF(s_c \odot x), \quad c = 1, \dots, C
+
+    where :math:`s_c` is the sensitivity map of the coil :math:`c`, :math:`F` is the 2D discrete Fourier
+    transform and :math:`S` applies a mask (subsampling operator). The FFTs of all the coils are computed with a
+    single batched call, and the normal operator :math:`A^{\top}A x = \sum_c \overline{s_c} \odot F^{-1}
+    S^{\top}SF(s_c \odot x)` is computed without forming the real-valued measurements.
+
+    The complex images :math:`x` should be of size (B, 2, H, W), and the measurements :math:`y` are the masked
+    (zero-filled) k-spaces of the coils, of size (B, 2, C, H, W), where the first two channels correspond to the
+    real and imaginary parts. As this operator does not have a closed-form SVD, :meth:`prox_l2` is computed
+    with batched conjugate gradient iterations (see :meth:`deepinv.physics.LinearPhysics.prox_l2`).
+
+    The number of FFTs can be reduced with a coil compression: the maps are projected on the
+    ``n_virtual_coils`` principal components of the coils, computed with an SVD of the maps, so that
+    :math:`A` models the measurements of the virtual coils. Measurements of the physical coils can be projected
+    on the virtual coils with :meth:`compress_measurements`.
+
+    :param torch.Tensor coil_maps: complex sensitivity maps of size (C, H, W), or (B, C, H, W) for one set of maps
+        per sample. Real tensors of size (..., 2) are interpreted as complex tensors.
+    :param torch.Tensor mask: binary mask of size (H, W). If ``None``, the k-space is fully sampled.
+    :param int n_virtual_coils: number of virtual coils of the coil compression. If ``None``, the coils are not
+        compressed.
+    :param torch.device device: cpu or gpu.
+
+    |sep|
+
+    :Examples:
+
+        Multi-coil MRI operator with 4 coils and 2x acceleration:
+
+        >>> seed = torch.manual_seed(0) # Random seed for reproducibility
+        >>> maps = torch.randn(4, 8, 8, dtype=torch.complex64)
+        >>> mask = torch.ones(8, 8)
+        >>> mask[:, ::2] = 0
+        >>> physics = MultiCoilMRI(coil_maps=maps, mask=mask)
+        >>> x = torch.randn(1, 2, 8, 8) # Define random 8x8 complex image
+        >>> physics(x).shape
+        torch.Size([1, 2, 4, 8, 8])
+
+    """
+
+    def __init__(
+        self, coil_maps, mask=None, n_virtual_coils=None, device="cpu", **kwargs
+    ):
+        super().__init__(**kwargs)
+        self.device = device
+        self.n_virtual_coils = n_virtual_coils
+        self.update_parameters(coil_maps=coil_maps, mask=mask)
+
+    def update_parameters(self, coil_maps=None, mask=None, **kwargs):
+        r"""
+        Updates the sensitivity maps and/or the mask of the operator.
+
+        :param torch.Tensor coil_maps: new sensitivity maps of size (C, H, W) or (B, C, H, W), which are compressed
+            if ``n_virtual_coils`` is set.
+        :param torch.Tensor mask: new mask of size (H, W).
+        """
+        if coil_maps is not None:
+            if not coil_maps.is_complex():
+                coil_maps = torch.view_as_complex(coil_maps.contiguous())
+            coil_maps = coil_maps.to(self.device)
+            if coil_maps.dim() == 3:
+                coil_maps = coil_maps.unsqueeze(0)
+            self.compression = None
+            if self.n_virtual_coils is not None:
+                self.compression = coil_compression(coil_maps, self.n_virtual_coils)
+                coil_maps = torch.einsum("nck,nchw->nkhw", self.compression, coil_maps)
+            self.coil_maps = torch.nn.Parameter(coil_maps, requires_grad=False)
+        if mask is not None or not hasattr(self, "mask"):
+            if mask is None:
+                mask = torch.ones(self.coil_maps.shape[-2:])
+            self.mask = torch.nn.Parameter(mask.to(self.device), requires_grad=False)
+        super().update_parameters(**kwargs)
+
+    def compress_measurements(self, y):
+        r"""
+        Projects measurements of the physical coils on the virtual coils of the coil compression.
+
+        :param torch.Tensor y: measurements of size (B, 2, C, H, W), with C physical coils.
+        :return: (torch.Tensor) measurements of size (B, 2, K, H, W), with K virtual coils.
+        """
+        if self.compression is None:
+            return y
+        y = torch.einsum(
+            "nck,nchw->nkhw", self.compression, torch.complex(y[:, 0], y[:, 1])
         )
-        mask[:, random_line_indices] = 1
-        return mask.float().to(self.device)
+        return torch.stack([y.real, y.imag], dim=1)
+
+    def _coil_kspace(self, x):
+        x = torch.complex(x[:, 0], x[:, 1])
+        return _fft2c(self.coil_maps * x.unsqueeze(1)) * self.mask
+
+    def _coil_combine(self, k):
+        x = (self.coil_maps.conj() * _fft2c(k * self.mask, inverse=True)).sum(dim=1)
+        return torch.stack([x.real, x.imag], dim=1)
+
+    def A(self, x):
+        k = self._coil_kspace(x)
+        return torch.stack([k.real, k.imag], dim=1)
+
+    def A_adjoint(self, y):
+        return self._coil_combine(torch.complex(y[:, 0], y[:, 1]))
+
+    def A_adjoint_A(self, x):
+        r"""
+        Computes the normal operator :math:`A^{\top}Ax` with one batched FFT pair over the coils, combining the
+        coils without forming the real-valued measurements.
+
+        :param torch.Tensor x: signal/image.
+        :return: (torch.Tensor) :math:`A^{\top}Ax`.
+        """
+        return self._coil_combine(self._coil_kspace(x))
+
+    def noise(self, x):
+        r"""
+        Incorporates noise into the measurements :math:`\tilde{y} = N(y)`, the non-sampled coefficients of the
+        k-spaces remaining equal to zero.
+
+        :param torch.Tensor x:  clean measurements
+        :return torch.Tensor: noisy measurements
+        """
+        return self.noise_model(x) * self.mask
+
+    def preconditioner(self, gamma):
+        r"""
+        Diagonal preconditioner for the conjugate gradient iterations of :meth:`prox_l2`, which approximates the
+        mask by its sampling rate :math:`\rho`, i.e., :math:`A^{\top}A \approx \rho \sum_c |s_c|^2`.
+
+        :param float gamma: hyperparameter of the proximal operator.
+        :return: (callable) preconditioner.
+        """
+        rate = self.mask.mean()
+        weights = 1 / (rate * self.coil_maps.abs().pow(2).sum(dim=1) + 1 / gamma)
+        return lambda r: r * weights.unsqueeze(1)
+
+
+def coil_compression(coil_maps, n_virtual_coils):
+    r"""
+    Coil compression matrix projecting the coils on their ``n_virtual_coils`` principal components.
+
+    The components are the leading eigenvectors of the :math:`C \times C` Gram matrix of the sensitivity maps,
+    i.e. the leading left singular vectors of the maps reshaped as a :math:`C \times HW` matrix.
+
+    :param torch.Tensor coil_maps: complex sensitivity maps of size (B, C, H, W).
+    :param int n_virtual_coils: number of virtual coils K.
+    :return: (torch.Tensor) matrices :math:`\overline{U}` of size (B, C, K), such that the maps of the virtual
+        coils are ``torch.einsum("nck,nchw->nkhw", U, coil_maps)``.
+    """
+    maps = coil_maps.flatten(-2)
+    gram = maps @ maps.conj().transpose(-2, -1)
+    _, vectors = torch.linalg.eigh(gram)  # ascending eigenvalues
+    return vectors[..., -n_virtual_coils:].flip(-1).conj()
+
+
+class NonCartesianMRI(LinearPhysics):
+    r"""
+    Single-coil MRI with a non-Cartesian (e.g. radial or spiral) k-space trajectory.
+
+    The linear operator is the non-uniform discrete Fourier transform
+
+    .. math::
+
+        y_m = \frac{1}{\sqrt{HW}} \sum_{n} x_n e^{-i k_m^{\top} n}, \quad m = 1, \dots, M
+
+    where :math:`k_m` are the frequencies of the samples and :math:`n` the centered pixel coordinates. It is
+    computed with a NUFFT :math:`A = PFZD`, where :math:`D` are the deapodization weights, :math:`Z`
+    zero-pads the image on a grid oversampled by a factor ``oversampling``, :math:`F` is the 2D FFT, and
+    :math:`P` is a sparse Kaiser-Bessel interpolation matrix from the grid to the trajectory (see
+    :meth:`deepinv.physics.nufft.interpolation_matrix`). The matrix is assembled once per trajectory, cached on
+    disk and memory-mapped when the same operator is created again, and the adjoint
+    :math:`A^{\top} = DZ^{\top}F^{-1}P^{\top}` is exact.
+
+    The normal operator :math:`A^{\top}A` is a convolution, which is computed through a Toeplitz embedding with
+    one FFT pair on a grid of size (2H, 2W), so that the iterations of :meth:`prox_l2` (or of any gradient-based
+    algorithm using :meth:`A_adjoint_A`) never interpolate the trajectory. Its kernel is computed at the first
+    call.
+
+    The density compensation weights of the trajectory (see
+    :meth:`deepinv.physics.nufft.density_compensation`) are stored in the attribute ``dcf``, and are used by the
+    gridding reconstruction :meth:`gridding`.
+
+    The complex images :math:`x` should be of size (B, 2, H, W) and the measurements :math:`y` are of size
+    (B, 2, M), where the first channel corresponds to the real part and the second channel corresponds to the
+    imaginary part.
+
+    :param torch.Tensor trajectory: frequencies of the samples of size (M, 2), in radians in
+        :math:`[-\pi, \pi)`, the first column corresponding to the height axis of the images (see e.g.
+        :meth:`deepinv.physics.nufft.radial_trajectory`).
+    :param tuple[int] img_size: size (H, W) of the images.
+    :param float oversampling: oversampling ratio of the grid of the NUFFT.
+    :param int kernel_width: width of the Kaiser-Bessel interpolation kernel, in grid points.
+    :param int dcf_iterations: number of iterations of the computation of the density compensation weights.
+    :param str cache_dir: directory where the interpolation matrices are cached. If ``None``, uses
+        :meth:`deepinv.utils.get_cache_dir`.
+    :param torch.device device: cpu or gpu.
+    :param torch.dtype dtype: data type of the operator.
+
+    |sep|
+
+    :Examples:
+
+        Radial MRI operator with 8 spokes of 16 samples for 8x8 images:
+
+        >>> from deepinv.physics.nufft import radial_trajectory
+        >>> seed = torch.manual_seed(0) # Random seed for reproducibility
+        >>> physics = NonCartesianMRI(radial_trajectory(8, 16), img_size=(8, 8))
+        >>> x = torch.randn(1, 2, 8, 8) # Define random 8x8 complex image
+        >>> physics(x).shape
+        torch.Size([1, 2, 128])
+
+    """
+
+    def __init__(
+        self,
+        trajectory,
+        img_size,
+        oversampling=2.0,
+        kernel_width=6,
+        dcf_iterations=10,
+        cache_dir=None,
+        device="cpu",
+        dtype=torch.float,
+        **kwargs,
+    ):
+        super().__init__(**kwargs)
+        self.trajectory = trajectory.to(device)
+        self.img_size = tuple(img_size)
+        self.grid_size = oversampled_grid_size(self.img_size, oversampling)
+        self.oversampling = oversampling
+        self.kernel_width = kernel_width
+        self.cache_dir = cache_dir
+        self.device = device
+        self.dtype = dtype
+
+        matrix, transpose = _load_interpolation_matrix(
+            trajectory, self.grid_size, kernel_width, oversampling, dtype, cache_dir
+        )
+        self._matrix = matrix.to(device)
+        self._matrix_t = transpose.to(device)
+        self._deapod = deapodization(
+            self.img_size, self.grid_size, kernel_width, oversampling, dtype
+        ).to(device)
+        self.dcf = density_compensation(
+            self._matrix, self._matrix_t, math.prod(self.img_size), dcf_iterations
+        )
+        self.toeplitz_kernel = None
+
+    def A(self, x):
+        B = x.shape[0]
+        H, W = self.img_size
+        Kh, Kw = self.grid_size
+        x = torch.complex(x[:, 0], x[:, 1]) * self._deapod
+        grid = x.new_zeros((B, Kh, Kw))
+        oh, ow = Kh // 2 - H // 2, Kw // 2 - W // 2
+        grid[:, oh : oh + H, ow : ow + W] = x
+        grid = torch.view_as_real(_fft2c(grid))  # (B, Kh, Kw, 2)
+        y = self._matrix @ grid.permute(1, 2, 0, 3).reshape(Kh * Kw, 2 * B)
+        return y.reshape(-1, B, 2).permute(1, 2, 0)
+
+    def A_adjoint(self, y):
+        B = y.shape[0]
+        H, W = self.img_size
+        Kh, Kw = self.grid_size
+        grid = self._matrix_t @ y.permute(2, 0, 1).reshape(-1, 2 * B)
+        grid = grid.reshape(Kh, Kw, B, 2).permute(2, 0, 1, 3).contiguous()
+        grid = _fft2c(torch.view_as_complex(grid), inverse=True)
+        oh, ow = Kh // 2 - H // 2, Kw // 2 - W // 2
+        x = grid[:, oh : oh + H, ow : ow + W] * self._deapod
+        return torch.stack([x.real, x.imag], dim=1)
+
+    def gridding(self, y):
+        r"""
+        Gridding reconstruction :math:`A^{\top}(w \odot y)`, where :math:`w` are the density compensation weights
+        ``dcf`` of the trajectory.
+
+        :param torch.Tensor y: measurements of size (B, 2, M).
+        :return: (torch.Tensor) reconstructed image of size (B, 2, H, W).
+        """
+        return self.A_adjoint(y * self.dcf)
+
+    def compute_toeplitz_kernel(self):
+        r"""
+        Computes the spectrum of the circulant embedding of the normal operator on a grid of size (2H, 2W).
+
+        The kernel of the convolution is :math:`t_d = \frac{1}{HW}\sum_m e^{i k_m^{\top} d}` for
+        :math:`d \in [-H, H) \times [-W, W)`, which is computed with the adjoint NUFFT of a vector of ones for
+        images of size (2H, 2W), and symmetrized so that the normal operator is exactly self-adjoint.
+
+        :return: (torch.Tensor) complex spectrum of size (2H, 2W).
+        """
+        H, W = self.img_size
+        op = NonCartesianMRI(
+            self.trajectory,
+            (2 * H, 2 * W),
+            oversampling=self.oversampling,
+            kernel_width=self.kernel_width,
+            dcf_iterations=0,
+            cache_dir=self.cache_dir,
+            device=self.device,
+            dtype=self.dtype,
+        )
+        ones = torch.zeros(
+            (1, 2, self.trajectory.shape[0]), dtype=self.dtype, device=self.device
+        )
+        ones[:, 0] = 1
+        t = op.A_adjoint(ones)[0]
+        t = torch.complex(t[0], t[1]) * (2 / math.sqrt(H * W))
+        t_reversed = torch.roll(t.flip(-2, -1), shifts=(1, 1), dims=(-2, -1))
+        t = (t + t_reversed.conj()) / 2
+        return torch.fft.fft2(torch.fft.ifftshift(t, dim=(-2, -1)))
+
+    def A_adjoint_A(self, x):
+        r"""
+        Computes the normal operator :math:`A^{\top}Ax` through its Toeplitz embedding, with one FFT pair on a
+        grid of size (2H, 2W).
+
+        :param torch.Tensor x: signal/image.
+        :return: (torch.Tensor) :math:`A^{\top}Ax`.
+        """
+        if self.toeplitz_kernel is None:
+            self.toeplitz_kernel = self.compute_toeplitz_kernel()
+        H, W = self.img_size
+        x = torch.fft.fft2(torch.complex(x[:, 0], x[:, 1]), s=(2 * H, 2 * W))
+        x = torch.fft.ifft2(x * self.toeplitz_kernel)[:, :H, :W]
+        return torch.stack([x.real, x.imag], dim=1)
 
 
 #
@@ -154,13 +717,10 @@ def fft2c_new(data: torch.Tensor, norm: str = "ortho") -> torch.Tensor:
     if not data.shape[-1] == 2:
         raise ValueError("Tensor does not have separate complex dim.")
 
-    data = ifftshift(data, dim=[-3, -2])
-    data = torch.view_as_real(
-        torch.fft.fftn(  # type: ignore
-            torch.view_as_complex(data), dim=(-2, -1), norm=norm
-        )
-    )
-    data = fftshift(data, dim=[-3, -2])
+    data = torch.view_as_complex(data.contiguous())
+    data = torch.fft.ifftshift(data, dim=(-2, -1))
+    data = torch.fft.fftn(data, dim=(-2, -1), norm=norm)
+    data = torch.view_as_real(torch.fft.fftshift(data, dim=(-2, -1)))
 
     return data
 
@@ -179,13 +739,10 @@ def ifft2c_new(data: torch.Tensor, norm: str = "ortho") -> torch.Tensor:
     if not data.shape[-1] == 2:
         raise ValueError("Tensor does not have separate complex dim.")
 
-    data = ifftshift(data, dim=[-3, -2])
-    data = torch.view_as_real(
-        torch.fft.ifftn(  # type: ignore
-            torch.view_as_complex(data), dim=(-2, -1), norm=norm
-        )
-    )
-    data = fftshift(data, dim=[-3, -2])
+    data = torch.view_as_complex(data.contiguous())
+    data = torch.fft.ifftshift(data, dim=(-2, -1))
+    data = torch.fft.ifftn(data, dim=(-2, -1), norm=norm)
+    data = torch.view_as_real(torch.fft.fftshift(data, dim=(-2, -1)))
 
     return data
 
@@ -1,6 +1,16 @@
 import torch
 
 
+def _batch_view(param, x):
+    r"""
+    Reshapes a parameter with one value per sample, i.e. of size (B,), so that it broadcasts with a batch of
+    measurements ``x`` of size (B, ...). Other parameters are returned unchanged.
+    """
+    if isinstance(param, torch.Tensor) and param.dim() == 1:
+        return param.view((-1,) + (1,) * (x.dim() - 1))
+    return param
+
+
 class GaussianNoise(torch.nn.Module):
     r"""
 
@@ -20,7 +30,8 @@ class GaussianNoise(torch.nn.Module):
         >>> x = torch.rand(1, 1, 2, 2)
         >>> y = physics(x)
 
-    :param float sigma: Standard deviation of the noise.
+    :param float, torch.Tensor sigma: Standard deviation of the noise. A tensor of size (B,) applies a different
+        standard deviation to each sample of a batch of size B.
 
     """
 
@@ -35,7 +46,7 @@ class GaussianNoise(torch.nn.Module):
         :param torch.Tensor x: measurements
         :returns: noisy measurements
         """
-        return x + torch.randn_like(x) * self.sigma
+        return x + torch.randn_like(x) * _batch_view(self.sigma, x)
 
 
 class UniformGaussianNoise(torch.nn.Module):
@@ -87,7 +98,7 @@ class UniformGaussianNoise(torch.nn.Module):
                 + self.sigma_min
             )
             self.sigma = sigma.to(x.device)
-        noise = torch.randn_like(x) * self.sigma
+        noise = torch.randn_like(x) * _batch_view(self.sigma, x)
         return x + noise
 
 
@@ -0,0 +1,188 @@
+import math
+import os
+import torch
+from deepinv.utils.cache import get_cache_dir, hash_args, load_or_build_sparse
+
+
+def kaiser_bessel_beta(width, oversampling):
+    r"""
+    Shape parameter :math:`\beta` of the Kaiser-Bessel interpolation kernel of the NUFFT, which minimizes the
+    aliasing error for a given kernel width :math:`J` and oversampling ratio :math:`\alpha` (Beatty et al., 2005):
+
+    .. math::
+
+        \beta = \pi \sqrt{\frac{J^2}{\alpha^2}\left(\alpha - \frac{1}{2}\right)^2 - 0.8}.
+
+    :param int width: width of the kernel, in grid points.
+    :param float oversampling: oversampling ratio of the grid.
+    :return: (float) shape parameter.
+    """
+    return math.pi * math.sqrt(
+        max(width**2 / oversampling**2 * (oversampling - 0.5) ** 2 - 0.8, 0.0)
+    )
+
+
+def oversampled_grid_size(img_size, oversampling):
+    r"""
+    Even size of the oversampled grid of the NUFFT.
+
+    :param tuple[int] img_size: size (H, W) of the images.
+    :param float oversampling: oversampling ratio of the grid.
+    :return: (tuple) size (K_h, K_w) of the grid.
+    """
+    return tuple(2 * math.ceil(oversampling * n / 2) for n in img_size)
+
+
+def radial_trajectory(n_spokes, n_samples, golden_angle=False):
+    r"""
+    Radial k-space trajectory, whose spokes cross the center of the k-space.
+
+    :param int n_spokes: number of spokes.
+    :param int n_samples: number of samples per spoke.
+    :param bool golden_angle: if ``True``, consecutive spokes are separated by the golden angle
+        :math:`111.25^{\circ}`, otherwise the spokes are uniformly distributed in :math:`[0, \pi)`.
+    :return: (torch.Tensor) frequencies of size (n_spokes * n_samples, 2), in radians in :math:`[-\pi, \pi)`.
+    """
+    if golden_angle:
+        angles = torch.arange(n_spokes, dtype=torch.float64) * (
+            math.pi * (math.sqrt(5) - 1) / 2
+        )
+    else:
+        angles = torch.arange(n_spokes, dtype=torch.float64) * (math.pi / n_spokes)
+    radius = (torch.arange(n_samples, dtype=torch.float64) - n_samples // 2) * (
+        2 * math.pi / n_samples
+    )
+    kh = radius.view(1, -1) * torch.sin(angles).view(-1, 1)
+    kw = radius.view(1, -1) * torch.cos(angles).view(-1, 1)
+    return torch.stack([kh, kw], dim=-1).reshape(-1, 2).float()
+
+
+def _kaiser_bessel(s, width, beta):
+    r"""
+    Kaiser-Bessel kernel :math:`\phi(s) = I_0(\beta\sqrt{1 - (2s/J)^2})` evaluated at the distances ``s``.
+    """
+    return torch.special.i0(beta * torch.sqrt((1 - (2 * s / width) ** 2).clamp(min=0)))
+
+
+def deapodization(img_size, grid_size, width, oversampling, dtype=torch.float):
+    r"""
+    Deapodization weights of the NUFFT, i.e., the inverse of the Fourier transform of the Kaiser-Bessel kernel
+    evaluated at the (centered) pixels of the image,
+
+    .. math::
+
+        \hat{\phi}(n) = J\frac{\sinh(z)}{z}, \quad z = \sqrt{\beta^2 - (\pi J n / K)^2},
+
+    scaled by :math:`\sqrt{K_hK_w / (HW)}` so that the NUFFT approximates the orthonormal DFT.
+
+    :param tuple[int] img_size: size (H, W) of the images.
+    :param tuple[int] grid_size: size (K_h, K_w) of the oversampled grid.
+    :param int width: width of the kernel.
+    :param float oversampling: oversampling ratio used to choose the shape parameter of the kernel.
+    :param torch.dtype dtype: data type of the weights.
+    :return: (torch.Tensor) weights of size (H, W).
+    """
+    beta = kaiser_bessel_beta(width, oversampling)
+    factors = []
+    for n, k in zip(img_size, grid_size):
+        freq = (torch.arange(n, dtype=torch.float64) - n // 2) * (math.pi * width / k)
+        z = torch.sqrt((beta**2 - freq**2).to(torch.complex128))
+        factors.append(1 / (width * torch.sinh(z) / z).real)
+    scale = math.sqrt(grid_size[0] * grid_size[1] / (img_size[0] * img_size[1]))
+    return (scale * factors[0].view(-1, 1) * factors[1].view(1, -1)).to(dtype)
+
+
+def interpolation_matrix(
+    trajectory, grid_size, width=6, oversampling=2.0, dtype=torch.float
+):
+    r"""
+    Assembles the Kaiser-Bessel interpolation of the NUFFT as a sparse matrix, which maps the (centered)
+    oversampled k-space grid to the non-Cartesian samples of the trajectory.
+
+    Each sample is interpolated from the :math:`J \times J` closest grid points, with the separable kernel
+    :math:`\phi(\kappa_h - u_h)\phi(\kappa_w - u_w)`, where :math:`\kappa = kK/(2\pi)` is the position of the
+    sample on the grid. The grid is periodic, so that the samples close to the edges of the k-space wrap around.
+
+    :param torch.Tensor trajectory: frequencies of the samples of size (M, 2), in radians in
+        :math:`[-\pi, \pi)`, the first column corresponding to the height axis of the images.
+    :param tuple[int] grid_size: size (K_h, K_w) of the oversampled grid.
+    :param int width: width :math:`J` of the kernel.
+    :param float oversampling: oversampling ratio used to choose the shape parameter of the kernel.
+    :param torch.dtype dtype: data type of the matrix entries.
+    :return: (tuple) the matrix and its transpose, as sparse CSR tensors of sizes ``(M, K_h * K_w)`` and
+        ``(K_h * K_w, M)``.
+    """
+    beta = kaiser_bessel_beta(width, oversampling)
+    traj = trajectory.detach().cpu().to(torch.float64)
+    n_rows, n_cols = traj.shape[0], grid_size[0] * grid_size[1]
+    K = torch.tensor(grid_size, dtype=torch.float64).view(1, 2, 1)
+
+    kappa = (traj * K.view(1, 2) / (2 * math.pi)).unsqueeze(-1)  # (M, 2, 1)
+    u = torch.ceil(kappa - width / 2) + torch.arange(width, dtype=torch.float64)
+    weights = _kaiser_bessel(kappa - u, width, beta)  # (M, 2, J)
+    index = torch.remainder(u + K // 2, K).long()
+
+    rows = torch.arange(n_rows).view(-1, 1, 1).expand(-1, width, width)
+    cols = index[:, 0, :, None] * grid_size[1] + index[:, 1, None, :]
+    vals = weights[:, 0, :, None] * weights[:, 1, None, :]
+
+    matrix = torch.sparse_coo_tensor(
+        torch.stack([rows.reshape(-1), cols.reshape(-1)]),
+        vals.reshape(-1).to(dtype),
+        size=(n_rows, n_cols),
+    ).coalesce()
+    transpose = torch.sparse_coo_tensor(
+        matrix.indices().flip(0), matrix.values(), size=(n_cols, n_rows)
+    ).coalesce()
+    return matrix.to_sparse_csr(), transpose.to_sparse_csr()
+
+
+def _load_interpolation_matrix(
+    trajectory, grid_size, width, oversampling, dtype, cache_dir=None
+):
+    r"""
+    Loads the sparse interpolation matrix from the disk cache (memory-mapped), or assembles it and saves it.
+    """
+    if cache_dir is None:
+        cache_dir = get_cache_dir("nufft")
+    else:
+        os.makedirs(cache_dir, exist_ok=True)
+    key = hash_args(trajectory.detach().cpu(), grid_size, width, oversampling, dtype)
+    path = os.path.join(
+        cache_dir,
+        f"nufft_k{grid_size[0]}x{grid_size[1]}_m{trajectory.shape[0]}_{key}.pt",
+    )
+    return load_or_build_sparse(
+        path,
+        lambda: interpolation_matrix(
+            trajectory, grid_size, width=width, oversampling=oversampling, dtype=dtype
+        ),
+    )
+
+
+def density_compensation(matrix, transpose, n_pixels, n_iter=10):
+    r"""
+    Density compensation weights of a non-Cartesian trajectory, computed with the fixed-point iterations of
+    Pipe and Menon (1999)
+
+    .. math::
+
+        w \leftarrow \frac{w}{P P^{\top} w},
+
+    where :math:`P` is the interpolation matrix of the NUFFT (see
+    :meth:`deepinv.physics.nufft.interpolation_matrix`). The weights are normalized so that they sum to the
+    number of pixels, i.e., the point spread function of the density-compensated adjoint has a unit peak.
+
+    :param torch.Tensor matrix: sparse interpolation matrix of size (M, K).
+    :param torch.Tensor transpose: its transpose, of size (K, M).
+    :param int n_pixels: number of pixels of the images.
+    :param int n_iter: number of iterations.
+    :return: (torch.Tensor) weights of size (M,).
+    """
+    w = torch.ones(
+        matrix.shape[0], 1, dtype=matrix.values().dtype, device=matrix.device
+    )
+    for _ in range(n_iter):
+        w = w / (matrix @ (transpose @ w)).clamp(min=torch.finfo(w.dtype).tiny)
+    w = w.view(-1)
+    return w * (n_pixels / w.sum())
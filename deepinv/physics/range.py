@@ -38,6 +38,22 @@ class Decolorize(DecomposablePhysics):
     def V(self, y):
         return torch.cat([y * 0.2989, y * 0.5870, y * 0.1140], dim=1)
 
+    def compute_norm(
+        self, x0, max_iter=100, tol=1e-3, verbose=True, per_sample=False, use_cache=True
+    ):
+        r"""
+        Computes the spectral norm of :math:`A^{\top}A` in closed form, i.e., the squared norm of the weights of the
+        channels, as the transformation :math:`V` is not orthonormal.
+
+        :param torch.Tensor x0: input of the operator.
+        :param bool per_sample: if ``True``, returns the norm of each sample of the batch.
+        :returns z: (torch.Tensor) spectral norm of :math:`A^{\top}A`, of size (B,) if ``per_sample=True``.
+        """
+        z = torch.tensor(
+            0.2989**2 + 0.5870**2 + 0.1140**2, device=x0.device, dtype=x0.dtype
+        )
+        return z.expand(x0.shape[0]) if per_sample else z
+
 
 # # test code
 # if __name__ == "__main__":
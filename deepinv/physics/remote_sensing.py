@@ -4,7 +4,7 @@ from deepinv.physics.noise import GaussianNoise
 from deepinv.physics.forward import LinearPhysics
 from deepinv.physics.blur import Downsampling
 from deepinv.physics.range import Decolorize
-from deepinv.utils import TensorList
+from deepinv.utils import PackedTensorList
 
 
 class Pansharpen(LinearPhysics):
@@ -12,8 +12,8 @@ class Pansharpen(LinearPhysics):
     Pansharpening forward operator.
 
     The measurements consist of a high resolution grayscale image and a low resolution RGB image, and
-    are represented using :class:`deepinv.utils.TensorList`, where the first element is the RGB image and the second
-    element is the grayscale image.
+    are represented using :class:`deepinv.utils.PackedTensorList`, where the first element is the RGB image and the
+    second element is the grayscale image, which are stored in a single buffer.
 
     By default, the downsampling is done with a gaussian filter with standard deviation equal to the downsampling,
     however, the user can provide a custom downsampling filter.
@@ -74,13 +74,16 @@ class Pansharpen(LinearPhysics):
         self.colorize = Decolorize()
 
     def A(self, x):
-        return TensorList([self.downsampling.A(x), self.colorize.A(x)])
+        return PackedTensorList([self.downsampling.A(x), self.colorize.A(x)])
 
     def A_adjoint(self, y):
         return self.downsampling.A_adjoint(y[0]) + self.colorize.A_adjoint(y[1])
 
+    def A_adjoint_A(self, x):
+        return self.downsampling.A_adjoint_A(x) + self.colorize.A_adjoint_A(x)
+
     def forward(self, x):
-        return TensorList(
+        return PackedTensorList(
             [self.noise_color(self.downsampling(x)), self.noise_gray(self.colorize(x))]
         )
 
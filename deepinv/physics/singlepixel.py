@@ -1,36 +1,20 @@
 from deepinv.physics.forward import DecomposablePhysics
+from deepinv.physics.structured_random import (
+    fwht,
+    hadamard_1d,
+    structured_transform,
+    get_permutation_list,
+)
 import torch
 import numpy as np
 
 
-def hadamard_1d(u, normalize=True):
-    """
-    Multiply H_n @ u where H_n is the Hadamard matrix of dimension n x n.
-    n must be a power of 2.
-
-    Parameters:
-        u: Tensor of shape (..., n)
-        normalize: if True, divide the result by 2^{m/2} where m = log_2(n).
-    Returns:
-        product: Tensor of shape (..., n)
-    """
-    n = u.shape[-1]
-    m = int(np.log2(n))
-    assert n == 1 << m, "n must be a power of 2"
-    x = u[..., np.newaxis]
-    for d in range(m)[::-1]:
-        x = torch.cat(
-            (x[..., ::2, :] + x[..., 1::2, :], x[..., ::2, :] - x[..., 1::2, :]), dim=-1
-        )
-    return x.squeeze(-2) / 2 ** (m / 2) if normalize else x.squeeze(-2)
-
-
 def hadamard_2d(x):
     """
-    Computes 2 dimensional Hadamard transform using 1 dimensional transform.
+    Computes 2 dimensional Hadamard transform along the last two dimensions, without transposition
+    (see :meth:`deepinv.physics.structured_random.fwht`).
     """
-    out = hadamard_1d(hadamard_1d(x).transpose(-1, -2)).transpose(-1, -2)
-    return out
+    return fwht(x, dims=(-2, -1))
 
 
 class SinglePixelCamera(DecomposablePhysics):
@@ -52,6 +36,12 @@ class SinglePixelCamera(DecomposablePhysics):
     It is recommended to use ``fast=True`` for image sizes bigger than 32 x 32, since the forward computation with
     ``fast=False`` has an :math:`O(mn)` complexity, whereas with ``fast=True`` it has an :math:`O(n \log n)` complexity.
 
+    If ``transform`` is not ``None``, the patterns are instead the rows of a subsampled structured random matrix
+    :math:`\text{diag}(m)T\text{diag}(s)` (as in :class:`deepinv.physics.CompressedSensing` with ``fast=True``),
+    where :math:`s\in\{-1,1\}^{n}` is a random sign flip, :math:`T` is a fast orthogonal transform of the
+    :math:`n = HW` pixels (see :meth:`deepinv.physics.structured_random.structured_transform`), and :math:`m` random
+    rows are kept. With ``transform='hadamard'``, the patterns are binary.
+
     An existing operator can be loaded from a saved ``.pth`` file via ``self.load_state_dict(save_path)``,
     in a similar fashion to :meth:`torch.nn.Module`.
 
@@ -59,6 +49,8 @@ class SinglePixelCamera(DecomposablePhysics):
     :param tuple img_shape: shape (C, H, W) of images.
     :param bool fast: The operator is iid binary if false, otherwise A is a 2D subsampled hadamard transform.
     :param str device: Device to store the forward matrix.
+    :param str transform: if not ``None``, fast orthogonal transform of the structured random operator, among
+        ``'hadamard'``, ``'dct'``, ``'dct4'`` and ``'dst1'``. It overrides ``fast``.
 
     |sep|
 
@@ -79,15 +71,33 @@ class SinglePixelCamera(DecomposablePhysics):
     """
 
     def __init__(
-        self, m, img_shape, fast=True, device="cpu", dtype=torch.float32, **kwargs
+        self,
+        m,
+        img_shape,
+        fast=True,
+        device="cpu",
+        dtype=torch.float32,
+        transform=None,
+        **kwargs,
     ):
         super().__init__(**kwargs)
         self.name = f"spcamera_m{m}"
         self.img_shape = img_shape
         self.fast = fast
         self.device = device
+        self.transform = transform
 
-        if self.fast:
+        if self.transform is not None:
+            C, H, W = img_shape
+            D = torch.ones((1, 1, H, W), device=device)
+            D[torch.rand_like(D) > 0.5] = -1.0
+            idx = torch.randperm(H * W, device=device)[:m]
+            mask = torch.zeros((1, C, H * W), device=device)
+            mask[:, :, idx] = 1
+            self.D = torch.nn.Parameter(D, requires_grad=False)
+            self.mask = torch.nn.Parameter(mask.view(1, C, H, W), requires_grad=False)
+
+        elif self.fast:
             C, H, W = img_shape
             mi = min(int(np.sqrt(m)), H)
             mj = min(m - mi, W)
@@ -122,7 +132,10 @@ class SinglePixelCamera(DecomposablePhysics):
             self.mask = torch.nn.Parameter(self.mask, requires_grad=False)
 
     def V_adjoint(self, x):
-        if self.fast:
+        if self.transform is not None:
+            z = (x * self.D).reshape(x.shape[0], x.shape[1], -1)
+            y = structured_transform(z, self.transform).reshape(x.shape)
+        elif self.fast:
             y = hadamard_2d(x)
         else:
             N, C = x.shape[0], self.img_shape[0]
@@ -131,7 +144,11 @@ class SinglePixelCamera(DecomposablePhysics):
         return y
 
     def V(self, y):
-        if self.fast:
+        if self.transform is not None:
+            z = y.reshape(y.shape[0], y.shape[1], -1)
+            x = structured_transform(z, self.transform, adjoint=True).reshape(y.shape)
+            x = x * self.D
+        elif self.fast:
             x = hadamard_2d(y)
         else:
             N = y.shape[0]
@@ -141,44 +158,20 @@ class SinglePixelCamera(DecomposablePhysics):
         return x
 
     def U_adjoint(self, x):
-        if self.fast:
+        if self.fast or self.transform is not None:
             out = x
         else:
             out = torch.einsum("ijk, km->ijm", x, self.u)
         return out
 
     def U(self, x):
-        if self.fast:
+        if self.fast or self.transform is not None:
             out = x
         else:
             out = torch.einsum("ijk, mk->ijm", x, self.u)
         return out
 
 
-def gray_decode(n):
-    m = n >> 1
-    while m:
-        n ^= m
-        m >>= 1
-    return n
-
-
-def reverse(n, numbits):
-    return sum(1 << (numbits - 1 - i) for i in range(numbits) if n >> i & 1)
-
-
-def get_permutation_list(n):
-    rev = np.zeros((n), dtype=int)
-    for l in range(n):
-        rev[l] = reverse(l, np.log2(n).astype(int))
-
-    rev2 = np.zeros_like(rev)
-    for l in range(n):
-        rev2[l] = rev[gray_decode(l)]
-
-    return rev2
-
-
 # test code
 # if __name__ == "__main__":
 #     import matplotlib.pyplot as plt
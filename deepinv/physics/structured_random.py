@@ -0,0 +1,242 @@
+import math
+from functools import lru_cache
+import torch
+import numpy as np
+
+
+def fwht(x, dims=-1, normalize=True, sequency=False):
+    r"""
+    Fast Walsh-Hadamard transform along one or several dimensions of a tensor.
+
+    Each butterfly stage reads from one buffer and writes into the other through reshaped views, so that the
+    transform only allocates two tensors of the size of ``x``, whatever the number of stages and dimensions, and
+    multi-dimensional transforms do not need any transposition. If autograd is required, the stages are
+    computed out-of-place instead.
+
+    :param torch.Tensor x: input tensor, whose sizes along ``dims`` must be powers of 2.
+    :param int, tuple[int] dims: dimension(s) along which the transform is computed.
+    :param bool normalize: if ``True``, the transform is orthonormal, i.e., the result is divided by
+        :math:`\sqrt{n}` for each dimension of size :math:`n`.
+    :param bool sequency: if ``True``, the coefficients are returned in sequency order (i.e., by increasing number
+        of sign changes of the Walsh functions, see :meth:`deepinv.physics.structured_random.get_permutation_list`),
+        otherwise in natural (Hadamard) order.
+    :return: (torch.Tensor) transformed tensor.
+    """
+    if isinstance(dims, int):
+        dims = (dims,)
+    inplace = not (torch.is_grad_enabled() and x.requires_grad)
+    a = x.clone(memory_format=torch.contiguous_format)
+    b = torch.empty_like(a) if inplace else None
+    scale = 1.0
+    for d in dims:
+        d = d % a.dim()
+        n = a.shape[d]
+        assert n == 1 << int(np.log2(n)), "n must be a power of 2"
+        P, Q = int(np.prod(a.shape[:d])), int(np.prod(a.shape[d + 1 :]))
+        h = 1
+        while h < n:
+            shape = (P, n // (2 * h), 2, h, Q)
+            av = a.view(shape)
+            if inplace:
+                bv = b.view(shape)
+                torch.add(av[:, :, 0], av[:, :, 1], out=bv[:, :, 0])
+                torch.sub(av[:, :, 0], av[:, :, 1], out=bv[:, :, 1])
+                a, b = b, a
+            else:
+                u, v = av[:, :, 0], av[:, :, 1]
+                a = torch.stack((u + v, u - v), dim=2).view(x.shape)
+            h *= 2
+        if sequency:
+            a = a.index_select(d, _sequency_permutation(n, a.device))
+        scale = scale / np.sqrt(n)
+
+    if normalize:
+        a = a.mul_(scale) if inplace else a * scale
+    return a
+
+
+def hadamard_1d(u, normalize=True):
+    """
+    Multiply H_n @ u where H_n is the Hadamard matrix of dimension n x n.
+    n must be a power of 2.
+
+    Parameters:
+        u: Tensor of shape (..., n)
+        normalize: if True, divide the result by 2^{m/2} where m = log_2(n).
+    Returns:
+        product: Tensor of shape (..., n)
+    """
+    return fwht(u, dims=-1, normalize=normalize)
+
+
+def gray_decode(n):
+    m = n >> 1
+    while m:
+        n ^= m
+        m >>= 1
+    return n
+
+
+def reverse(n, numbits):
+    return sum(1 << (numbits - 1 - i) for i in range(numbits) if n >> i & 1)
+
+
+def get_permutation_list(n):
+    rev = np.zeros((n), dtype=int)
+    for l in range(n):
+        rev[l] = reverse(l, np.log2(n).astype(int))
+
+    rev2 = np.zeros_like(rev)
+    for l in range(n):
+        rev2[l] = rev[gray_decode(l)]
+
+    return rev2
+
+
+@lru_cache(maxsize=None)
+def _sequency_permutation(n, device):
+    r"""
+    Indices of the Hadamard coefficients in sequency order, as a (cached) tensor.
+    """
+    return torch.from_numpy(get_permutation_list(n)).to(device)
+
+
+def _twiddle(n, k, dtype, device):
+    r"""
+    Cosine and sine of the angles :math:`\pi k / (2n)`.
+    """
+    theta = torch.arange(k, device=device, dtype=dtype) * (math.pi / (2 * n))
+    return torch.cos(theta), torch.sin(theta)
+
+
+def dst1(x):
+    r"""
+    Orthogonal Discrete Sine Transform, Type I
+    The transform is performed across the last dimension of the input signal
+    Due to orthogonality we have ``dst1(dst1(x)) = x``.
+
+    The transform of a signal of size :math:`n` is computed with a single real FFT of size :math:`n+1`, without
+    the odd extension of the signal to size :math:`2n+2` (Numerical Recipes, Section 12.3).
+
+    :param torch.tensor x: the input signal
+    :return: (torch.tensor) the DST-I of the signal over the last dimension
+
+    """
+    n = x.shape[-1]
+    N = n + 1
+    f = torch.nn.functional.pad(x, (1, 0))  # f_0 = 0
+    f_rev = torch.cat([f[..., :1], f[..., 1:].flip(-1)], dim=-1)  # f_{N-j}
+    s = torch.sin(torch.arange(N, device=x.device, dtype=x.dtype) * (math.pi / N))
+    Y = torch.fft.rfft(s * (f + f_rev) + 0.5 * (f - f_rev))
+
+    # F_{2k} = -Im(Y_k) and F_{2k+1} = F_{2k-1} + Re(Y_k) with F_1 = Re(Y_0) / 2
+    odd = torch.cumsum(Y.real, dim=-1) - 0.5 * Y.real[..., :1]
+    even = -Y.imag
+    out = torch.empty_like(x)
+    out[..., 0::2] = odd[..., : (n + 1) // 2]
+    out[..., 1::2] = even[..., 1 : n // 2 + 1]
+    return out * math.sqrt(2 / N)
+
+
+def dct2(x):
+    r"""
+    Orthogonal Discrete Cosine Transform, Type II, across the last dimension of the input signal.
+
+    The transform is computed with a real FFT of the same size as the signal (Makhoul, 1980), without padding.
+    Its inverse (and adjoint) is :meth:`deepinv.physics.structured_random.idct2`.
+
+    :param torch.tensor x: the input signal
+    :return: (torch.tensor) the DCT-II of the signal over the last dimension
+    """
+    n = x.shape[-1]
+    v = torch.cat([x[..., 0::2], x[..., 1::2].flip(-1)], dim=-1)
+    R = torch.fft.rfft(v)
+    c, s = _twiddle(n, R.shape[-1], x.dtype, x.device)
+    re = R.real * c + R.imag * s
+    im = R.imag * c - R.real * s
+    out = torch.cat([re, -im[..., 1 : n - n // 2].flip(-1)], dim=-1)
+    out = out * math.sqrt(2 / n)
+    out[..., 0] = out[..., 0] / math.sqrt(2)
+    return out
+
+
+def idct2(x):
+    r"""
+    Inverse of the orthogonal Discrete Cosine Transform, Type II (i.e., the DCT-III), across the last dimension of
+    the input signal. See :meth:`deepinv.physics.structured_random.dct2`.
+
+    :param torch.tensor x: the input signal
+    :return: (torch.tensor) the inverse DCT-II of the signal over the last dimension
+    """
+    n = x.shape[-1]
+    x = x * math.sqrt(n / 2)
+    x[..., 0] = x[..., 0] * math.sqrt(2)
+    re = x[..., : n // 2 + 1]
+    im = -torch.cat([torch.zeros_like(x[..., :1]), x[..., 1:].flip(-1)], dim=-1)
+    im = im[..., : n // 2 + 1]
+    c, s = _twiddle(n, n // 2 + 1, x.dtype, x.device)
+    R = torch.complex(re * c - im * s, im * c + re * s)
+    v = torch.fft.irfft(R, n=n)
+    out = torch.empty_like(v)
+    out[..., 0::2] = v[..., : (n + 1) // 2]
+    out[..., 1::2] = v[..., (n + 1) // 2 :].flip(-1)
+    return out
+
+
+def dct4(x):
+    r"""
+    Orthogonal Discrete Cosine Transform, Type IV, across the last dimension of the input signal, whose size must be
+    even. Due to orthogonality and symmetry we have ``dct4(dct4(x)) = x``.
+
+    The transform of a signal of size :math:`n` is computed with a complex FFT of size :math:`n/2`.
+
+    :param torch.tensor x: the input signal
+    :return: (torch.tensor) the DCT-IV of the signal over the last dimension
+    """
+    n = x.shape[-1]
+    if n % 2 != 0:
+        raise ValueError("The DCT-IV is only implemented for signals of even size")
+    k = torch.arange(n // 2, device=x.device, dtype=x.dtype)
+    u = torch.complex(x[..., 0::2], x[..., 1::2].flip(-1))
+    u = u * torch.polar(torch.ones_like(k), -math.pi * k / n)
+    S = torch.fft.fft(u)
+    S = S * torch.polar(torch.ones_like(k), -math.pi * (4 * k + 1) / (4 * n))
+    out = torch.empty_like(x)
+    out[..., 0::2] = S.real
+    out[..., 1::2] = -S.imag.flip(-1)
+    return out * math.sqrt(2 / n)
+
+
+TRANSFORMS = ("dst1", "dct", "dct4", "hadamard")
+
+
+def structured_transform(x, transform="dst1", adjoint=False):
+    r"""
+    Fast orthogonal transform of the last dimension of a signal, used by the structured random operators
+    :math:`A = \text{diag}(m)T\text{diag}(s)` of :class:`deepinv.physics.CompressedSensing` and
+    :class:`deepinv.physics.SinglePixelCamera`.
+
+    All the transforms have an :math:`O(n \log n)` complexity, and are computed without padding the signal:
+
+    - ``'dst1'``: Discrete Sine Transform of type I (:meth:`deepinv.physics.structured_random.dst1`),
+    - ``'dct'``: Discrete Cosine Transform of type II (:meth:`deepinv.physics.structured_random.dct2`),
+    - ``'dct4'``: Discrete Cosine Transform of type IV (:meth:`deepinv.physics.structured_random.dct4`), which
+      requires an even size,
+    - ``'hadamard'``: Walsh-Hadamard transform (:meth:`deepinv.physics.structured_random.hadamard_1d`), which
+      requires a power of 2 size and only involves additions.
+
+    :param torch.Tensor x: signal of size (..., n).
+    :param str transform: name of the transform.
+    :param bool adjoint: if ``True``, computes the adjoint (i.e., the inverse) of the transform.
+    :return: (torch.Tensor) transformed signal of size (..., n).
+    """
+    if transform == "dst1":
+        return dst1(x)
+    elif transform == "dct":
+        return idct2(x) if adjoint else dct2(x)
+    elif transform == "dct4":
+        return dct4(x)
+    elif transform == "hadamard":
+        return hadamard_1d(x)
+    else:
+        raise ValueError(f"Unknown transform {transform}, available: {TRANSFORMS}")
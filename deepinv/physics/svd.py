@@ -0,0 +1,211 @@
+import math
+import os
+import torch
+import torch.nn.functional as F
+from deepinv.physics.forward import DecomposablePhysics
+from deepinv.utils.cache import load_cached_tensors, save_cached_tensors
+
+
+def _apply_columns(fn, v, shape, batch_size):
+    r"""
+    Applies ``fn`` to the columns of the matrix ``v``, reshaped as tensors of size ``shape``, by batches of
+    ``batch_size`` columns, and returns the flattened outputs as the columns of a matrix.
+    """
+    out = []
+    for start in range(0, v.shape[1], batch_size):
+        chunk = v[:, start : start + batch_size].t().reshape(-1, *shape)
+        out.append(fn(chunk).reshape(chunk.shape[0], -1))
+    return torch.cat(out).t()
+
+
+def randomized_svd(
+    physics,
+    img_shape,
+    rank,
+    oversample=10,
+    power_iters=2,
+    batch_size=64,
+    generator=None,
+    device="cpu",
+    dtype=torch.float,
+):
+    r"""
+    Truncated singular value decomposition :math:`A \approx U\text{diag}(s)V^{\top}` of a linear operator,
+    computed matrix-free with the randomized range finder of Halko, Martinsson and Tropp (2011).
+
+    The range of :math:`A` is estimated from its action on ``rank + oversample`` random images, refined with
+    ``power_iters`` power iterations :math:`(AA^{\top})^q`, and the SVD of the projection of :math:`A` on this
+    range is computed exactly. The operator is only accessed through :meth:`A` and :meth:`A_adjoint`, applied
+    to batches of ``batch_size`` images or measurements, so that the cost is
+    :math:`(2q + 2)(r + p)` operator calls.
+
+    :param deepinv.physics.LinearPhysics physics: linear operator.
+    :param tuple[int] img_shape: shape (C, H, W) of the images, without the batch dimension.
+    :param int rank: number :math:`r` of singular values.
+    :param int oversample: number :math:`p` of additional random probes, which improves the accuracy of the
+        trailing singular values.
+    :param int power_iters: number :math:`q` of power iterations, which improves the accuracy when the singular
+        values decay slowly.
+    :param int batch_size: number of images or measurements processed by each call of the operator.
+    :param torch.Generator generator: random number generator of the probes.
+    :param torch.device device: device of the probes.
+    :param torch.dtype dtype: data type of the probes.
+    :return: (tuple) the matrices :math:`U` of size (m, r) and :math:`V` of size (n, r) with orthonormal
+        columns, and the singular values :math:`s` of size (r,), in decreasing order, returned as ``(U, s, V)``.
+    """
+    img_shape = tuple(img_shape)
+    n = math.prod(img_shape)
+    with torch.no_grad():
+        meas_shape = physics.A(torch.zeros((1,) + img_shape, device=device)).shape[1:]
+        if rank > min(n, math.prod(meas_shape)):
+            raise ValueError(
+                f"The rank {rank} is larger than the dimensions of the operator."
+            )
+        n_probes = min(rank + oversample, n)
+
+        def forward(v):
+            return _apply_columns(physics.A, v, img_shape, batch_size)
+
+        def adjoint(w):
+            return _apply_columns(physics.A_adjoint, w, meas_shape, batch_size)
+
+        omega = torch.randn(
+            (n, n_probes), generator=generator, device=device, dtype=dtype
+        )
+        Q = torch.linalg.qr(forward(omega)).Q
+        for _ in range(power_iters):
+            Q = torch.linalg.qr(adjoint(Q)).Q
+            Q = torch.linalg.qr(forward(Q)).Q
+
+        # projection Q^T A, whose rows are the adjoint applied to the basis
+        U, s, Vh = torch.linalg.svd(adjoint(Q).t(), full_matrices=False)
+        return Q @ U[:, :rank], s[:rank], Vh[:rank].t()
+
+
+class SVDPhysics(DecomposablePhysics):
+    r"""
+    Linear operator defined by a (truncated) singular value decomposition
+
+    .. math::
+
+        A = U_r\text{diag}(s)V_r^{\top}
+
+    where :math:`U_r \in \mathbb{R}^{m\times r}` and :math:`V_r \in \mathbb{R}^{n\times r}` have orthonormal
+    columns, e.g. computed with :meth:`deepinv.physics.svd.to_decomposable`.
+
+    The transformation :math:`V` of :class:`deepinv.physics.DecomposablePhysics` is the orthogonal matrix
+    whose first :math:`r` columns are :math:`V_r` (up to their signs), represented implicitly by the :math:`r`
+    Householder reflections of a QR decomposition of :math:`V_r`, so that :math:`V` and :math:`V^{\top}` cost
+    :math:`O(nr)` operations and the closed-form :meth:`prox_l2` and :meth:`A_dagger` are exact, including on the
+    null space of the operator. The transformed domain has size :math:`n`, where the last :math:`n - r` singular
+    values are zero, and :meth:`U_adjoint` pads the coefficients :math:`U_r^{\top}y` with zeros, which is the
+    structure expected by :class:`deepinv.sampling.DDRM`.
+
+    :param torch.Tensor U: left singular vectors of size (m, r).
+    :param torch.Tensor s: singular values of size (r,).
+    :param torch.Tensor V: right singular vectors of size (n, r).
+    :param tuple[int] img_shape: shape of the images, without the batch dimension.
+    :param tuple[int] meas_shape: shape of the measurements, without the batch dimension.
+    """
+
+    def __init__(self, U, s, V, img_shape, meas_shape, **kwargs):
+        super().__init__(**kwargs)
+        self.img_shape = tuple(img_shape)
+        self.meas_shape = tuple(meas_shape)
+        self.rank = s.shape[0]
+        n = V.shape[0]
+
+        reflectors, tau = torch.geqrf(V)
+        # V_r = Q_r R, where R is diagonal with unit entries up to rounding errors
+        signs = torch.sign(torch.diagonal(reflectors[: self.rank]))
+        self.reflectors = torch.nn.Parameter(reflectors, requires_grad=False)
+        self.tau = torch.nn.Parameter(tau, requires_grad=False)
+        self.U_matrix = torch.nn.Parameter(U * signs, requires_grad=False)
+        mask = torch.zeros((1, n), dtype=s.dtype, device=s.device)
+        mask[0, : self.rank] = s
+        self.mask = torch.nn.Parameter(mask, requires_grad=False)
+
+    def V_adjoint(self, x):
+        x = x.reshape(x.shape[0], -1).t()
+        return torch.ormqr(self.reflectors, self.tau, x, transpose=True).t()
+
+    def V(self, x):
+        x = torch.ormqr(self.reflectors, self.tau, x.t())
+        return x.t().reshape((-1,) + self.img_shape)
+
+    def U_adjoint(self, y):
+        y = y.reshape(y.shape[0], -1) @ self.U_matrix
+        return F.pad(y, (0, self.mask.shape[-1] - self.rank))
+
+    def U(self, x):
+        y = x[:, : self.rank] @ self.U_matrix.t()
+        return y.reshape((-1,) + self.meas_shape)
+
+
+def to_decomposable(
+    physics,
+    img_shape,
+    rank,
+    oversample=10,
+    power_iters=2,
+    batch_size=64,
+    path=None,
+    generator=None,
+    device="cpu",
+):
+    r"""
+    Converts a linear operator into a :class:`deepinv.physics.svd.SVDPhysics` with a truncated SVD of rank
+    ``rank``, computed matrix-free with :meth:`deepinv.physics.svd.randomized_svd`.
+
+    The returned operator has closed-form pseudo-inverse and proximal operators (which only involve small
+    matrix products), and can be used with algorithms requiring an SVD such as :class:`deepinv.sampling.DDRM`.
+    It keeps the noise and sensor models of ``physics``. The decomposition is exact (up to rounding errors) if
+    ``rank`` is at least the rank of the operator.
+
+    :param deepinv.physics.LinearPhysics physics: linear operator.
+    :param tuple[int] img_shape: shape (C, H, W) of the images, without the batch dimension.
+    :param int rank: rank of the decomposition.
+    :param int oversample: number of additional random probes of the range finder.
+    :param int power_iters: number of power iterations of the range finder.
+    :param int batch_size: number of images or measurements processed by each call of the operator.
+    :param str path: file where the singular vectors and values are saved. If it exists, the decomposition is
+        loaded (memory-mapped) from it instead of being computed.
+    :param torch.Generator generator: random number generator of the probes.
+    :param torch.device device: device of the operator.
+    :return: (deepinv.physics.svd.SVDPhysics) decomposable operator.
+    """
+    if path is not None and os.path.exists(path):
+        data = load_cached_tensors(path)
+    else:
+        U, s, V = randomized_svd(
+            physics,
+            img_shape,
+            rank,
+            oversample=oversample,
+            power_iters=power_iters,
+            batch_size=batch_size,
+            generator=generator,
+            device=device,
+        )
+        with torch.no_grad():
+            y = physics.A(torch.zeros((1,) + tuple(img_shape), device=device))
+        data = {
+            "U": U.cpu(),
+            "s": s.cpu(),
+            "V": V.cpu(),
+            "meas_shape": torch.tensor(y.shape[1:]),
+        }
+        if path is not None:
+            save_cached_tensors(data, path)
+
+    return SVDPhysics(
+        data["U"].to(device),
+        data["s"].to(device),
+        data["V"].to(device),
+        img_shape,
+        data["meas_shape"].tolist(),
+        noise_model=physics.noise_model,
+        sensor_model=physics.sensor_model,
+        max_iter=physics.max_iter,
+        tol=physics.tol,
+    )
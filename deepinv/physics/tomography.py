@@ -1,8 +1,10 @@
+import os
 import torch
 import numpy as np
 from torch import nn
 import torch.nn.functional as F
 from deepinv.physics.forward import LinearPhysics
+from deepinv.utils.cache import get_cache_dir, hash_args, load_or_build_sparse
 
 if torch.__version__ > "1.2.0":
     affine_grid = lambda theta, size: F.affine_grid(theta, size, align_corners=True)
@@ -89,12 +91,41 @@ class RampFilter(AbstractFilter):
         return f
 
 
+def _angle_chunks(n_angles, bytes_per_angle, memory_budget):
+    r"""
+    Splits the angles in consecutive chunks whose intermediate tensors fit in ``memory_budget`` bytes.
+
+    :param int n_angles: number of angles.
+    :param int bytes_per_angle: memory required to process a single angle.
+    :param int memory_budget: memory budget in bytes.
+    :return: list of (start, stop) index pairs.
+    """
+    chunk = max(1, int(memory_budget // max(bytes_per_angle, 1)))
+    return [(i, min(i + chunk, n_angles)) for i in range(0, n_angles, chunk)]
+
+
 class Radon(nn.Module):
+    r"""
+    Radon transform (forward projection) of square images.
+
+    :param int in_size: width of the input images. If ``None``, the sampling grids are built at the first call.
+    :param torch.Tensor theta: projection angles in degrees.
+    :param bool circle: restrict the projection to the circle inscribed in the image.
+    :param bool vectorized: if ``True``, several angles are sampled in a single call to
+        :meth:`torch.nn.functional.grid_sample`, otherwise the angles are processed one by one.
+    :param int memory_budget: maximum size in bytes of the intermediate tensors when ``vectorized=True``,
+        which fixes the number of angles processed at once.
+    :param torch.dtype dtype: data type of the sampling grids.
+    :param torch.device device: device of the sampling grids.
+    """
+
     def __init__(
         self,
         in_size=None,
         theta=None,
         circle=False,
+        vectorized=False,
+        memory_budget=2**28,
         dtype=torch.float,
         device=torch.device("cpu"),
     ):
@@ -103,12 +134,20 @@ class Radon(nn.Module):
         self.theta = theta
         if theta is None:
             self.theta = torch.arange(180)
+        self.vectorized = vectorized
+        self.memory_budget = memory_budget
         self.dtype = dtype
         self.all_grids = None
         if in_size is not None:
             self.all_grids = self._create_grids(self.theta, in_size, circle).to(device)
 
-    def forward(self, x):
+    def forward(self, x, idx=None):
+        r"""
+        :param torch.Tensor x: images of size (N, C, W, W).
+        :param torch.Tensor idx: if not ``None``, only the angles ``theta[idx]`` are projected.
+        :return: (torch.Tensor) sinograms of size (N, C, D, A), where D is the number of detectors and A the number
+            of angles.
+        """
         N, C, W, H = x.shape
         assert W == H, "Input image must be square"
 
@@ -129,13 +168,37 @@ class Radon(nn.Module):
             x = F.pad(x, (pad_width[0], pad_width[1], pad_width[0], pad_width[1]))
 
         N, C, W, _ = x.shape
-        out = torch.zeros(N, C, W, len(self.theta), device=x.device, dtype=self.dtype)
+        all_grids = self.all_grids if idx is None else self.all_grids[idx]
+
+        if self.vectorized:
+            return self._vectorized_forward(x, all_grids)
 
-        for i in range(len(self.theta)):
-            rotated = grid_sample(x, self.all_grids[i].repeat(N, 1, 1, 1).to(x.device))
+        out = torch.zeros(N, C, W, len(all_grids), device=x.device, dtype=self.dtype)
+
+        for i in range(len(all_grids)):
+            rotated = grid_sample(x, all_grids[i].repeat(N, 1, 1, 1).to(x.device))
             out[..., i] = rotated.sum(2)
         return out
 
+    def _vectorized_forward(self, x, all_grids):
+        r"""
+        Projects the (padded) image along chunks of angles, using a single call to ``grid_sample`` per chunk.
+
+        The grids of the angles in a chunk are concatenated along the height, and expanded (not copied)
+        along the batch dimension.
+        """
+        N, C, W, _ = x.shape
+        n_angles = len(all_grids)
+        grids = all_grids.to(x.device).reshape(1, n_angles * W, W, 2)
+        bytes_per_angle = W * W * (N * C + 2 * N) * x.element_size()
+
+        out = []
+        for start, stop in _angle_chunks(n_angles, bytes_per_angle, self.memory_budget):
+            grid = grids[:, start * W : stop * W].expand(N, -1, -1, -1)
+            rotated = grid_sample(x, grid).view(N, C, stop - start, W, W)
+            out.append(rotated.sum(3))
+        return torch.cat(out, dim=2).transpose(2, 3).to(self.dtype)
+
     def _create_grids(self, angles, grid_size, circle, device="cpu"):
         if not circle:
             grid_size = int((SQRT2 * grid_size).ceil())
@@ -152,6 +215,22 @@ class Radon(nn.Module):
 
 
 class IRadon(nn.Module):
+    r"""
+    Inverse Radon transform, computed with the (filtered) back-projection algorithm.
+
+    :param int in_size: width of the reconstructed images. If ``None``, it is inferred at the first call.
+    :param torch.Tensor theta: projection angles in degrees.
+    :param bool circle: restrict the reconstruction to the circle inscribed in the image.
+    :param bool use_filter: apply a ramp filter to the sinogram before back-projection.
+    :param int out_size: if not ``None``, the reconstruction is zero-padded to this width.
+    :param bool vectorized: if ``True``, several angles are back-projected in a single call to
+        :meth:`torch.nn.functional.grid_sample`, otherwise the angles are processed one by one.
+    :param int memory_budget: maximum size in bytes of the intermediate tensors when ``vectorized=True``,
+        which fixes the number of angles processed at once.
+    :param torch.dtype dtype: data type of the sampling grids.
+    :param torch.device device: device of the sampling grids.
+    """
+
     def __init__(
         self,
         in_size=None,
@@ -159,11 +238,15 @@ class IRadon(nn.Module):
         circle=False,
         use_filter=True,
         out_size=None,
+        vectorized=False,
+        memory_budget=2**28,
         dtype=torch.float,
         device=torch.device("cpu"),
     ):
         super().__init__()
         self.circle = circle
+        self.vectorized = vectorized
+        self.memory_budget = memory_budget
         self.device = device
         self.theta = theta if theta is not None else torch.arange(180).to(self.device)
         self.out_size = out_size
@@ -181,7 +264,14 @@ class IRadon(nn.Module):
             else lambda x: x
         )
 
-    def forward(self, x, filtering=True):
+    def forward(self, x, filtering=True, idx=None):
+        r"""
+        :param torch.Tensor x: sinograms of size (N, C, D, A), where D is the number of detectors and A the number
+            of angles.
+        :param bool filtering: apply the filter before back-projection.
+        :param torch.Tensor idx: if not ``None``, only the angles ``theta[idx]`` are back-projected.
+        :return: (torch.Tensor) images of size (N, C, W, W).
+        """
         it_size = x.shape[2]
         ch_size = x.shape[1]
 
@@ -195,14 +285,18 @@ class IRadon(nn.Module):
             self.all_grids = self._create_grids(self.theta, self.in_size, self.circle)
 
         x = self.filter(x) if filtering else x
+        all_grids = self.all_grids if idx is None else self.all_grids[idx]
 
         reco = torch.zeros(
             x.shape[0], ch_size, it_size, it_size, device=self.device, dtype=self.dtype
         )
-        for i_theta in range(len(self.theta)):
-            reco += grid_sample(
-                x, self.all_grids[i_theta].repeat(reco.shape[0], 1, 1, 1)
-            )
+        if self.vectorized:
+            self._vectorized_backprojection(x, reco, all_grids)
+        else:
+            for i_theta in range(len(all_grids)):
+                reco += grid_sample(
+                    x, all_grids[i_theta].repeat(reco.shape[0], 1, 1, 1)
+                )
 
         if not self.circle:
             W = self.in_size
@@ -231,6 +325,20 @@ class IRadon(nn.Module):
 
         return reco
 
+    def _vectorized_backprojection(self, x, reco, all_grids):
+        r"""
+        Accumulates in ``reco`` the back-projection of the sinogram ``x`` along chunks of angles,
+        using a single call to ``grid_sample`` per chunk.
+        """
+        N, C, W, _ = reco.shape
+        n_angles = len(all_grids)
+        grids = all_grids.reshape(1, n_angles * W, W, 2)
+        bytes_per_angle = W * W * (N * C + 2 * N) * reco.element_size()
+
+        for start, stop in _angle_chunks(n_angles, bytes_per_angle, self.memory_budget):
+            grid = grids[:, start * W : stop * W].expand(N, -1, -1, -1)
+            reco += grid_sample(x, grid).view(N, C, stop - start, W, W).sum(2)
+
     def _create_yxgrid(self, in_size, circle):
         if not circle:
             in_size = int((SQRT2 * in_size).ceil())
@@ -262,6 +370,103 @@ class IRadon(nn.Module):
         return torch.stack(all_grids)
 
 
+def radon_matrix(img_width, theta, circle=False, dtype=torch.float, max_entries=2**24):
+    r"""
+    Assembles the Radon transform of :class:`deepinv.physics.tomography.Radon` as a sparse matrix.
+
+    The rows of the matrix follow the (angle, detector) ordering and its columns the (height, width) ordering of the
+    image pixels. The weights are the bilinear interpolation weights of the sampling grids used by
+    :class:`deepinv.physics.tomography.Radon`, summed along each projection line.
+
+    :param int img_width: width of the square images.
+    :param torch.Tensor theta: projection angles in degrees.
+    :param bool circle: same as in :class:`deepinv.physics.tomography.Radon`.
+    :param torch.dtype dtype: data type of the matrix entries.
+    :param int max_entries: maximum number of (non-coalesced) entries processed at once, which bounds the memory
+        used during the assembly.
+    :return: (tuple) the matrix and its transpose, as sparse CSR tensors of sizes ``(len(theta) * D, img_width**2)``
+        and ``(img_width**2, len(theta) * D)``, where ``D`` is the number of detectors.
+    """
+    theta = theta.cpu()
+    grids = Radon(theta=theta, circle=circle, dtype=torch.float64)._create_grids(
+        theta, img_width, circle
+    )
+    grids = grids.squeeze(1)  # (angles, D, D, 2)
+    n_angles, D = grids.shape[0], grids.shape[1]
+
+    # offset of the image in the zero-padded image sampled by the grids
+    pad_before = 0 if circle else D // 2 - img_width // 2
+
+    n_rows, n_cols = n_angles * D, img_width * img_width
+    rows, cols, vals = [], [], []
+    chunk = max(1, max_entries // (4 * D * D))
+    for start in range(0, n_angles, chunk):
+        g = grids[start : start + chunk]
+        k = g.shape[0]
+        # pixel coordinates in the padded image (grid_sample with align_corners=True)
+        ix = (g[..., 0] + 1) / 2 * (D - 1)
+        iy = (g[..., 1] + 1) / 2 * (D - 1)
+        x0, y0 = ix.floor(), iy.floor()
+        wx, wy = ix - x0, iy - y0
+        x0 = x0.long() - pad_before
+        y0 = y0.long() - pad_before
+
+        # output (angle, detector) index of each sample, summed along the projection lines
+        row = torch.arange(start, start + k).view(k, 1, 1) * D + torch.arange(D)
+        row = row.expand(k, D, D)
+
+        r, c, v = [], [], []
+        for dx, dy, w in [
+            (0, 0, (1 - wx) * (1 - wy)),
+            (1, 0, wx * (1 - wy)),
+            (0, 1, (1 - wx) * wy),
+            (1, 1, wx * wy),
+        ]:
+            px, py = x0 + dx, y0 + dy
+            valid = (
+                (px >= 0) & (px < img_width) & (py >= 0) & (py < img_width) & (w != 0)
+            )
+            r.append(row[valid])
+            c.append((py * img_width + px)[valid])
+            v.append(w[valid])
+
+        block = torch.sparse_coo_tensor(
+            torch.stack([torch.cat(r), torch.cat(c)]),
+            torch.cat(v),
+            size=(n_rows, n_cols),
+        ).coalesce()
+        rows.append(block.indices()[0])
+        cols.append(block.indices()[1])
+        vals.append(block.values())
+
+    # blocks cover consecutive rows, so the concatenation is sorted by rows
+    rows, cols, vals = torch.cat(rows), torch.cat(cols), torch.cat(vals).to(dtype)
+    crow = torch.zeros(n_rows + 1, dtype=torch.int64)
+    crow[1:] = torch.cumsum(torch.bincount(rows, minlength=n_rows), dim=0)
+    matrix = torch.sparse_csr_tensor(crow, cols, vals, size=(n_rows, n_cols))
+
+    transpose = torch.sparse_coo_tensor(
+        torch.stack([cols, rows]), vals, size=(n_cols, n_rows)
+    )
+    transpose = transpose.coalesce().to_sparse_csr()
+    return matrix, transpose
+
+
+def _load_radon_matrix(img_width, theta, circle, dtype, cache_dir=None):
+    r"""
+    Loads the sparse Radon matrix from the disk cache (memory-mapped), or assembles it and saves it.
+    """
+    if cache_dir is None:
+        cache_dir = get_cache_dir("radon")
+    else:
+        os.makedirs(cache_dir, exist_ok=True)
+    key = hash_args(img_width, theta.cpu(), circle, dtype)
+    path = os.path.join(cache_dir, f"radon_w{img_width}_a{len(theta)}_{key}.pt")
+    return load_or_build_sparse(
+        path, lambda: radon_matrix(img_width, theta, circle=circle, dtype=dtype)
+    )
+
+
 class Tomography(LinearPhysics):
     r"""
     (Computed) Tomography operator.
@@ -278,13 +483,24 @@ class Tomography(LinearPhysics):
 
     .. warning::
 
-        The adjoint operator has small numerical errors due to interpolation.
+        The adjoint operator has small numerical errors due to interpolation, unless ``sparse=True``.
+
+    If ``sparse=True``, the Radon transform is assembled once as a sparse matrix (see
+    :meth:`deepinv.physics.tomography.radon_matrix`), so that the forward operator is a sparse matrix product and
+    the adjoint is the exact transpose. The matrix is cached on disk and memory-mapped when the same operator is
+    created again.
 
     :param int img_width: width/height of the square image input.
     :param int, torch.tensor angles: If the type is ``int``, the angles are sampled uniformly between 0 and 360 degrees.
         If the type is ``torch.tensor``, the angles are the ones provided (e.g., ``torch.linspace(0, 180, steps=10)``).
     :param bool circle: If ``True`` both forward and backward projection will be restricted to pixels inside a circle
         inscribed in the square image.
+    :param bool vectorized: If ``True``, the projections and back-projections of chunks of angles are computed with
+        a single interpolation call, which is much faster for large number of angles at the cost of more memory.
+    :param int memory_budget: maximum size in bytes of the intermediate tensors when ``vectorized=True``.
+    :param bool sparse: If ``True``, the operator and its exact adjoint are computed with a precomputed sparse matrix.
+    :param str cache_dir: directory where the sparse matrices are cached. If ``None``, uses
+        :meth:`deepinv.utils.get_cache_dir`.
     :param str device: gpu or cpu.
 
     |sep|
@@ -322,6 +538,10 @@ class Tomography(LinearPhysics):
         img_width,
         angles,
         circle=False,
+        vectorized=False,
+        memory_budget=2**28,
+        sparse=False,
+        cache_dir=None,
         device=torch.device("cpu"),
         dtype=torch.float,
         **kwargs,
@@ -334,17 +554,75 @@ class Tomography(LinearPhysics):
             theta = angles.to(device)
 
         self.radon = Radon(
-            img_width, theta, circle=circle, device=device, dtype=dtype
+            img_width,
+            theta,
+            circle=circle,
+            vectorized=vectorized,
+            memory_budget=memory_budget,
+            device=device,
+            dtype=dtype,
         ).to(device)
         self.iradon = IRadon(
-            img_width, theta, circle=circle, device=device, dtype=dtype
+            img_width,
+            theta,
+            circle=circle,
+            vectorized=vectorized,
+            memory_budget=memory_budget,
+            device=device,
+            dtype=dtype,
         ).to(device)
 
+        self.n_angles = len(theta)
+        self.img_width = img_width
+        self.sparse = sparse
+        if sparse:
+            matrix, transpose = _load_radon_matrix(
+                img_width, theta, circle, dtype, cache_dir=cache_dir
+            )
+            self._matrix = matrix.to(device)
+            self._matrix_t = transpose.to(device)
+
     def A(self, x):
+        if self.sparse:
+            N, C = x.shape[:2]
+            y = self._matrix @ x.reshape(N * C, -1).t()
+            return y.t().reshape(N, C, self.n_angles, -1).transpose(2, 3)
         return self.radon(x)
 
     def A_dagger(self, y):
         return self.iradon(y)
 
     def A_adjoint(self, y):
+        if self.sparse:
+            N, C = y.shape[:2]
+            x = self._matrix_t @ y.transpose(2, 3).reshape(N * C, -1).t()
+            return x.t().reshape(N, C, self.img_width, self.img_width)
         return self.iradon(y, filtering=False)
+
+    def subsets(self, n_subsets):
+        r"""
+        Splits the projection angles into ``n_subsets`` interleaved subsets, i.e., the subset :math:`k` contains the
+        angles :math:`k, k + n_{\text{subsets}}, k + 2n_{\text{subsets}}, \dots`, so that each subset covers the
+        whole angular range.
+
+        :param int n_subsets: number of subsets.
+        :return: (list) list of ``n_subsets`` index tensors.
+        """
+        return [torch.arange(k, self.n_angles, n_subsets) for k in range(n_subsets)]
+
+    def measurement_subset(self, y, idx):
+        return y[..., idx]
+
+    def A_subset(self, x, idx):
+        r"""
+        Projects the image along the angles of the subset. The interpolation-based projector is used
+        even if ``sparse=True``.
+        """
+        return self.radon(x, idx=idx)
+
+    def A_adjoint_subset(self, y, idx):
+        y_full = torch.zeros(
+            y.shape[:-1] + (self.n_angles,), device=y.device, dtype=y.dtype
+        )
+        y_full[..., idx] = y
+        return self.iradon(y_full, filtering=False, idx=idx)
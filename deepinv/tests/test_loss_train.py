@@ -39,6 +39,29 @@ def test_generate_dataset(tmp_path, imsize, device):
     assert x.shape == imsize
 
 
+def test_generate_dataset_compact(tmp_path, imsize, device):
+    N = 4
+    train_dataset = DummyCircles(samples=N, imsize=imsize)
+
+    physics = dinv.physics.Inpainting(
+        mask=0.5, tensor_size=imsize, compact=True, device=device
+    )
+
+    dinv.datasets.generate_dataset(
+        train_dataset,
+        physics,
+        tmp_path,
+        device=device,
+        dataset_filename="dinv_dataset",
+    )
+
+    dataset = dinv.datasets.HDF5Dataset(path=f"{tmp_path}/dinv_dataset0.h5", train=True)
+
+    x, y = dataset[0]
+    assert y.shape == (int(physics.mask.sum()),)
+    assert physics.A_adjoint(y.unsqueeze(0).to(device)).shape[1:] == imsize
+
+
 # optim_algos = [
 #     "PGD",
 #     "HQS",
@@ -8,6 +8,7 @@ from deepinv.optim import DataFidelity
 from deepinv.optim.data_fidelity import L2, IndicatorL2, L1
 from deepinv.optim.prior import Prior, PnP, RED
 from deepinv.optim.optimizers import optim_builder
+from deepinv.optim.optim_iterators import PGDIteration, OSPGDIteration
 
 
 def custom_init_CP(y, physics):
@@ -686,3 +687,149 @@ def test_patch_prior(imsize, dummy_dataset, device):
         x_out.append(x)
 
     assert torch.sum((x_out[0] - test_sample) ** 2) < torch.sum((y - test_sample) ** 2)
+
+
+@pytest.mark.parametrize("n_subsets", [1, 4])
+def test_ospgd_iteration(n_subsets, device):
+    # A full cycle of ordered subsets applies each row of the operator once, and a single subset recovers PGD.
+    physics = dinv.physics.CompressedSensing(m=50, img_shape=(1, 8, 8), device=device)
+    x = torch.randn(1, 1, 8, 8, device=device)
+    y = physics(x)
+
+    data_fidelity = L2()
+    prior = PnP(denoiser=lambda x, sigma: x)
+    params = {"stepsize": 0.1, "lambda": 1.0, "g_param": None, "beta": 1.0}
+    x0 = torch.zeros_like(x)
+
+    pgd = PGDIteration()
+    ospgd = OSPGDIteration(n_subsets=n_subsets)
+    X_pgd = pgd({"est": (x0,)}, data_fidelity, prior, params, y, physics)
+
+    if n_subsets == 1:
+        X_ospgd = ospgd({"est": (x0,)}, data_fidelity, prior, params, y, physics)
+        assert torch.allclose(X_pgd["est"][0], X_ospgd["est"][0], atol=1e-6)
+    else:
+        # with x0 = 0, each subset step is independent of the previous ones, and their mean is the PGD step
+        steps = [
+            ospgd({"est": (x0,)}, data_fidelity, prior, params, y, physics)["est"][0]
+            for _ in range(n_subsets)
+        ]
+        assert torch.allclose(X_pgd["est"][0], sum(steps) / n_subsets, atol=1e-6)
+
+    # each run starts from the first subset, and the subsets are computed once per run
+    calls = [0]
+    subsets = physics.subsets
+
+    def counted(n):
+        calls[0] += 1
+        return subsets(n)
+
+    physics.subsets = counted
+    model = dinv.optim.BaseOptim(
+        OSPGDIteration(n_subsets=n_subsets),
+        params_algo={"stepsize": 0.1, "lambda": 1.0},
+        data_fidelity=data_fidelity,
+        prior=prior,
+        max_iter=3,
+    )
+    assert torch.allclose(model(y, physics), model(y, physics))
+    assert calls[0] == 2
+
+
+@pytest.mark.parametrize("solver", ["CG", "MINRES", "LSQR"])
+def test_linear_solvers(solver, device):
+    # Batched Krylov solvers on per-sample systems with very different conditionings
+    from deepinv.optim.utils import conjugate_gradient, minres, lsqr
+    from deepinv.utils import TensorList, PackedTensorList
+
+    torch.manual_seed(0)
+    B, n = 3, 20
+    opts = {"device": device, "dtype": torch.float64}
+    Q = torch.linalg.qr(torch.randn(B, n, n, **opts))[0]
+    s = torch.stack([torch.linspace(1, c, n, **opts) for c in [1, 10, 1e3]])
+    mat = Q @ torch.diag_embed(s) @ Q.transpose(-1, -2)
+    A = lambda x: (mat @ x.unsqueeze(-1)).squeeze(-1)
+    x_true = torch.randn(B, n, **opts)
+    b = A(x_true)
+
+    def solve(op, rhs, tol=1e-8, **kwargs):
+        if solver == "CG":
+            return conjugate_gradient(op, rhs, max_iter=200, tol=tol, **kwargs)
+        elif solver == "MINRES":
+            return minres(op, rhs, max_iter=200, tol=tol, **kwargs)
+        else:
+            return lsqr(op, op, rhs, max_iter=200, tol=tol, **kwargs)
+
+    x = solve(A, b)
+    assert torch.allclose(x, x_true, atol=1e-3)
+
+    # warm start at the solution: no update
+    calls = [0]
+
+    def counted(v):
+        calls[0] += 1
+        return A(v)
+
+    x = solve(counted, b, tol=1e-6, x0=x_true)
+    assert torch.allclose(x, x_true)
+    assert calls[0] <= 2
+
+    # relative tolerance, also on the residual of the normal equations for LSQR
+    x = solve(A, b, tol=0.0, rtol=1e-2)
+    converged = (A(x) - b).norm(dim=-1) <= 1e-2 * b.norm(dim=-1) * 1.01
+    if solver == "LSQR":
+        normal = A(A(x) - b).norm(dim=-1) <= 1e-2 * A(b).norm(dim=-1) * 1.01
+        converged = converged | normal
+    assert converged.all()
+
+    # TensorList
+    A_list = lambda x: TensorList([A(x[0]), 2 * x[1]])
+    b_list = TensorList([b, 2 * b])
+    x_list = solve(A_list, b_list)
+    assert torch.allclose(x_list[0], x_true, atol=1e-3)
+    assert torch.allclose(x_list[1], b, atol=1e-3)
+
+    # PackedTensorList, whose iterates stay packed in a single buffer
+    A_packed = lambda x: PackedTensorList([A(x[0]), 2 * x[1]])
+    x_packed = solve(A_packed, PackedTensorList(b_list))
+    assert isinstance(x_packed, PackedTensorList)
+    assert torch.allclose(x_packed[0], x_list[0], atol=1e-6)
+    assert torch.allclose(x_packed[1], x_list[1], atol=1e-6)
+
+
+def test_prox_warm_start(device):
+    # Warm-starting the inner CG solves of prox_l2 reduces their iterations without changing the result
+    torch.manual_seed(0)
+    filter = dinv.physics.blur.gaussian_blur(sigma=(2.0, 2.0))
+    physics = dinv.physics.Blur(filter, padding="reflect", device=device)
+    physics.max_iter, physics.tol = 500, 1e-6
+    x = torch.rand(2, 1, 32, 32, device=device)
+    y = physics(x)
+
+    calls = [0]
+    normal = physics.A_adjoint_A
+
+    def counted(v):
+        calls[0] += 1
+        return normal(v)
+
+    physics.A_adjoint_A = counted
+
+    out, n_calls = [], []
+    for warm_start_prox in [False, True]:
+        calls[0] = 0
+        model = optim_builder(
+            "HQS",
+            prior=dinv.optim.prior.Tikhonov(),
+            data_fidelity=L2(),
+            max_iter=20,
+            params_algo={"stepsize": 1.0, "lambda": 1.0, "g_param": 0.1},
+            early_stop=False,
+            warm_start_prox=warm_start_prox,
+        )
+        out.append(model(y, physics))
+        n_calls.append(calls[0])
+
+    assert torch.allclose(out[0], out[1], atol=1e-4)
+    assert n_calls[1] < n_calls[0]
+    assert model.fixed_point.prox_cache.current() is None  # deactivated after the solve
@@ -17,6 +17,7 @@ OPERATORS = [
     "fast_singlepixel",
     "super_resolution",
     "MRI",
+    "multicoil_MRI",
     "pansharpen",
 ]
 NONLINEAR_OPERATORS = ["haze", "blind_deblur", "lidar"]
@@ -57,6 +58,11 @@ def find_operator(name, device):
     elif name == "MRI":
         img_size = (2, 16, 8)
         p = dinv.physics.MRI(mask=torch.ones(img_size[-2], img_size[-1]), device=device)
+    elif name == "multicoil_MRI":
+        img_size = (2, 16, 8)
+        maps = torch.randn((4,) + img_size[1:], dtype=torch.complex64, device=device)
+        maps = maps / maps.abs().pow(2).sum(0, keepdim=True).sqrt()
+        p = dinv.physics.MultiCoilMRI(coil_maps=maps, device=device)
     elif name == "Tomography":
         img_size = (1, 16, 16)
         p = dinv.physics.Tomography(
@@ -269,6 +275,34 @@ def choose_noise(noise_type):
     return noise_model
 
 
+def test_MRI_non_square(device):
+    r"""
+    Tests that the masks of non-square images are made of columns, i.e., of valid indices along the width, both
+    for :meth:`deepinv.physics.MRI.sample_mask` and :meth:`deepinv.physics.MRI.sample_params`.
+
+    :param device: (torch.device) cpu or cuda:x
+    """
+    H, W = 64, 48
+    physics = dinv.physics.MRI(
+        mask=None, image_size=(H, W), acceleration_factor=4, seed=0, device=device
+    )
+    generator = torch.Generator(device=device).manual_seed(0)
+    masks = [physics.mask[0, 0]] + list(
+        physics.sample_params(3, generator=generator)["mask"]
+    )
+    center, num_random = physics._sampling_pattern((H, W), 4)
+    assert center.min() >= 0 and center.max() < W
+    for mask in masks:
+        assert mask.shape == (H, W)
+        assert torch.equal(mask, mask[:1].expand(H, -1))  # vertical lines
+        lines = torch.nonzero(mask[0]).flatten()
+        assert torch.all(mask[0, center] == 1)
+        assert len(lines) <= len(center.unique()) + num_random
+
+    x = torch.randn((1, 2, H, W), device=device)
+    assert physics.adjointness_test(x).abs() < 1e-3
+
+
 @pytest.mark.parametrize("noise_type", NOISES)
 def test_noise(device, noise_type):
     r"""
@@ -351,6 +385,56 @@ def test_blur(device):
     assert error_At < 1e-6
 
 
+@pytest.mark.parametrize("padding", ["valid", "circular", "reflect", "replicate"])
+def test_blur_per_sample_filter(padding, device):
+    r"""
+    Tests that a batch of filters applies one filter per sample, and that the adjoint is exact.
+
+    :param str padding: padding mode of the convolution.
+    :param device: (torch.device) cpu or cuda:x
+    """
+    torch.manual_seed(0)
+    x = torch.randn((4, 3, 32, 29), device=device)
+    filters = torch.rand((4, 1, 5, 4), device=device)
+    physics = dinv.physics.Blur(filter=filters, padding=padding, device=device)
+
+    y = physics.A(x)
+    for i in range(x.shape[0]):
+        yi = dinv.physics.blur.conv(x[i : i + 1], filters[i : i + 1], padding)
+        assert torch.allclose(y[i : i + 1], yi, atol=1e-5)
+
+    assert physics.adjointness_test(x).abs() < 1e-3
+
+
+@pytest.mark.parametrize("padding", ["valid", "circular", "reflect", "replicate"])
+def test_conv_fft(padding, device):
+    r"""
+    Tests that FFT-based convolutions match the spatial ones.
+
+    :param str padding: padding mode of the convolution.
+    :param device: (torch.device) cpu or cuda:x
+    """
+    torch.manual_seed(0)
+    x = torch.randn((2, 3, 32, 29), device=device)
+    for filt in [
+        torch.rand((1, 1, 7, 6), device=device),
+        torch.rand((2, 1, 5, 5), device=device),
+        torch.rand((1, 3, 4, 3), device=device),
+    ]:
+        y = dinv.physics.blur.conv(x, filt, padding)
+        y_fft = dinv.physics.blur.conv_fft(x, filt, padding)
+        assert torch.allclose(y, y_fft, atol=1e-4)
+
+        z = dinv.physics.blur.conv_transpose(y, filt, padding)
+        z_fft = dinv.physics.blur.conv_transpose_fft(y, filt, padding)
+        assert torch.allclose(z, z_fft, atol=1e-4)
+
+    physics = dinv.physics.Blur(
+        filter=filt, padding=padding, device=device, conv_method="fft"
+    )
+    assert physics.adjointness_test(x).abs() < 1e-3
+
+
 def test_reset_noise(device):
     r"""
     Tests that the reset function works.
@@ -390,3 +474,919 @@ def test_tomography(device):
         y = physics.A(r)
         error = (physics.A_dagger(y) - r).flatten().mean().abs()
         assert error < 0.2
+
+
+@pytest.mark.parametrize("circle", [True, False])
+def test_tomography_vectorized(circle, device):
+    r"""
+    Tests that the vectorized projector and back-projector match the angle-by-angle implementation.
+
+    :param bool circle: restrict the operator to the inscribed circle.
+    :param device: (torch.device) cpu or cuda:x
+    """
+    imsize = (1, 16, 16)
+    physics = dinv.physics.Tomography(
+        img_width=imsize[-1], angles=20, device=device, circle=circle
+    )
+    physics_vec = dinv.physics.Tomography(
+        img_width=imsize[-1],
+        angles=20,
+        device=device,
+        circle=circle,
+        vectorized=True,
+        memory_budget=2**14,  # forces several chunks of angles
+    )
+
+    x = torch.randn((2,) + imsize, device=device)
+    y = physics.A(x)
+    assert torch.allclose(y, physics_vec.A(x), atol=1e-5)
+    assert torch.allclose(physics.A_adjoint(y), physics_vec.A_adjoint(y), atol=1e-4)
+    assert torch.allclose(physics.A_dagger(y), physics_vec.A_dagger(y), atol=1e-4)
+
+
+@pytest.mark.parametrize("circle", [True, False])
+def test_tomography_sparse(circle, device, tmp_path):
+    r"""
+    Tests that the sparse system matrix matches the interpolation-based projector, has an exact adjoint
+    and is reloaded from the cache.
+
+    :param bool circle: restrict the operator to the inscribed circle.
+    :param device: (torch.device) cpu or cuda:x
+    """
+    imsize = (1, 16, 16)
+    physics = dinv.physics.Tomography(
+        img_width=imsize[-1], angles=20, device=device, circle=circle
+    )
+    physics_sparse = dinv.physics.Tomography(
+        img_width=imsize[-1],
+        angles=20,
+        device=device,
+        circle=circle,
+        sparse=True,
+        cache_dir=str(tmp_path),
+    )
+    assert len(list(tmp_path.iterdir())) == 1
+
+    x = torch.randn((2,) + imsize, device=device)
+    assert torch.allclose(physics.A(x), physics_sparse.A(x), atol=1e-4)
+    assert physics_sparse.adjointness_test(x).abs() < 1e-4
+
+    physics_cached = dinv.physics.Tomography(
+        img_width=imsize[-1],
+        angles=20,
+        device=device,
+        circle=circle,
+        sparse=True,
+        cache_dir=str(tmp_path),
+    )
+    assert torch.allclose(physics_sparse.A(x), physics_cached.A(x))
+
+
+@pytest.mark.parametrize("name", ["Tomography", "Inpainting", "MRI", "CS", "fastCS"])
+def test_measurement_subsets(name, device):
+    r"""
+    Tests that the subset operators are consistent with the full operator, i.e. that :math:`A_S x` are the
+    measurements of the subset and that :math:`\sum_S A_S^{\top} y_S = A^{\top} y`.
+
+    :param name: operator name
+    :param device: (torch.device) cpu or cuda:x
+    """
+    imsize = (2, 16, 16) if name == "MRI" else (1, 16, 16)
+    if name == "Tomography":
+        physics = dinv.physics.Tomography(img_width=16, angles=12, device=device)
+    elif name == "Inpainting":
+        physics = dinv.physics.Inpainting(tensor_size=imsize, mask=0.5, device=device)
+    elif name == "MRI":
+        mask = torch.zeros(16, 16, device=device)
+        mask[:, ::2] = 1
+        physics = dinv.physics.MRI(mask=mask, device=device)
+    else:
+        physics = dinv.physics.CompressedSensing(
+            m=100, img_shape=imsize, fast=name == "fastCS", device=device
+        )
+
+    x = torch.randn((2,) + imsize, device=device)
+    y = physics.A(x)
+    x_adj = torch.zeros_like(x)
+    for idx in physics.subsets(3):
+        y_subset = physics.A_subset(x, idx)
+        assert torch.allclose(y_subset, physics.measurement_subset(y, idx), atol=1e-4)
+        x_adj += physics.A_adjoint_subset(y_subset, idx)
+    assert torch.allclose(x_adj, physics.A_adjoint(y), atol=1e-4)
+
+
+@pytest.mark.parametrize("name", OPERATORS)
+def test_A_adjoint_A(name, device):
+    r"""
+    Tests that the closed-form normal operator matches the composition of the adjoint and forward operators,
+    including for composed and stacked operators.
+
+    :param name: operator name (see find_operator)
+    :param device: (torch.device) cpu or cuda:x
+    """
+    physics, imsize, _ = find_operator(name, device)
+    x = torch.randn(imsize, device=device).unsqueeze(0)
+    assert torch.allclose(
+        physics.A_adjoint_A(x), physics.A_adjoint(physics.A(x)), atol=1e-5
+    )
+
+    identity = dinv.physics.LinearPhysics()
+    for composed in [physics * identity, identity * physics, physics + identity]:
+        assert torch.allclose(
+            composed.A_adjoint_A(x), composed.A_adjoint(composed.A(x)), atol=1e-5
+        )
+
+
+@pytest.mark.parametrize("padding", ["valid", "circular", "reflect", "replicate"])
+def test_conv_normal_fft(padding, device):
+    r"""
+    Tests that the Toeplitz-embedding normal operator matches the composition of the spatial convolution
+    and transposed convolution, with and without subsampling.
+
+    :param str padding: padding mode.
+    :param device: (torch.device) cpu or cuda:x
+    """
+    x = torch.randn(2, 3, 20, 24, device=device)
+    filters = [
+        dinv.physics.blur.gaussian_blur(sigma=(2, 1), angle=30.0).to(device),
+        torch.rand(2, 1, 4, 6, device=device),  # even sizes, one filter per sample
+    ]
+    # unit-sum filters, so that the float32 rounding errors stay below the tolerance
+    filters = [f / f.sum(dim=(-2, -1), keepdim=True) for f in filters]
+    factors = [1] if padding in ("valid", "circular") else [1, 2, 3]
+    for filter in filters:
+        for factor in factors:
+            y = dinv.physics.blur.conv(x, filter, padding)
+            mask = torch.zeros_like(y)
+            mask[:, :, ::factor, ::factor] = 1
+            ref = dinv.physics.blur.conv_transpose(y * mask, filter, padding)
+            out = dinv.physics.blur.conv_normal_fft(x, filter, padding, factor)
+            assert torch.allclose(out, ref, atol=1e-4)
+
+    physics = dinv.physics.Downsampling(
+        img_size=(3, 24, 24), factor=2, padding="reflect", device=device
+    )
+    x = torch.randn(2, 3, 24, 24, device=device)
+    assert torch.allclose(
+        physics.A_adjoint_A(x), physics.A_adjoint(physics.A(x)), atol=1e-4
+    )
+
+
+@pytest.mark.parametrize("padding", ["valid", "reflect", "replicate"])
+def test_preconditioned_prox_l2(padding, device):
+    r"""
+    Tests that the circulant preconditioner of the blur operators does not change the solution of the conjugate
+    gradient iterations of the proximal operator and the pseudo-inverse.
+
+    :param str padding: padding mode.
+    :param device: (torch.device) cpu or cuda:x
+    """
+    torch.manual_seed(0)
+    filter = dinv.physics.blur.gaussian_blur(sigma=(2, 1), angle=30.0)
+    operators = [
+        dinv.physics.Blur(filter, padding=padding, device=device),
+        dinv.physics.Downsampling(
+            img_size=(3, 24, 24), factor=2, padding=padding, device=device
+        ),
+    ]
+    x = torch.randn(2, 3, 24, 24, device=device)
+    gamma = 1.0
+    for physics in operators:
+        physics.max_iter, physics.tol = 1000, 1e-6
+        y = physics.A(x)
+        z = torch.randn_like(x)
+        out = physics.prox_l2(z, y, gamma)
+        M = physics.preconditioner(gamma)
+        assert M is not None
+        H = lambda u: physics.A_adjoint_A(u) + u / gamma
+        b = physics.A_adjoint(y) + z / gamma
+        ref = dinv.optim.utils.conjugate_gradient(H, b, 1000, 1e-6)
+        assert torch.allclose(out, ref, atol=1e-3)
+        assert (H(out) - b).norm() / b.norm() < 1e-4
+
+    physics = operators[0]
+    x_dagger = physics.A_dagger(physics.A(x))
+    assert (physics.A(x_dagger) - physics.A(x)).norm() / physics.A(x).norm() < 1e-3
+
+
+@pytest.mark.parametrize("distribution", ["gaussian", "rademacher"])
+@pytest.mark.parametrize("channelwise", [False, True])
+def test_compressed_sensing_blocked(distribution, channelwise, device):
+    r"""
+    Tests the compressed sensing operators applied by blocks of rows: the matrix-free operator regenerates the
+    same matrix as the stored one, is adjoint, and has an iterative pseudo-inverse.
+
+    :param str distribution: distribution of the entries of the matrix.
+    :param bool channelwise: process the channels independently.
+    :param device: (torch.device) cpu or cuda:x
+    """
+    img_shape = (2, 8, 8)
+    kwargs = dict(
+        m=40,
+        img_shape=img_shape,
+        channelwise=channelwise,
+        distribution=distribution,
+        block_size=7,
+        seed=3,
+        device=device,
+    )
+    storage_dtype = torch.bfloat16 if distribution == "gaussian" else None
+    stored = dinv.physics.CompressedSensing(storage_dtype=storage_dtype, **kwargs)
+    free = dinv.physics.CompressedSensing(
+        matrix_free=True, storage_dtype=storage_dtype, **kwargs
+    )
+    assert not hasattr(free, "_A")
+
+    x = torch.randn((2,) + img_shape, device=device)
+    y = free(x)
+    assert torch.allclose(stored(x), y, atol=1e-5)
+    assert free.adjointness_test(x).abs() < 1e-3
+
+    idx = torch.tensor([0, 5, 6, 7, 21, 39])
+    assert torch.allclose(free.A_subset(x, idx), free.measurement_subset(y, idx))
+
+    free.max_iter, free.tol = 200, 1e-6
+    x_dagger = free.A_dagger(y)
+    assert (free.A(x_dagger) - y).norm() / y.norm() < 1e-3
+
+
+@pytest.mark.parametrize("transform", ["dst1", "dct", "dct4", "hadamard"])
+def test_structured_transforms(transform, device):
+    r"""
+    Tests the fast orthogonal transforms of the structured random operators against their definition, and the
+    corresponding compressed sensing and single pixel camera operators.
+
+    :param str transform: name of the transform.
+    :param device: (torch.device) cpu or cuda:x
+    """
+    from deepinv.physics.structured_random import structured_transform
+
+    n = 16 if transform == "hadamard" else 12
+    i = torch.arange(n, device=device, dtype=torch.float64)
+    j, k = i[None, :], i[:, None]
+    if transform == "dst1":
+        T = np.sqrt(2 / (n + 1)) * torch.sin(np.pi * (j + 1) * (k + 1) / (n + 1))
+    elif transform == "dct":
+        T = np.sqrt(2 / n) * torch.cos(np.pi * (2 * j + 1) * k / (2 * n))
+        T[0] = T[0] / np.sqrt(2)
+    elif transform == "dct4":
+        T = np.sqrt(2 / n) * torch.cos(np.pi * (2 * j + 1) * (2 * k + 1) / (4 * n))
+    else:
+        T = torch.ones(1, 1, device=device, dtype=torch.float64)
+        while T.shape[0] < n:
+            T = torch.cat([torch.cat([T, T], 1), torch.cat([T, -T], 1)], 0)
+        T = T / np.sqrt(n)
+
+    x = torch.randn(3, 2, n, device=device, dtype=torch.float64)
+    y = structured_transform(x, transform)
+    assert torch.allclose(y, x @ T.t(), atol=1e-10)
+    assert torch.allclose(structured_transform(y, transform, adjoint=True), x)
+
+    img_shape = (2, 4, 4)
+    x = torch.randn((2,) + img_shape, device=device)
+    for physics in [
+        dinv.physics.CompressedSensing(
+            m=10, img_shape=img_shape, fast=True, transform=transform, device=device
+        ),
+        dinv.physics.SinglePixelCamera(
+            m=10, img_shape=img_shape, transform=transform, device=device
+        ),
+    ]:
+        assert physics.adjointness_test(x).abs() < 1e-4
+        y = physics.A(x)
+        assert torch.allclose(physics.A(physics.A_dagger(y)), y, atol=1e-5)
+
+
+def test_fwht(device):
+    r"""
+    Tests the in-place fast Walsh-Hadamard transform against the Sylvester construction of the Hadamard matrix,
+    in natural and sequency orders, along several dimensions, and with autograd.
+
+    :param device: (torch.device) cpu or cuda:x
+    """
+    from deepinv.physics.structured_random import fwht, get_permutation_list
+
+    H = torch.ones(1, 1, device=device)
+    while H.shape[0] < 16:
+        H = torch.cat([torch.cat([H, H], 1), torch.cat([H, -H], 1)], 0)
+    H8 = H[:8, :8] / np.sqrt(8)
+    H = H / 4
+
+    x = torch.randn(2, 3, 8, 16, device=device)
+    x_copy = x.clone()
+    assert torch.allclose(fwht(x), x @ H.t(), atol=1e-5)
+    assert torch.equal(x, x_copy)  # the input is not modified
+
+    perm = torch.from_numpy(get_permutation_list(16)).to(device)
+    assert torch.allclose(fwht(x, sequency=True), (x @ H.t())[..., perm], atol=1e-5)
+
+    ref = H8 @ x @ H.t()
+    assert torch.allclose(fwht(x, dims=(-2, -1)), ref, atol=1e-5)
+    assert torch.allclose(dinv.physics.singlepixel.hadamard_2d(x), ref, atol=1e-5)
+
+    x.requires_grad_(True)
+    out = fwht(x, dims=(-2, -1))
+    assert torch.allclose(out, ref, atol=1e-5)
+    out.sum().backward()
+    assert torch.allclose(x.grad, fwht(torch.ones_like(x), dims=(-2, -1)), atol=1e-5)
+
+
+@pytest.mark.parametrize(
+    "name", ["inpainting", "MRI", "deblur", "deblur_fft", "super_resolution"]
+)
+def test_per_sample_params(name, device):
+    r"""
+    Tests that an operator loaded with one set of parameters per sample matches the operators of each sample.
+
+    :param str name: operator name.
+    :param device: (torch.device) cpu or cuda:x
+    """
+    import copy
+
+    torch.manual_seed(0)
+    physics, img_size, _ = find_operator(name, device)
+    physics.noise_model = dinv.physics.UniformGaussianNoise(sigma_max=0.1)
+    generator = torch.Generator(device).manual_seed(0)
+    batch_size = 3
+    params = physics.sample_params(batch_size, generator=generator)
+    assert params["sigma"].shape == (batch_size,)
+
+    singles = [copy.deepcopy(physics) for _ in range(batch_size)]
+    for i, p in enumerate(singles):
+        p.update_parameters(**{key: val[i : i + 1] for key, val in params.items()})
+    physics.update_parameters(**params)
+
+    x = torch.randn((batch_size,) + img_size, device=device)
+    z = torch.randn_like(x)
+    y = physics.A(x)
+    assert physics(x).shape == y.shape
+    assert physics.adjointness_test(x).abs() < 1e-3
+    for i, p in enumerate(singles):
+        xi, zi = x[i : i + 1], z[i : i + 1]
+        yi = p.A(xi)
+        assert torch.allclose(
+            physics.A_adjoint(y)[i : i + 1], p.A_adjoint(yi), atol=1e-5
+        )
+        assert torch.allclose(
+            physics.prox_l2(z, y, 0.5)[i : i + 1], p.prox_l2(zi, yi, 0.5), atol=1e-4
+        )
+
+
+@pytest.mark.parametrize("name", ["inpainting", "MRI"])
+def test_compact_measurements(name, device):
+    r"""
+    Tests that compact measurements only store the observed entries, with the same adjoint, pseudo-inverse and
+    proximal operator as the full-size masked measurements.
+
+    :param str name: operator name.
+    :param device: (torch.device) cpu or cuda:x
+    """
+    torch.manual_seed(0)
+    if name == "inpainting":
+        img_size = (3, 16, 8)
+        physics = dinv.physics.Inpainting(
+            tensor_size=img_size, mask=0.5, compact=True, device=device
+        )
+        full = dinv.physics.Inpainting(
+            tensor_size=img_size, mask=physics.mask[0].clone(), device=device
+        )
+    else:
+        img_size = (2, 16, 8)
+        mask = (torch.rand(img_size[1:], device=device) > 0.5).float()
+        physics = dinv.physics.MRI(mask=mask, device=device)
+        full = dinv.physics.MRI(mask=mask, device=device)
+        full.update_parameters(mask=torch.stack([mask, mask]))  # zero-filled k-space
+
+    x = torch.randn((2,) + img_size, device=device)
+    y = physics.A(x)
+    m = int((physics.mask[0] != 0).sum())
+    assert y.shape == (2, m)
+    assert physics.adjointness_test(x).abs() < 1e-3
+
+    y_full = full.A(x)
+    assert torch.allclose(physics.A_adjoint(y), full.A_adjoint(y_full), atol=1e-5)
+    assert torch.allclose(physics.A_dagger(y), full.A_dagger(y_full), atol=1e-5)
+    z = torch.randn_like(x)
+    assert torch.allclose(
+        physics.prox_l2(z, y, 0.3), full.prox_l2(z, y_full, 0.3), atol=1e-5
+    )
+
+
+def test_MRI_line_sampling(device):
+    r"""
+    Tests that the partial DFT of the sampled k-space lines matches the 2D FFT for masks made of full lines, and
+    that other masks use the 2D FFT.
+
+    :param device: (torch.device) cpu or cuda:x
+    """
+    torch.manual_seed(0)
+    physics = dinv.physics.MRI(
+        image_size=(32, 24), acceleration_factor=4, line_method="dft", device=device
+    )
+    reference = dinv.physics.MRI(
+        mask=physics.mask[0, 0], line_method="fft", device=device
+    )
+    assert physics.sampled_lines() is not None
+
+    x = torch.randn((2, 2, 32, 24), device=device)
+    y = physics.A(x)
+    assert torch.allclose(y, reference.A(x), atol=1e-5)
+    assert torch.allclose(physics.A_adjoint(y), reference.A_adjoint(y), atol=1e-5)
+    assert torch.allclose(physics.A_adjoint_A(x), reference.A_adjoint_A(x), atol=1e-5)
+    assert physics.adjointness_test(x).abs() < 1e-3
+
+    mask = (torch.rand((32, 24), device=device) > 0.5).float()
+    physics.update_parameters(mask=mask)
+    assert physics.sampled_lines() is None
+    assert physics.A(x).shape == (2, 2 * int(mask.sum()))
+
+    # centered FFT with native shifts
+    xc = torch.randn((3, 32, 24, 2), device=device)
+    ref = np.fft.fftshift(
+        np.fft.fft2(
+            np.fft.ifftshift(torch.view_as_complex(xc).cpu().numpy(), axes=(-2, -1)),
+            norm="ortho",
+        ),
+        axes=(-2, -1),
+    )
+    out = torch.view_as_complex(dinv.physics.mri.fft2c_new(xc)).cpu().numpy()
+    assert np.allclose(out, ref, atol=1e-5)
+    assert torch.allclose(
+        dinv.physics.mri.ifft2c_new(dinv.physics.mri.fft2c_new(xc)), xc, atol=1e-5
+    )
+
+
+def test_multicoil_MRI(device):
+    r"""
+    Tests the multi-coil MRI operator against the single-coil operator, its proximal operator, and the coil
+    compression.
+
+    :param device: (torch.device) cpu or cuda:x
+    """
+    torch.manual_seed(0)
+    H, W, C = 16, 12, 6
+    mask = (torch.rand((H, W), device=device) > 0.5).float()
+    x = torch.randn((2, 2, H, W), device=device)
+
+    # a single coil with a constant map is the single-coil operator
+    physics = dinv.physics.MultiCoilMRI(
+        coil_maps=torch.ones((1, H, W), dtype=torch.complex64), mask=mask, device=device
+    )
+    single = dinv.physics.MRI(mask=mask, device=device)
+    y = physics.A(x)
+    assert torch.allclose(y[:, :, 0] * mask, single.U_adjoint(single.A(x)), atol=1e-5)
+
+    # proximal operator with batched conjugate gradient
+    maps = torch.randn((C, H, W), dtype=torch.complex64, device=device)
+    maps = maps / maps.abs().pow(2).sum(0, keepdim=True).sqrt()
+    physics = dinv.physics.MultiCoilMRI(
+        coil_maps=maps, mask=mask, device=device, max_iter=200, tol=1e-6
+    )
+    y = physics.A(x)
+    z = torch.randn_like(x)
+    gamma = 2.0
+    p = physics.prox_l2(z, y, gamma)
+    grad = gamma * physics.A_adjoint(physics.A(p) - y) + p - z
+    assert grad.abs().max() < 1e-3
+
+    # compression with all the coils preserves the normal operator
+    compressed = dinv.physics.MultiCoilMRI(
+        coil_maps=maps, mask=mask, n_virtual_coils=C, device=device
+    )
+    assert torch.allclose(compressed.A_adjoint_A(x), physics.A_adjoint_A(x), atol=1e-4)
+    compressed = dinv.physics.MultiCoilMRI(
+        coil_maps=maps, mask=mask, n_virtual_coils=3, device=device
+    )
+    assert compressed.A(x).shape == (2, 2, 3, H, W)
+    assert torch.allclose(
+        compressed.compress_measurements(y), compressed.A(x), atol=1e-4
+    )
+
+
+def test_noncartesian_MRI(device, tmp_path):
+    r"""
+    Tests the NUFFT of the non-Cartesian MRI operator against a naive non-uniform DFT, its adjoint, its Toeplitz
+    normal operator, and its density compensation on a Cartesian trajectory.
+
+    :param device: (torch.device) cpu or cuda:x
+    """
+    from deepinv.physics.nufft import radial_trajectory
+
+    torch.manual_seed(0)
+    H, W = 16, 12
+    trajectory = radial_trajectory(12, 32)
+    physics = dinv.physics.NonCartesianMRI(
+        trajectory, (H, W), cache_dir=str(tmp_path), device=device
+    )
+    x = torch.randn((2, 2, H, W), device=device)
+
+    # naive non-uniform DFT
+    rows = torch.arange(H, device=device) - H // 2
+    cols = torch.arange(W, device=device) - W // 2
+    grid = torch.stack(torch.meshgrid(rows, cols, indexing="ij"), dim=-1).float()
+    phase = trajectory.to(device) @ grid.reshape(-1, 2).t()
+    E = torch.polar(torch.ones_like(phase), -phase) / np.sqrt(H * W)
+    y = torch.complex(x[:, 0], x[:, 1]).reshape(2, -1) @ E.t()
+    y = torch.stack([y.real, y.imag], dim=1)
+    assert (physics.A(x) - y).norm() / y.norm() < 1e-3
+
+    # exact adjoint and Toeplitz normal operator
+    y = torch.randn_like(y)
+    assert torch.allclose(
+        (physics.A(x) * y).sum(), (x * physics.A_adjoint(y)).sum(), rtol=1e-4
+    )
+    normal = physics.A_adjoint(physics.A(x))
+    assert (physics.A_adjoint_A(x) - normal).norm() / normal.norm() < 1e-3
+
+    # the interpolation matrix is loaded from the disk cache
+    assert len(list(tmp_path.glob("*.pt"))) == 2
+    cached = dinv.physics.NonCartesianMRI(
+        trajectory, (H, W), cache_dir=str(tmp_path), device=device
+    )
+    assert len(list(tmp_path.glob("*.pt"))) == 2
+    assert torch.allclose(cached.A(x), physics.A(x))
+
+    # on a Cartesian trajectory, the operator is the orthonormal DFT
+    kh = (torch.arange(H) - H // 2) * (2 * np.pi / H)
+    kw = (torch.arange(W) - W // 2) * (2 * np.pi / W)
+    trajectory = torch.stack(torch.meshgrid(kh, kw, indexing="ij"), dim=-1)
+    physics = dinv.physics.NonCartesianMRI(
+        trajectory.reshape(-1, 2).float(),
+        (H, W),
+        cache_dir=str(tmp_path),
+        device=device,
+    )
+    y = dinv.physics.mri._fft2c(torch.complex(x[:, 0], x[:, 1])).reshape(2, -1)
+    assert torch.allclose(physics.A(x), torch.stack([y.real, y.imag], 1), atol=1e-4)
+    assert torch.allclose(physics.dcf, torch.ones_like(physics.dcf), atol=1e-3)
+
+
+def test_to_decomposable(device, tmp_path):
+    r"""
+    Tests the randomized SVD of a compressed sensing operator, the closed-form operators of the resulting
+    decomposable operator, and its disk cache.
+
+    :param device: (torch.device) cpu or cuda:x
+    """
+    torch.manual_seed(0)
+    img_shape = (1, 8, 8)
+    physics = dinv.physics.CompressedSensing(m=20, img_shape=img_shape, device=device)
+    path = str(tmp_path / "svd.pt")
+    svd = dinv.physics.to_decomposable(
+        physics, img_shape, rank=20, batch_size=16, path=path, device=device
+    )
+
+    x = torch.randn((3,) + img_shape, device=device)
+    y = physics.A(x)
+    assert torch.allclose(svd.A(x), y, atol=1e-4)
+    assert torch.allclose(svd.A_adjoint(y), physics.A_adjoint(y), atol=1e-4)
+
+    # V is orthogonal, and the transformed domain is shared by U_adjoint and V_adjoint
+    assert torch.allclose(svd.V(svd.V_adjoint(x)), x, atol=1e-5)
+    assert svd.U_adjoint(y).shape == svd.V_adjoint(x).shape
+
+    # closed-form prox and pseudo-inverse
+    z = torch.randn_like(x)
+    gamma = 0.5
+    p = svd.prox_l2(z, y, gamma)
+    grad = gamma * physics.A_adjoint(physics.A(p) - y) + p - z
+    assert grad.abs().max() < 1e-3
+    assert torch.allclose(physics.A(svd.A_dagger(y)), y, atol=1e-3)
+
+    # loaded from the disk cache
+    cached = dinv.physics.to_decomposable(physics, img_shape, rank=20, path=path)
+    assert torch.allclose(cached.to(device).A(x), svd.A(x), atol=1e-6)
+
+    # truncation to the leading singular values
+    low_rank = dinv.physics.to_decomposable(physics, img_shape, rank=5, device=device)
+    assert low_rank.mask.count_nonzero() == 5
+
+
+def test_compute_norm_cache(device):
+    r"""
+    Tests that the spectral norms are memoized until the operator changes, the per-sample norms, and the closed
+    forms of the decomposable operators.
+
+    :param device: (torch.device) cpu or cuda:x
+    """
+    torch.manual_seed(0)
+    x = torch.randn((2, 1, 16, 16), device=device)
+    filters = torch.rand((2, 1, 3, 3), device=device)
+    physics = dinv.physics.Blur(filter=filters[:1], padding="circular", device=device)
+
+    norm = physics.compute_norm(x, tol=1e-6, verbose=False)
+    cached = physics.compute_norm(x, verbose=False)
+    assert torch.equal(cached, norm)
+    cached *= 2  # the stored norm is not modified
+    assert torch.equal(physics.compute_norm(x, verbose=False), norm)
+    assert torch.allclose(norm, filters[0].sum() ** 2, rtol=1e-3)
+
+    # a more precise estimate is recomputed
+    calls = [0]
+    A_adjoint_A = physics.A_adjoint_A
+
+    def counted(u):
+        calls[0] += 1
+        return A_adjoint_A(u)
+
+    physics.A_adjoint_A = counted
+    physics.compute_norm(x, tol=1e-3, verbose=False)
+    assert calls[0] == 0
+    physics.compute_norm(x, tol=1e-8, verbose=False)
+    assert calls[0] > 0
+    del physics.A_adjoint_A
+
+    # in-place modification and replacement of the filter
+    with torch.no_grad():
+        physics.filter.mul_(0.5)
+    new_norm = physics.compute_norm(x, tol=1e-6, verbose=False)
+    assert torch.allclose(new_norm, norm / 4, rtol=1e-3)
+    physics.update_parameters(filter=filters)
+    per_sample = physics.compute_norm(x, tol=1e-6, verbose=False, per_sample=True)
+    assert torch.allclose(per_sample, filters.sum((1, 2, 3)) ** 2, rtol=1e-3)
+
+    # composed operators follow the changes of their operands
+    composed = physics * dinv.physics.Denoising()
+    norm = composed.compute_norm(x, tol=1e-6, verbose=False)
+    physics.update_parameters(filter=filters[1:])
+    new_norm = composed.compute_norm(x, tol=1e-6, verbose=False)
+    assert torch.allclose(new_norm, filters[1].sum() ** 2, rtol=1e-3)
+
+    # the tensors captured by the functions of an operator cannot be tracked
+    w = torch.ones((1, 1, 16, 16), device=device)
+    w[..., 0, 0] = 2.0
+    physics = dinv.physics.LinearPhysics(A=lambda u: w * u, A_adjoint=lambda u: w * u)
+    norm = physics.compute_norm(x, tol=1e-6, verbose=False)
+    w.mul_(2.0)
+    new_norm = physics.compute_norm(x, tol=1e-6, verbose=False)
+    assert torch.allclose(new_norm, 4 * norm, rtol=1e-3)
+
+    # closed forms
+    for physics, channels in [
+        (dinv.physics.BlurFFT((1, 16, 16), filter=filters[:1], device=device), 1),
+        (dinv.physics.Decolorize(), 3),
+    ]:
+        x = torch.randn((2, channels, 16, 16), device=device)
+        power = dinv.physics.LinearPhysics.compute_norm(
+            physics, x, tol=1e-6, verbose=False, use_cache=False
+        )
+        assert torch.allclose(physics.compute_norm(x), power, rtol=1e-3)
+
+
+@pytest.mark.parametrize("padding", ["valid", "circular", "reflect", "replicate"])
+def test_separable_conv(padding, device):
+    r"""
+    Tests that separable filters are applied as two 1D convolutions which match the 2D ones, with an exact
+    adjoint, and the approximation of non-separable filters by a sum of separable ones.
+
+    :param str padding: padding mode of the convolution.
+    :param device: (torch.device) cpu or cuda:x
+    """
+    torch.manual_seed(0)
+    x = torch.randn((2, 3, 32, 29), device=device)
+    for filt in [
+        dinv.physics.blur.gaussian_blur(sigma=(2.0, 1.0)),
+        dinv.physics.blur.bicubic_filter(2),
+        dinv.physics.blur.bilinear_filter(3)[..., 1:],
+    ]:
+        filt = filt.to(device)
+        physics = dinv.physics.Blur(
+            filter=filt, padding=padding, conv_method="spatial", device=device
+        )
+        y = physics.A(x)
+        col, row = physics.conv_dispatcher.separable_factors(physics.filter)
+        assert col.shape[0] == 1
+        assert torch.allclose(y, dinv.physics.blur.conv(x, filt, padding), atol=1e-5)
+        assert torch.allclose(
+            physics.A_adjoint(y),
+            dinv.physics.blur.conv_transpose(y, filt, padding),
+            atol=1e-5,
+        )
+        assert physics.adjointness_test(x).abs() < 1e-3
+
+    # rotated Gaussian filter, approximated by a sum of separable filters
+    filt = dinv.physics.blur.gaussian_blur(sigma=(3.0, 1.0), angle=30.0).to(device)
+    physics = dinv.physics.Blur(
+        filter=filt,
+        padding=padding,
+        conv_method="spatial",
+        separable_tol=1e-2,
+        device=device,
+    )
+    u, v = dinv.physics.blur.separable_decomposition(filt, tol=1e-2)
+    assert 1 < u.shape[0] < filt.shape[-1] // 2
+    y = dinv.physics.blur.conv(x, filt, padding)
+    assert (physics.A(x) - y).norm() / y.norm() < 2e-2
+    assert physics.adjointness_test(x).abs() < 1e-3
+
+
+@pytest.mark.parametrize("conv_method", ["spatial", "fft", "auto"])
+def test_blur_filter_inplace(conv_method, device):
+    r"""
+    Tests that the cached decompositions of the filter are updated when the filter is modified in-place, and that
+    the gradients with respect to the filter are correct over several backward passes.
+
+    :param str conv_method: convolution method of the operator.
+    :param device: (torch.device) cpu or cuda:x
+    """
+    torch.manual_seed(0)
+    padding = "reflect"
+    x = torch.randn((2, 3, 32, 32), device=device)
+    filt = dinv.physics.blur.gaussian_blur(sigma=(2.0, 1.0)).to(device)
+    physics = dinv.physics.Blur(
+        filter=filt.clone(), padding=padding, conv_method=conv_method, device=device
+    )
+    norm = physics.compute_norm(x, tol=1e-6, verbose=False)
+    y = physics.A(x)
+    physics.A_adjoint(y)
+    x_normal = physics.A_adjoint_A(x)
+
+    physics.filter.mul_(2.0)
+    assert torch.allclose(physics.A(x), 2 * y, atol=1e-5)
+    assert torch.allclose(physics.A_adjoint_A(x), 4 * x_normal, atol=1e-4)
+    assert torch.allclose(
+        physics.A_adjoint(y),
+        dinv.physics.blur.conv_transpose(y, 2 * filt, padding),
+        atol=1e-5,
+    )
+    assert torch.allclose(
+        physics.compute_norm(x, tol=1e-6, verbose=False), 4 * norm, rtol=1e-3
+    )
+
+    physics.filter.requires_grad_(True)
+    for _ in range(2):
+        loss = physics.A(x).pow(2).sum() + physics.A_adjoint(y).pow(2).sum()
+        (grad,) = torch.autograd.grad(loss, physics.filter)
+        ref = physics.filter.detach().clone().requires_grad_(True)
+        loss = dinv.physics.blur.conv(x, ref, padding).pow(2).sum()
+        loss = loss + dinv.physics.blur.conv_transpose(y, ref, padding).pow(2).sum()
+        (grad_ref,) = torch.autograd.grad(loss, ref)
+        assert torch.allclose(grad, grad_ref, rtol=1e-4, atol=1e-4)
+
+
+@pytest.mark.parametrize("padding", ["valid", "circular", "reflect", "replicate"])
+def test_space_varying_blur(padding, device):
+    r"""
+    Tests that the overlap-add FFT convolutions of the space-varying blur match the sum of the windowed spatial
+    convolutions, and that its adjoint is exact.
+
+    :param str padding: padding mode of the convolution.
+    :param device: (torch.device) cpu or cuda:x
+    """
+    torch.manual_seed(0)
+    x = torch.randn((2, 3, 32, 29), device=device)
+    filters = torch.rand((6, 1, 7, 6), device=device)
+    windows = dinv.physics.blur.interpolation_windows((32, 29), (3, 2), device=device)
+    assert torch.allclose(windows.sum(0), torch.ones_like(windows[0]))
+
+    expected = sum(
+        dinv.physics.blur.conv(w * x, h.unsqueeze(0), padding)
+        for w, h in zip(windows, filters)
+    )
+    for win in [(3, 2), windows]:
+        physics = dinv.physics.SpaceVaryingBlur(
+            filters, windows=win, padding=padding, device=device
+        )
+        y = physics.A(x)
+        assert torch.allclose(y, expected, atol=1e-4)
+        assert physics.adjointness_test(x).abs() < 1e-3
+
+    # a single PSF with a constant window is a (spatially invariant) blur
+    physics = dinv.physics.SpaceVaryingBlur(
+        filters[:1], windows=(1, 1), padding=padding, device=device
+    )
+    blur = dinv.physics.Blur(filters[:1], padding=padding, device=device)
+    y = blur.A(x)
+    assert torch.allclose(physics.A(x), y, atol=1e-4)
+    assert torch.allclose(physics.A_adjoint(y), blur.A_adjoint(y), atol=1e-4)
+
+
+@pytest.mark.parametrize("factor", [2, 4])
+def test_downsampling_cached_tables(factor, device):
+    r"""
+    Tests the cached Fourier tables of the closed-form normal and proximal operators of the downsampling with
+    circular padding, and the reuse of the upsampling buffer of the adjoint.
+
+    :param int factor: downsampling factor.
+    :param device: (torch.device) cpu or cuda:x
+    """
+    torch.manual_seed(0)
+    physics = dinv.physics.Downsampling(
+        img_size=(3, 32, 32), factor=factor, padding="circular", device=device
+    )
+    physics.max_iter, physics.tol = 1000, 1e-7
+    x = torch.randn(2, 3, 32, 32, device=device)
+    y = physics.A(x)
+    z = torch.randn_like(x)
+    for gamma in [0.5, 2.0]:
+        assert torch.allclose(
+            physics.prox_l2(z, y, gamma),
+            dinv.physics.LinearPhysics.prox_l2(physics, z, y, gamma),
+            atol=1e-4,
+        )
+    assert len(physics.fourier_tables) == 1
+    assert torch.allclose(
+        physics.A_adjoint_A(x),
+        dinv.physics.LinearPhysics.A_adjoint_A(physics, x),
+        atol=1e-4,
+    )
+
+    # float64 images use their own tables
+    x64 = x.double()
+    assert physics.prox_l2(z.double(), physics.A(x64), 1.0).dtype == torch.float64
+    assert len(physics.fourier_tables) == 2
+
+    # the adjoint reuses its buffer without leaking the previous measurements
+    with torch.no_grad():
+        physics.A_adjoint(torch.randn_like(y))
+        buffer = next(iter(physics.adjoint_buffer.values()))
+        out = physics.A_adjoint(y)
+        assert next(iter(physics.adjoint_buffer.values())) is buffer
+    up = torch.zeros_like(x)
+    up[:, :, ::factor, ::factor] = y
+    ref = dinv.physics.blur.conv_transpose(up, physics.filter, "circular")
+    assert torch.allclose(out, ref, atol=1e-5)
+    assert physics.adjointness_test(x).abs() < 1e-3
+
+    # no buffer is used when differentiating through the adjoint
+    y.requires_grad_()
+    physics.A_adjoint(y).sum().backward()
+    assert y.grad is not None
+
+    # nor when differentiating with respect to the filter
+    y = y.detach()
+    physics.filter.requires_grad_(True)
+    out = physics.A_adjoint(y)
+    physics.A_adjoint(torch.randn_like(y))
+    (grad,) = torch.autograd.grad(out.pow(2).sum(), physics.filter)
+    ref = physics.filter.detach().clone().requires_grad_(True)
+    out = dinv.physics.blur.conv_transpose(up, ref, "circular")
+    (grad_ref,) = torch.autograd.grad(out.pow(2).sum(), ref)
+    assert torch.allclose(grad, grad_ref, rtol=1e-4, atol=1e-4)
+
+
+@pytest.mark.parametrize("conv_method", ["spatial", "fft"])
+def test_lidar_chunked(conv_method, device):
+    r"""
+    Tests that the chunked forward model of the single photon lidar matches the dense Gaussian histograms, and that
+    the matched filter recovers the depths below the bin size.
+
+    :param str conv_method: method of the matched filter.
+    :param device: (torch.device) cpu or cuda:x
+    """
+    torch.manual_seed(0)
+    sigma, bins = 2.0, 64
+    physics = dinv.physics.SinglePhotonLidar(
+        sigma=sigma, bins=bins, device=device, chunk_size=7, conv_method=conv_method
+    )
+    x = torch.rand(2, 3, 5, 6, device=device)
+    x[:, 0] = 10 + (bins - 20) * x[:, 0]
+    x[:, 1] *= 100
+    x[:, 2] *= 0.1
+    x[0, 0, 0, :2] = torch.tensor([-1.5, bins + 0.5])  # depths outside of the histogram
+
+    for dtype in [torch.float32, torch.float64]:
+        xd = x.to(dtype)
+        t = torch.arange(bins, device=device, dtype=dtype).view(1, -1, 1, 1)
+        h = torch.exp(-(((t - xd[:, :1]) / sigma) ** 2) / 2)
+        ref = xd[:, 1:2] * h / h.sum(dim=1, keepdim=True) + xd[:, 2:]
+        y = physics.A(xd)
+        assert y.dtype == dtype
+        assert torch.allclose(y, ref, rtol=1e-5, atol=1e-6)
+
+    x[:, 2] = 0
+    x[0, 0, 0, :2] = bins / 2
+    xhat = physics.A_dagger(physics.A(x))
+    assert (xhat[:, 0] - x[:, 0]).abs().max() < 0.1
+    assert torch.allclose(xhat[:, 1], x[:, 1], rtol=1e-3)
+
+    other = "fft" if conv_method == "spatial" else "spatial"
+    physics.conv_method = other
+    assert torch.allclose(physics.A_dagger(physics.A(x)), xhat, atol=1e-4)
+
+
+def test_packed_measurements(device):
+    r"""
+    Tests that the multi-output operators produce measurements packed in a single buffer, which are supported by
+    the adjoint and the iterative pseudo-inverse.
+
+    :param device: (torch.device) cpu or cuda:x
+    """
+    torch.manual_seed(0)
+    x = torch.randn(2, 3, 16, 16, device=device)
+    stacked = dinv.physics.Blur(
+        dinv.physics.blur.gaussian_blur(1.0), device=device
+    ) + dinv.physics.Inpainting(tensor_size=(3, 16, 16), mask=0.5, device=device)
+    for physics in [
+        dinv.physics.Pansharpen(img_size=(3, 16, 16), factor=2, device=device),
+        stacked,
+    ]:
+        y = physics.A(x)
+        assert isinstance(y, dinv.utils.PackedTensorList)
+        assert isinstance(physics(x), dinv.utils.PackedTensorList)
+        assert physics.adjointness_test(x).abs() < 1e-3
+
+        physics.max_iter, physics.tol = 200, 1e-6
+        x_dagger = physics.A_dagger(y)
+        residual = physics.A(x_dagger) - y
+        assert residual.flatten().norm() < 1e-2 * y.flatten().norm()
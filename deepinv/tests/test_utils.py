@@ -80,3 +80,64 @@ def test_plot():
         deepinv.utils.plot(imgs, titles=["a", "b"])
         deepinv.utils.plot(x, titles="a")
         deepinv.utils.plot(imgs)
+
+
+def test_packed_tensorlist():
+    torch.manual_seed(0)
+    a, b = torch.randn(2, 3, 4, 4), torch.randn(2, 1, 8, 8)
+    x = deepinv.utils.PackedTensorList([a, b])
+    y = deepinv.utils.PackedTensorList([2 * a, b + 1])
+    ref_x = deepinv.utils.TensorList([a, b])
+    ref_y = deepinv.utils.TensorList([2 * a, b + 1])
+    assert x.data.shape == (2, 3 * 16 + 64)
+    assert x.shape == [a.shape, b.shape]
+
+    # the elements are views of the buffer
+    assert (x[0] == a).all() and (x[1] == b).all()
+    x[1][0] = 0
+    assert (x.data[0, 48:] == 0).all()
+    x[1][0] = b[0]
+    assert x.flatten().data_ptr() == x.data.data_ptr()
+
+    w = torch.arange(2.0).view(2, 1, 1, 1)
+    for z, ref in [
+        (x + y, ref_x + ref_y),
+        (x - y, ref_x - ref_y),
+        (x * y, ref_x * ref_y),
+        (x / y, ref_x / ref_y),
+        (2.0 * x, 2.0 * ref_x),
+        (x * torch.tensor(3.0), ref_x * 3.0),
+        (-x, -ref_x),
+        (x + ref_y, ref_x + ref_y),
+        (x * w, ref_x * w),
+    ]:
+        assert isinstance(z, deepinv.utils.PackedTensorList)
+        assert all(torch.allclose(zi, ri) for zi, ri in zip(z, ref))
+
+    z = deepinv.utils.zeros_like(x)
+    assert isinstance(z, deepinv.utils.PackedTensorList) and (z.data == 0).all()
+
+    x.append(torch.ones(2, 5))
+    assert len(x) == 3 and x.data.shape == (2, 3 * 16 + 64 + 5)
+    assert (x[2] == 1).all() and (x[0] == a).all()
+
+    with pytest.raises(ValueError):
+        deepinv.utils.PackedTensorList([a, torch.randn(1, 3)])
+
+
+def test_load_or_build_sparse(tmp_path):
+    from deepinv.utils.cache import load_or_build_sparse
+
+    dense = torch.tensor([[1.0, 0.0, 2.0], [0.0, 3.0, 0.0]])
+    calls = []
+
+    def build():
+        calls.append(1)
+        return dense.to_sparse_csr(), dense.t().contiguous().to_sparse_csr()
+
+    path = str(tmp_path / "matrix.pt")
+    for _ in range(2):  # the second call loads the cached file
+        matrix, transpose = load_or_build_sparse(path, build)
+        assert torch.equal(matrix.to_dense(), dense)
+        assert torch.equal(transpose.to_dense(), dense.t())
+    assert len(calls) == 1
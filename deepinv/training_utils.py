@@ -1,3 +1,4 @@
+import copy
 import torchvision.utils
 from deepinv.utils import (
     save_model,
@@ -34,6 +35,7 @@ def train(
     wandb_vis=False,
     wandb_setup={},
     online_measurements=False,
+    per_sample_physics=False,
     plot_measurements=True,
     check_grad=False,
     ckpt_pretrained=None,
@@ -78,6 +80,10 @@ def train(
          ``physics(x)``. This results in a wider range of measurements if the physics' parameters, such as
          parameters of the forward operator or noise realizations, can change between each sample; these are updated
          with the ``physics.reset()`` method. If ``online_measurements=False``, the measurements are loaded from the training dataset
+    :param bool per_sample_physics: If ``True`` and ``online_measurements=True``, each sample of a batch is measured
+        with a different realization of the operator, drawn with ``physics.sample_params(batch_size)`` and loaded
+        with ``physics.update_parameters(**params)`` (see :meth:`deepinv.physics.Physics.sample_params`), instead of
+        calling ``physics.reset()``.
     :param bool plot_measurements: Plot the measurements y. default=True.
     :param bool check_grad: Check the gradient norm at each iteration.
     :param str ckpt_pretrained: path of the pretrained checkpoint. If None, no pretrained checkpoint is loaded.
@@ -121,6 +127,12 @@ def train(
     # make physics and data_loaders of list type
     if type(physics) is not list:
         physics = [physics]
+
+    # the operators loaded with per-sample parameters are copies, the evaluation uses the original operators
+    train_physics = physics
+    if online_measurements and per_sample_physics:
+        train_physics = [copy.deepcopy(p) for p in physics]
+
     if type(train_dataloader) is not list:
         train_dataloader = [train_dataloader]
     if eval_dataloader and type(eval_dataloader) is not list:
@@ -203,10 +215,13 @@ def train(
                         iterators[g]
                     )  # In this case the dataloader outputs also a class label
                     x = x.to(device)
-                    physics_cur = physics[g]
+                    physics_cur = train_physics[g]
 
                     if isinstance(physics_cur, torch.nn.DataParallel):
                         physics_cur.module.noise_model.__init__()
+                    elif per_sample_physics:
+                        params = physics_cur.sample_params(x.shape[0])
+                        physics_cur.update_parameters(**params)
                     else:
                         physics_cur.reset()
 
@@ -223,7 +238,7 @@ def train(
                         else:
                             x = x.to(device)
 
-                    physics_cur = physics[g]
+                    physics_cur = train_physics[g]
 
                 y = y.to(device)
 
@@ -235,7 +250,9 @@ def train(
                 # compute the losses
                 loss_total = 0
                 for k, l in enumerate(losses):
-                    loss = l(x=x, x_net=x_net, y=y, physics=physics[g], model=model)
+                    loss = l(
+                        x=x, x_net=x_net, y=y, physics=train_physics[g], model=model
+                    )
                     loss_total += fact_losses[k] * loss
                     losses_verbose[k].update(loss.item())
                     if len(losses) > 1:
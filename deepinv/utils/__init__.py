@@ -13,6 +13,15 @@ from .plotting import (
     resize_pad_square_tensor,
 )
 from .demo import load_url_image
-from .nn import get_freer_gpu, TensorList, rand_like, zeros_like, randn_like, ones_like
+from .nn import (
+    get_freer_gpu,
+    TensorList,
+    PackedTensorList,
+    rand_like,
+    zeros_like,
+    randn_like,
+    ones_like,
+)
 from .phantoms import RandomPhantomDataset, SheppLoganDataset
 from .patch_extractor import patch_extractor
+from .cache import get_cache_dir
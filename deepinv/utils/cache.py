@@ -0,0 +1,105 @@
+import hashlib
+import os
+import torch
+
+
+def get_cache_dir(*subdirs):
+    r"""
+    Returns the directory where precomputed operators (e.g. sparse system matrices) are stored, and creates it
+    if needed.
+
+    The default location is ``~/.cache/deepinv``, which can be changed with the ``DEEPINV_CACHE`` environment
+    variable.
+
+    :param str subdirs: optional subdirectories of the cache directory.
+    :return: (str) path of the cache directory.
+    """
+    root = os.environ.get(
+        "DEEPINV_CACHE", os.path.join(os.path.expanduser("~"), ".cache", "deepinv")
+    )
+    path = os.path.join(root, *subdirs)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def hash_args(*args):
+    r"""
+    Short hexadecimal hash of a list of tensors and python objects, used to name cached files.
+
+    Tensors are hashed by their dtype, shape and values, other objects by their ``repr``.
+    """
+    sha = hashlib.sha1()
+    for a in args:
+        if isinstance(a, torch.Tensor):
+            a = a.detach().cpu().contiguous()
+            sha.update(f"{a.dtype}{tuple(a.shape)}".encode())
+            sha.update(a.reshape(-1).view(torch.uint8).numpy().tobytes())
+        else:
+            sha.update(repr(a).encode())
+    return sha.hexdigest()[:16]
+
+
+def save_cached_tensors(tensors, path):
+    r"""
+    Saves a dictionary of tensors to ``path``. The file is written atomically, so that concurrent processes never
+    read a partially written file.
+
+    :param dict tensors: dictionary of :class:`torch.Tensor`.
+    :param str path: destination file.
+    """
+    tmp = f"{path}.{os.getpid()}.tmp"
+    torch.save(tensors, tmp)
+    os.replace(tmp, path)
+
+
+def load_cached_tensors(path):
+    r"""
+    Loads a dictionary of tensors saved with :meth:`deepinv.utils.cache.save_cached_tensors`.
+
+    The tensors are memory-mapped on CPU when the installed version of PyTorch supports it, so that loading is
+    almost instantaneous and only the accessed pages are read from disk.
+
+    :param str path: file to load.
+    :return: (dict) dictionary of :class:`torch.Tensor`.
+    """
+    try:
+        return torch.load(path, map_location="cpu", mmap=True)
+    except TypeError:  # memory-mapping requires torch>=2.1
+        return torch.load(path, map_location="cpu")
+
+
+def load_or_build_sparse(path, build_fn):
+    r"""
+    Loads a sparse matrix and its transpose from the disk cache (memory-mapped), or builds them and saves them.
+
+    The matrices are stored as the fields of their CSR representations with
+    :meth:`deepinv.utils.cache.save_cached_tensors`, so that they are only assembled once.
+
+    :param str path: cache file.
+    :param callable build_fn: function without arguments returning the matrix and its transpose, as sparse CSR
+        tensors.
+    :return: (tuple) the matrix and its transpose, as sparse CSR tensors.
+    """
+    if os.path.exists(path):
+        data = load_cached_tensors(path)
+    else:
+        matrix, transpose = build_fn()
+        data = {
+            "size": torch.tensor(matrix.shape),
+            "crow": matrix.crow_indices(),
+            "col": matrix.col_indices(),
+            "values": matrix.values(),
+            "crow_t": transpose.crow_indices(),
+            "col_t": transpose.col_indices(),
+            "values_t": transpose.values(),
+        }
+        save_cached_tensors(data, path)
+
+    n_rows, n_cols = data["size"].tolist()
+    matrix = torch.sparse_csr_tensor(
+        data["crow"], data["col"], data["values"], size=(n_rows, n_cols)
+    )
+    transpose = torch.sparse_csr_tensor(
+        data["crow_t"], data["col_t"], data["values_t"], size=(n_cols, n_rows)
+    )
+    return matrix, transpose
@@ -1,3 +1,4 @@
+import math
 import torch
 import os
 import numpy as np
@@ -131,6 +132,124 @@ class TensorList:
             return TensorList([xi - otheri for xi, otheri in zip(self.x, other)])
 
 
+class PackedTensorList(TensorList):
+    r"""
+    :class:`deepinv.utils.TensorList` whose tensors are stored in a single contiguous buffer.
+
+    The tensors must have the same batch size (first dimension), dtype and device. They are flattened and
+    concatenated in a buffer of size (B, N), where N is the total number of entries of a sample, and the elements
+    of the list are views of this buffer, so that in-place modifications of the elements modify the buffer.
+
+    The arithmetic operations with a scalar, a tensor with a single element or another packed list with the same
+    shapes, as well as :meth:`flatten` and :meth:`conj`, are single operations on the buffer instead of one
+    operation per tensor. Operations with other operands are applied to each tensor, and the result is packed.
+    The batched dot products and norms of :meth:`deepinv.optim.utils.conjugate_gradient`,
+    :meth:`deepinv.optim.utils.minres` and :meth:`deepinv.optim.utils.lsqr` also act on the buffer.
+
+    :param x: a list of :class:`torch.Tensor`, a single :class:`torch.Tensor` or a TensorList. If ``shape`` is
+        given, a buffer of size (B, N).
+    :param list[torch.Size] shape: shapes of the tensors of the list, if ``x`` is a buffer.
+    """
+
+    def __init__(self, x, shape=None):
+        if shape is None:
+            if isinstance(x, torch.Tensor):
+                x = [x]
+            elif not isinstance(x, (list, TensorList)):
+                raise TypeError(
+                    "x must be a list of torch.Tensor or a single torch.Tensor"
+                )
+            x = list(x)
+            if any(
+                xi.shape[0] != x[0].shape[0]
+                or xi.dtype != x[0].dtype
+                or xi.device != x[0].device
+                for xi in x
+            ):
+                raise ValueError(
+                    "The tensors of a PackedTensorList must have the same batch size, dtype and device."
+                )
+            shape = [xi.shape for xi in x]
+            x = torch.cat([xi.reshape(xi.shape[0], -1) for xi in x], dim=1)
+
+        self.data = x
+        self.shape = [torch.Size(s) for s in shape]
+        self._views = None
+
+    @property
+    def x(self):
+        r"""
+        Views of the buffer with the shapes of the tensors of the list.
+        """
+        if self._views is None:
+            self._views = []
+            start = 0
+            for s in self.shape:
+                size = math.prod(s[1:])
+                self._views.append(self.data[:, start : start + size].view(s))
+                start += size
+        return self._views
+
+    def flatten(self):
+        r"""
+        Returns a :class:`torch.Tensor` with a flattened version of the list of tensors, without copy.
+
+        Contrary to :meth:`deepinv.utils.TensorList.flatten`, the entries are ordered by sample, i.e. all the
+        tensors of the first sample come first.
+        """
+        return self.data.reshape(-1)
+
+    def append(self, other):
+        r"""
+        Appends a :class:`torch.Tensor` or a list of :class:`torch.Tensor` to the list, which reallocates the buffer.
+        """
+        packed = PackedTensorList(TensorList(self.x).append(other))
+        self.data, self.shape, self._views = packed.data, packed.shape, None
+        return self
+
+    def _operand(self, other):
+        r"""
+        Returns ``other`` as an operand of the buffer, or ``None`` if the operation has to be applied to each
+        tensor of the list.
+        """
+        if isinstance(other, PackedTensorList):
+            return other.data if other.shape == self.shape else None
+        if isinstance(other, (list, TensorList)):
+            return None
+        if isinstance(other, torch.Tensor):
+            return other.reshape(()) if other.numel() == 1 else None
+        return other
+
+    def _apply(self, op, other):
+        operand = self._operand(other)
+        if operand is not None:
+            return PackedTensorList(op(self.data, operand), self.shape)
+        if isinstance(other, (list, TensorList)):
+            return PackedTensorList([op(xi, oi) for xi, oi in zip(self.x, other)])
+        return PackedTensorList([op(xi, other) for xi in self.x])
+
+    def __add__(self, other):
+        return self._apply(torch.add, other)
+
+    def __sub__(self, other):
+        return self._apply(torch.sub, other)
+
+    def __mul__(self, other):
+        return self._apply(torch.mul, other)
+
+    def __rmul__(self, other):
+        return self._apply(torch.mul, other)
+
+    def __truediv__(self, other):
+        return self._apply(torch.div, other)
+
+    def __neg__(self):
+        return PackedTensorList(-self.data, self.shape)
+
+    def conj(self):
+        return PackedTensorList(self.data.conj(), self.shape)
+
+
 def randn_like(x):
     r"""
     Returns a :class:`deepinv.utils.TensorList` or :class:`torch.Tensor`
@@ -138,6 +257,8 @@ def randn_like(x):
     """
     if isinstance(x, torch.Tensor):
         return torch.randn_like(x)
+    elif isinstance(x, PackedTensorList):
+        return PackedTensorList(torch.randn_like(x.data), x.shape)
     else:
         return TensorList([torch.randn_like(xi) for xi in x])
 
@@ -149,6 +270,8 @@ def rand_like(x):
     """
     if isinstance(x, torch.Tensor):
         return torch.rand_like(x)
+    elif isinstance(x, PackedTensorList):
+        return PackedTensorList(torch.rand_like(x.data), x.shape)
     else:
         return TensorList([torch.rand_like(xi) for xi in x])
 
@@ -160,6 +283,8 @@ def zeros_like(x):
     """
     if isinstance(x, torch.Tensor):
         return torch.zeros_like(x)
+    elif isinstance(x, PackedTensorList):
+        return PackedTensorList(torch.zeros_like(x.data), x.shape)
     else:
         return TensorList([torch.zeros_like(xi) for xi in x])
 
@@ -171,6 +296,8 @@ def ones_like(x):
     """
     if isinstance(x, torch.Tensor):
         return torch.ones_like(x)
+    elif isinstance(x, PackedTensorList):
+        return PackedTensorList(torch.ones_like(x.data), x.shape)
     else:
         return TensorList([torch.ones_like(xi) for xi in x])
 